@@ -0,0 +1,41 @@
+"""
+Micro-benchmark for Bedrock pong parsing
+
+Run from the python/ directory:
+    python -m benchmarks.bench_bedrock_pong
+"""
+import json
+import struct
+import timeit
+from minecraft_server_utility.bedrock_pong import BedrockPong, RAKNET_MAGIC
+
+def make_pong(motd_length=40):
+    server_id = (f"MCPE;{'m' * motd_length};594;1.20.10;17;100;13253860892328930865;"
+                 f"Bedrock level;Survival;1;19132;19133;").encode('utf-8')
+    return (b'\x1c' + struct.pack('>QQ', 1, 2) + RAKNET_MAGIC
+            + struct.pack('>H', len(server_id)) + server_id)
+
+def eager_parse(data):
+    """Split and decode everything up front, as a dict-building parser would"""
+    length = struct.unpack_from('>H', data, 33)[0]
+    fields = data[35:35 + length].decode('utf-8').split(';')
+    return {'edition': fields[0], 'motd': fields[1], 'protocol': int(fields[2]),
+            'players': int(fields[4]), 'max_players': int(fields[5])}
+
+def main(number=200000):
+    results = {}
+    for motd_length in (40, 2000):
+        data = make_pong(motd_length)
+        cases = {
+            'header_only': lambda: BedrockPong(data).server_guid,
+            'players_field': lambda: BedrockPong(data).players,
+            'to_dict': lambda: BedrockPong(data).to_dict(),
+            'eager_split': lambda: eager_parse(data),
+        }
+        for name, func in cases.items():
+            seconds = min(timeit.repeat(func, number=number, repeat=3))
+            results[f"{name}/motd={motd_length}"] = round(seconds / number * 1e9, 1)
+    print(json.dumps({'unit': 'ns/parse', 'results': results}, indent=2))
+
+if __name__ == '__main__':
+    main()
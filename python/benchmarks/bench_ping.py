@@ -0,0 +1,225 @@
+"""
+End-to-end ping benchmarks against local fake Java and Bedrock servers
+
+Measures pings/sec, p50/p99 latency, CPU and memory for each ping mode and
+prints the results as JSON. Run from the python/ directory:
+    python -m benchmarks.bench_ping --count 5000 --favicon-bytes 8000 --output new.json
+    python -m benchmarks.bench_ping --compare old.json
+
+Batch APIs only hand back results, so their percentiles use the latency each
+result reports; sequential modes time every call end to end.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import minecraft_server_utility
+from minecraft_server_utility import (
+    ServerPinger, BedrockPinger, ShardedSweeper, ping_many, ping_servers, ping_bedrock_servers
+)
+from minecraft_server_utility.exceptions import MinecraftServerException
+from benchmarks.fake_servers import BenchServers, FAILURE_MODES
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an unsorted list, None when empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+def java_targets(servers, count):
+    ports = servers.java_ports
+    return [('127.0.0.1', ports[i % len(ports)]) for i in range(count)]
+
+def bedrock_targets(servers, count):
+    ports = servers.bedrock_ports
+    return [('127.0.0.1', ports[i % len(ports)]) for i in range(count)]
+
+def timed(pings):
+    """Run zero-argument ping callables in sequence, timing each"""
+    latencies, failed = [], 0
+    for ping in pings:
+        start = time.perf_counter()
+        try:
+            ping()
+        except MinecraftServerException:
+            failed += 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, failed
+
+def reported(results):
+    """Split batch results into reported latencies and a failure count"""
+    latencies, failed = [], 0
+    for result in results:
+        if isinstance(result, Exception) or result is None:
+            failed += 1
+        elif result['latency'] is not None:
+            latencies.append(result['latency'])
+    return latencies, failed
+
+def bench_java_sync(servers, args):
+    return timed(ServerPinger(host, port, args.timeout).ping
+                 for host, port in java_targets(servers, args.count)) + ('wall',)
+
+def bench_java_threads(servers, args):
+    results = ping_many(java_targets(servers, args.count), args.concurrency, args.timeout)
+    return reported(result.info for result in results) + ('reported',)
+
+def bench_java_async(servers, args):
+    results = asyncio.run(ping_servers(java_targets(servers, args.count), args.concurrency, args.timeout))
+    return reported(results) + ('reported',)
+
+def bench_java_sharded(servers, args):
+    sweeper = ShardedSweeper(args.workers, args.concurrency, args.timeout)
+    records = list(sweeper.sweep(java_targets(servers, args.count)))
+    latencies = [record.latency for record in records if record.online and record.latency is not None]
+    return latencies, sum(not record.online for record in records), 'reported'
+
+def bench_bedrock_sync(servers, args):
+    return timed(BedrockPinger(host, port, args.timeout).ping
+                 for host, port in bedrock_targets(servers, args.count)) + ('wall',)
+
+def bench_bedrock_scan(servers, args):
+    results = asyncio.run(ping_bedrock_servers(bedrock_targets(servers, args.count), args.timeout,
+                                               concurrency=args.concurrency))
+    return reported(results) + ('reported',)
+
+MODES = {
+    'java_sync': bench_java_sync,
+    'java_threads': bench_java_threads,
+    'java_async': bench_java_async,
+    'java_sharded': bench_java_sharded,
+    'bedrock_sync': bench_bedrock_sync,
+    'bedrock_scan': bench_bedrock_scan,
+}
+
+def children_cpu():
+    """CPU seconds used by reaped child processes (sharded workers)"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def max_rss_kb():
+    """Peak resident set size of this process so far, None where unavailable"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+def run_mode(name, servers, args):
+    """Run one mode and collect throughput, latency, CPU and memory figures"""
+    gc.collect()
+    if args.trace_memory:
+        tracemalloc.start()
+    requests = servers.requests
+    server_cpu = servers.cpu_time()
+    cpu = time.process_time()
+    child_cpu = children_cpu()
+    start = time.perf_counter()
+    
+    latencies, failed, source = MODES[name](servers, args)
+    
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    server_cpu = servers.cpu_time() - server_cpu
+    result = {
+        'pings': args.count,
+        'ok': args.count - failed,
+        'failed': failed,
+        'server_requests': servers.requests - requests,
+        'elapsed': round(elapsed, 3),
+        'pings_per_sec': round(args.count / elapsed, 1),
+        'latency_source': source,
+        'p50_ms': percentile(latencies, 0.50),
+        'p99_ms': percentile(latencies, 0.99),
+        'client_cpu_seconds': round(cpu - server_cpu + children_cpu() - child_cpu, 3),
+        'server_cpu_seconds': round(server_cpu, 3),
+        'max_rss_kb': max_rss_kb(),
+    }
+    if args.trace_memory:
+        result['peak_alloc_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result
+
+def compare(previous, current):
+    """Print throughput and p99 changes against an earlier run to stderr"""
+    print(f"{'mode':<14} {'pings/sec':>24} {'p99 ms':>22}", file=sys.stderr)
+    for name, new in current['results'].items():
+        old = previous.get('results', {}).get(name)
+        if old is None:
+            continue
+        ratio = new['pings_per_sec'] / old['pings_per_sec'] if old['pings_per_sec'] else 0
+        print(f"{name:<14} {old['pings_per_sec']:>9} -> {new['pings_per_sec']:>9} x{ratio:.2f}"
+              f" {str(old['p99_ms']):>9} -> {str(new['p99_ms']):>9}", file=sys.stderr)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modes', default=','.join(MODES),
+                        help=f"comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument('--count', type=int, default=2000, help="pings per mode")
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help="processes for java_sharded")
+    parser.add_argument('--timeout', type=float, default=2.0)
+    parser.add_argument('--servers', type=int, default=1, help="fake servers per edition")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="delay before every response")
+    parser.add_argument('--sample', type=int, default=12, help="players in the status sample")
+    parser.add_argument('--favicon-bytes', type=int, default=0, help="PNG size before base64")
+    parser.add_argument('--motd-length', type=int, default=40)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--failure-mode', choices=FAILURE_MODES, default='close')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="record peak Python allocations (slows every mode)")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    parser.add_argument('--compare', help="earlier JSON output to compare against")
+    args = parser.parse_args(argv)
+    args.modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in args.modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+    report = {
+        'library_version': minecraft_server_utility.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': config,
+        'results': {},
+    }
+    with BenchServers(java=args.servers, bedrock=args.servers, latency=args.latency_ms / 1000,
+                      sample=args.sample, favicon_bytes=args.favicon_bytes,
+                      motd_length=args.motd_length, failure_rate=args.failure_rate,
+                      failure_mode=args.failure_mode) as servers:
+        for name in args.modes:
+            report['results'][name] = run_mode(name, servers, args)
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Configurable in-process Java and Bedrock servers for benchmarks
+
+All servers share one asyncio event loop on a background thread, so a
+single thread can answer thousands of concurrent pings and its CPU time can
+be measured separately from the client's. Packets are built with the
+helpers in ``tests.fake_servers``, so benchmarks and tests answer alike.
+"""
+import asyncio
+import base64
+import random
+import threading
+import time
+import uuid
+from tests.fake_servers import (
+    bedrock_pong, bedrock_server_id, legacy_kick, pong_response, status_response
+)
+
+FAILURE_MODES = ('close', 'hang')
+
+async def read_varint(reader, first=b''):
+    """Read varint from a StreamReader, starting with an already-read byte; None on EOF"""
+    result = 0
+    shift = 0
+    while True:
+        byte, first = first or await reader.read(1), b''
+        if not byte:
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        shift += 7
+        if not (byte[0] & 0x80):
+            return result
+
+def status_document(sample=0, favicon_bytes=0, motd_length=40):
+    """Build a status JSON document with a player sample and favicon of the given sizes"""
+    rng = random.Random(sample * 7919 + favicon_bytes)
+    data = {
+        'version': {'name': '1.20.1', 'protocol': 763},
+        'players': {
+            'online': max(sample, 3),
+            'max': 1000,
+            'sample': [{'name': f"Player{i:04d}", 'id': str(uuid.UUID(int=rng.getrandbits(128)))}
+                       for i in range(sample)],
+        },
+        'description': {'text': 'M' * motd_length, 'color': 'gold',
+                        'extra': [{'text': ' bench', 'bold': True}]},
+    }
+    if favicon_bytes:
+        png = bytes(rng.getrandbits(8) for _ in range(favicon_bytes))
+        data['favicon'] = 'data:image/png;base64,' + base64.b64encode(png).decode('ascii')
+    return data
+
+class _BedrockProtocol(asyncio.DatagramProtocol):
+    """Answer unconnected pings after the configured latency, dropping some"""
+    
+    def __init__(self, servers):
+        self.servers = servers
+        self.transport = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def datagram_received(self, data, addr):
+        servers = self.servers
+        if data[:1] != b'\x01' or len(data) < 9:
+            return
+        servers.requests += 1
+        if servers.should_fail():
+            return
+        pong = bedrock_pong(data[1:9], servers.advertisement)
+        if servers.latency:
+            servers.loop.call_later(servers.latency, self.transport.sendto, pong, addr)
+        else:
+            self.transport.sendto(pong, addr)
+
+class BenchServers:
+    """Fake Java status servers and Bedrock responders on a background event loop
+    
+    ``latency`` delays every response in seconds. ``failure_rate`` is the
+    fraction of connections (Java) or pings (Bedrock) that fail: with
+    ``failure_mode='close'`` a Java connection is closed unanswered, with
+    ``'hang'`` it is held open until the client gives up. Lost Bedrock pings
+    are simply dropped.
+    """
+    
+    def __init__(self, java=1, bedrock=1, latency=0.0, sample=0, favicon_bytes=0,
+                 motd_length=40, failure_rate=0.0, failure_mode='close', seed=0):
+        if failure_mode not in FAILURE_MODES:
+            raise ValueError(f"failure_mode must be one of {', '.join(FAILURE_MODES)}")
+        self.java_count = java
+        self.bedrock_count = bedrock
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.status_packet = status_response(status_document(sample, favicon_bytes, motd_length))
+        self.advertisement = bedrock_server_id(motd='M' * motd_length, players=17, max_players=100)
+        self.legacy_packet = legacy_kick(f"\xa71\x00127\x001.20.1\x00{'M' * motd_length}\x003\x001000")
+        self.java_ports = []
+        self.bedrock_ports = []
+        self.requests = 0
+        self.loop = asyncio.new_event_loop()
+        self._rng = random.Random(seed)
+        self._closers = []
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+    
+    def should_fail(self):
+        return self.failure_rate > 0 and self._rng.random() < self.failure_rate
+    
+    def __enter__(self):
+        self._thread.start()
+        self._call(self._start())
+        return self
+    
+    def __exit__(self, *exc):
+        self._call(self._stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+    
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+    
+    async def _start(self):
+        for _ in range(self.java_count):
+            server = await asyncio.start_server(self._java, '127.0.0.1', 0, backlog=4096)
+            self.java_ports.append(server.sockets[0].getsockname()[1])
+            self._closers.append(server.close)
+        for _ in range(self.bedrock_count):
+            transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: _BedrockProtocol(self), local_addr=('127.0.0.1', 0))
+            self.bedrock_ports.append(transport.get_extra_info('sockname')[1])
+            self._closers.append(transport.close)
+    
+    async def _stop(self):
+        for close in self._closers:
+            close()
+    
+    async def _thread_time(self):
+        return time.thread_time()
+    
+    def cpu_time(self):
+        """CPU seconds used so far by the server thread"""
+        return self._call(self._thread_time())
+    
+    async def _java(self, reader, writer):
+        self.requests += 1
+        try:
+            if self.should_fail():
+                if self.failure_mode == 'hang':
+                    while await reader.read(4096):
+                        pass
+                return
+            first = await reader.read(1)
+            if first == b'\xfe':
+                # 1.7+ servers answer legacy pings with protocol 127
+                writer.write(self.legacy_packet)
+                await writer.drain()
+                return
+            await self._java_status(reader, writer, first)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _java_status(self, reader, writer, first):
+        """Answer framed packets until the ping is ponged or the client hangs up"""
+        while True:
+            length = await read_varint(reader, first)
+            first = b''
+            if length is None:
+                return
+            packet = await reader.readexactly(length)
+            # Empty frames and handshakes get no answer
+            if not packet or (packet[0] == 0x00 and len(packet) > 1):
+                continue
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if await self._java_reply(writer, packet):
+                return
+    
+    async def _java_reply(self, writer, packet):
+        """Write the answer to a status request or ping, True once the exchange is over"""
+        if packet[0] == 0x00:
+            writer.write(self.status_packet)
+        elif packet[0] == 0x01:
+            writer.write(pong_response(packet))
+        await writer.drain()
+        return packet[0] == 0x01
@@ -1,47 +1,60 @@
 import time
-from minecraft_server_utility import ServerPinger, PlayerUtils
+from minecraft_server_utility import ServerPinger, FleetMonitor, PollScheduler
+from minecraft_server_utility.monitor import (
+    ONLINE, OFFLINE, PLAYER_JOIN, PLAYER_LEAVE, PLAYER_COUNT,
+    VERSION_CHANGE, MOTD_CHANGE, LATENCY_HIGH, LATENCY_NORMAL,
+)
+
+EVENT_MESSAGES = {
+    ONLINE: "{name} is ONLINE",
+    OFFLINE: "{name} is OFFLINE",
+    PLAYER_JOIN: "{name}: {new[name]} joined",
+    PLAYER_LEAVE: "{name}: {old[name]} left",
+    PLAYER_COUNT: "{name}: players {old} -> {new}",
+    VERSION_CHANGE: "{name}: version {old} -> {new}",
+    MOTD_CHANGE: "{name}: MOTD is now {new!r}",
+    LATENCY_HIGH: "{name}: latency high ({new}ms)",
+    LATENCY_NORMAL: "{name}: latency back to normal ({new}ms)",
+}
 
 class ServerMonitor:
-    def __init__(self, servers):
+    def __init__(self, servers, latency_threshold=250):
         self.servers = servers
-        self.player_utils = PlayerUtils()
+        self.fleet = FleetMonitor(latency_threshold=latency_threshold)
+        self.names = {}
+        for server_name, server_info in servers.items():
+            key = (server_info['host'], server_info.get('port', 25565), 'java')
+            self.names[key] = server_name
     
-    def monitor_all(self, interval=60):
-        """Monitor multiple servers at regular intervals"""
-        print(f"Monitoring {len(self.servers)} servers every {interval} seconds")
+    def monitor_all(self, interval=60, duration=None):
+        """Monitor multiple servers, printing only changes
+        
+        Each server is polled on its own jittered schedule: offline servers
+        back off, busy servers are checked more often.
+        """
+        print(f"Monitoring {len(self.servers)} servers every ~{interval} seconds")
         print("-" * 50)
         
-        while True:
-            for server_name, server_info in self.servers.items():
-                host = server_info['host']
-                port = server_info.get('port', 25565)
-                
-                pinger = ServerPinger(host, port)
-                
-                try:
-                    info = pinger.ping()
-                    
-                    print(f"\n[{time.strftime('%H:%M:%S')}] {server_name}")
-                    print(f"  Status: {'ONLINE' if info['online'] else 'OFFLINE'}")
-                    
-                    if info['online']:
-                        print(f"  Players: {info['players']['online']}/{info['players']['max']}")
-                        print(f"  Version: {info['version']}")
-                        print(f"  Latency: {info['latency']}ms")
-                        
-                        # Check for specific player
-                        target_player = server_info.get('monitor_player')
-                        if target_player:
-                            player_data = self.player_utils.search_player_in_server(info, target_player)
-                            if player_data:
-                                print(f"  🔍 {target_player} is online!")
-                    
-                except Exception as e:
-                    print(f"\n[{time.strftime('%H:%M:%S')}] {server_name}")
-                    print(f"  Status: ERROR - {e}")
-            
-            print("\n" + "=" * 50)
-            time.sleep(interval)
+        scheduler = PollScheduler(interval=interval, concurrency=16, monitor=self.fleet)
+        for host, port, _ in self.names:
+            scheduler.add(ServerPinger(host, port))
+        
+        scheduler.run(lambda result, events: [self.print_event(e) for e in events],
+                      duration=duration)
+    
+    def print_event(self, event):
+        """Print one change event"""
+        server_name = self.names[event.server]
+        stamp = time.strftime('%H:%M:%S', time.localtime(event.timestamp))
+        
+        message = EVENT_MESSAGES[event.type].format(name=server_name, old=event.old, new=event.new)
+        print(f"[{stamp}] {message}")
+        
+        # Check for specific player
+        if event.type == PLAYER_JOIN:
+            player = event.new['name']
+            if player == self.servers[server_name].get('monitor_player'):
+                print(f"  🔍 {player} is online!")
 
 # Example usage
 if __name__ == "__main__":
@@ -63,6 +76,4 @@ if __name__ == "__main__":
     
     monitor = ServerMonitor(servers_to_monitor)
     # Run for 5 minutes (300 seconds) for demo
-    for _ in range(5):
-        monitor.monitor_all(interval=10)
-        time.sleep(50)
+    monitor.monitor_all(interval=10, duration=300)
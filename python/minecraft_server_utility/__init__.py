@@ -28,25 +28,82 @@ __license__ = "MIT"
 __url__ = "https://github.com/darkboy0p/minecraft-server-utility"
 
 from .server_pinger import ServerPinger
+from .async_pinger import AsyncServerPinger, ping_servers
 from .bedrock_pinger import BedrockPinger
+from .bedrock_scanner import BedrockScanner, ping_bedrock_servers
+from .query import QueryClient
+from .query_scanner import QueryScanner, query_servers
+from .sweep import ping_many, SweepResult
+from .sharded_sweep import ShardedSweeper, SweepRecord, sweep_sharded
+from .monitor import FleetMonitor, ServerEvent
+from .scheduler import PollScheduler
+from .history import HistoryStore
+from .presence import PresenceIndex
+from .rcon import RconClient, AsyncRconClient, RconPool, AsyncRconPool, rcon_broadcast
+from .status import ServerStatus, BedrockStatus
+from .favicon import FaviconStore
+from .chat import render_chat, flatten_chat
 from .player_utils import PlayerUtils
 from .mojang_api import MojangAPI
+from .async_mojang_api import AsyncMojangAPI
+from .cache import StatusCache
+from .resolver import Resolver
+from .mojang_cache import MemoryCache, SQLiteCache
+from .rate_limit import TokenBucket, RetryPolicy
 from .exceptions import (
     MinecraftServerException,
     ServerOfflineException,
     InvalidServerException,
     MojangAPIException,
     BedrockException,
+    RconException,
+    QueryException,
 )
 
 __all__ = [
     'ServerPinger',
+    'AsyncServerPinger',
+    'ping_servers',
     'BedrockPinger',
+    'BedrockScanner',
+    'ping_bedrock_servers',
+    'QueryClient',
+    'QueryScanner',
+    'query_servers',
+    'ping_many',
+    'SweepResult',
+    'ShardedSweeper',
+    'SweepRecord',
+    'sweep_sharded',
+    'FleetMonitor',
+    'ServerEvent',
+    'PollScheduler',
+    'HistoryStore',
+    'PresenceIndex',
+    'RconClient',
+    'AsyncRconClient',
+    'RconPool',
+    'AsyncRconPool',
+    'rcon_broadcast',
+    'ServerStatus',
+    'BedrockStatus',
+    'FaviconStore',
+    'render_chat',
+    'flatten_chat',
     'PlayerUtils',
     'MojangAPI',
+    'AsyncMojangAPI',
+    'StatusCache',
+    'Resolver',
+    'MemoryCache',
+    'SQLiteCache',
+    'TokenBucket',
+    'RetryPolicy',
     'MinecraftServerException',
     'ServerOfflineException',
     'InvalidServerException',
     'MojangAPIException',
     'BedrockException',
+    'RconException',
+    'QueryException',
 ]
@@ -0,0 +1,176 @@
+import asyncio
+import importlib.util
+from typing import Dict, List, Optional, Any
+from .mojang_api import MojangAPI
+from .mojang_cache import ProfileCache, MemoryCache, MISSING
+from .rate_limit import TokenBucket, RetryPolicy
+from .exceptions import MojangAPIException
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+class AsyncMojangAPI(MojangAPI):
+    """Interact with Mojang API from an asyncio event loop
+    
+    Requires the optional ``httpx`` dependency
+    (``pip install minecraft-server-utility[async]``). Requests share one
+    keep-alive connection pool and use HTTP/2 when ``h2`` is installed; pass
+    ``client`` to supply your own ``httpx.AsyncClient`` instead. The cache,
+    rate limiter and retry policy work as in ``MojangAPI``. Cache calls run
+    in the loop's default executor, so a ``SQLiteCache`` never blocks the
+    event loop; a ``MemoryCache`` is called directly.
+    """
+    
+    def __init__(self, timeout: int = 10, cache: Optional[ProfileCache] = None,
+                 positive_ttl: float = 3600, negative_ttl: float = 300,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 max_connections: int = 20, http2: Optional[bool] = None,
+                 client: Optional['httpx.AsyncClient'] = None):
+        if httpx is None:
+            raise ImportError("AsyncMojangAPI requires httpx: pip install minecraft-server-utility[async]")
+        self._configure(timeout, cache, positive_ttl, negative_ttl, rate_limiter, retry)
+        if client is not None:
+            self.session = client
+            return
+        if http2 is None:
+            http2 = importlib.util.find_spec('h2') is not None
+        self.session = httpx.AsyncClient(
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+    
+    async def __aenter__(self) -> 'AsyncMojangAPI':
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.session.aclose()
+    
+    async def _request(self, method: str, url: str, **kwargs):
+        """Send a rate-limited request, retrying 429 responses"""
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async()
+            try:
+                response = await self.session.request(method.upper(), url, **kwargs)
+            except httpx.HTTPError as e:
+                raise MojangAPIException(f"Request failed: {str(e)}")
+            if not self._should_retry(response, attempt):
+                return response
+            attempt += 1
+    
+    async def _offload(self, func, *args) -> Any:
+        """Run a blocking cache call in the default executor"""
+        if isinstance(self.cache, MemoryCache):
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    async def _cached(self, key: str, fetch) -> Any:
+        """Return cached value for key, awaiting fetch and storing it on a miss"""
+        value = await self._offload(self.cache.get, key)
+        if value is not MISSING:
+            return value
+        
+        value = await fetch()
+        await self._offload(self._store, key, value)
+        return value
+    
+    async def get_uuid(self, username: str) -> Optional[str]:
+        """Get UUID from username"""
+        return await self._cached(f"uuid:{username.lower()}", lambda: self._fetch_uuid(username))
+    
+    async def _fetch_uuid(self, username: str) -> Optional[str]:
+        response = await self._request('get', f"{self.BASE_URL}/users/profiles/minecraft/{username}")
+        return self._parse_uuid(response)
+    
+    async def get_uuids(self, usernames: List[str]) -> Dict[str, Optional[str]]:
+        """Get UUIDs for many usernames, sending the bulk requests concurrently"""
+        names, uuids, chunks = await self._offload(self._plan_uuid_lookup, usernames)
+        found = await asyncio.gather(
+            *(self._fetch_uuids([names[key] for key in chunk]) for chunk in chunks)
+        )
+        for chunk, chunk_found in zip(chunks, found):
+            await self._offload(self._store_uuids, chunk, chunk_found, uuids)
+        
+        return {names[key]: uuids[key] for key in names}
+    
+    async def _fetch_uuids(self, usernames: List[str]) -> Dict[str, str]:
+        response = await self._request('post', f"{self.BASE_URL}/profiles/minecraft", json=usernames)
+        return self._parse_uuids(response)
+    
+    async def get_username(self, uuid: str) -> Optional[str]:
+        """Get username from UUID"""
+        profile = await self.get_profile(uuid)
+        return profile.get('name') if profile else None
+    
+    async def get_profile(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """Get full player profile including skin"""
+        uuid = self._normalize_uuid(uuid)
+        return await self._cached(f"profile:{uuid}", lambda: self._fetch_profile(uuid))
+    
+    async def _fetch_profile(self, uuid: str) -> Optional[Dict[str, Any]]:
+        response = await self._request('get', f"{self.SESSION_URL}/session/minecraft/profile/{uuid}")
+        return self._parse_profile(response)
+    
+    async def get_name_history(self, uuid: str) -> List[Dict[str, str]]:
+        """Get player's name history"""
+        uuid = self._normalize_uuid(uuid)
+        return await self._cached(f"names:{uuid}", lambda: self._fetch_name_history(uuid))
+    
+    async def _fetch_name_history(self, uuid: str) -> List[Dict[str, str]]:
+        response = await self._request('get', f"{self.BASE_URL}/user/profiles/{uuid}/names")
+        return self._parse_name_history(response)
+    
+    async def get_skin_url(self, uuid: str) -> Optional[str]:
+        """Get player's skin URL"""
+        try:
+            return self._skin_url_from_profile(await self.get_profile(uuid))
+        except MojangAPIException:
+            return None
+    
+    async def search_player(self, username: str) -> Dict[str, Any]:
+        """Search for player and return comprehensive info"""
+        result = self._new_search_result(username)
+        
+        try:
+            uuid = await self.get_uuid(username)
+            if uuid:
+                await self._complete_search(result, uuid)
+        
+        except MojangAPIException as e:
+            result['error'] = str(e)
+        
+        return result
+    
+    async def search_players(self, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Search for many players, keyed by name as given"""
+        try:
+            uuids = await self.get_uuids(usernames)
+        except MojangAPIException as e:
+            return self._failed_search_results(usernames, e)
+        
+        results = {username: self._new_search_result(username) for username in uuids}
+        await asyncio.gather(*(self._complete_search(results[username], uuid)
+                               for username, uuid in uuids.items() if uuid))
+        
+        return self._alias_search_results(results, usernames)
+    
+    async def _complete_search(self, result: Dict[str, Any], uuid: str):
+        """Fetch profile and name history for uuid concurrently into result"""
+        result['found'] = True
+        result['uuid'] = uuid
+        try:
+            profile, names = await asyncio.gather(self.get_profile(uuid), self.get_name_history(uuid))
+            result['profile'] = profile
+            result['skin_url'] = self._skin_url_from_profile(profile)
+            result['name_history'] = names
+        except MojangAPIException as e:
+            result['error'] = str(e)
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import time
+import weakref
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Union
+from .server_pinger import ServerPinger, DIALECT_ERRORS
+from .exceptions import ServerOfflineException, InvalidServerException, PacketFramingException
+from .protocol import AsyncPacketReader
+from .cache import StatusCache
+from .status import ServerStatus
+from .favicon import FaviconStore
+from .resolver import Resolver, connect_async
+from .legacy import MODERN, LEGACY_KICK_PREFIX, legacy_response_length, parse_legacy_response
+
+Target = Union['AsyncServerPinger', Tuple[str, int], Tuple[str, int, float]]
+
+# In-flight cached pings per event loop, so concurrent callers share one connection
+_inflight: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+class AsyncServerPinger(ServerPinger):
+    """Ping Minecraft Java Edition servers from an asyncio event loop"""
+    
+    def __init__(self, host: str, port: int = 25565, timeout: float = 5,
+                 semaphore: Optional[asyncio.Semaphore] = None,
+                 cache: Optional[StatusCache] = None, favicon: str = 'keep',
+                 favicon_store: Optional[FaviconStore] = None,
+                 resolver: Optional[Resolver] = None,
+                 dialects: Optional[StatusCache] = None):
+        super().__init__(host, port, timeout, cache, favicon, favicon_store, resolver, dialects)
+        self.semaphore = semaphore
+    
+    async def ping(self, measure_latency: bool = True, keep_raw: bool = True,
+                   favicon: Optional[str] = None) -> ServerStatus:
+        """Ping server and return comprehensive information"""
+        favicon = self._favicon_mode(favicon or self.favicon)
+        if self.semaphore is None:
+            return await self._ping(measure_latency, keep_raw, favicon)
+        async with self.semaphore:
+            return await self._ping(measure_latency, keep_raw, favicon)
+    
+    async def _ping(self, measure_latency: bool, keep_raw: bool = True,
+                    favicon: str = 'keep') -> ServerStatus:
+        """Try each status dialect within one per-host deadline, as ``ServerPinger.ping`` does"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        plan, protocol = self._dialect_plan()
+        error = None
+        for dialect in plan:
+            try:
+                # A spent deadline times out at once, so it is reported as a timeout
+                data, latency = await asyncio.wait_for(
+                    self._exchange_async(dialect, protocol, measure_latency),
+                    max(0.0, deadline - loop.time()))
+            except (asyncio.TimeoutError, ConnectionRefusedError):
+                raise ServerOfflineException(f"Server {self.host}:{self.port} is offline")
+            except ServerOfflineException:
+                raise
+            except DIALECT_ERRORS as e:
+                error = error or e
+                continue
+            except Exception as e:
+                error = e
+                break
+            return self._finish(dialect, data, latency, keep_raw, favicon)
+        
+        self.dialects.invalidate(self._dialect_key)
+        raise InvalidServerException(f"Error pinging server: {str(error)}")
+    
+    async def _exchange_async(self, dialect: str, protocol: int,
+                              measure_latency: bool) -> Tuple[Dict[str, Any], Optional[float]]:
+        """Run one status exchange in dialect on a single connection"""
+        target = await self.resolver.resolve_async(self.host, self.port, self.timeout)
+        try:
+            sock = await connect_async(target.addresses)
+        except ConnectionRefusedError:
+            raise
+        except OSError as e:
+            raise ServerOfflineException(f"Server {self.host}:{self.port} is unreachable: {str(e)}")
+        try:
+            reader, writer = await asyncio.open_connection(sock=sock)
+        except BaseException:
+            sock.close()
+            raise
+        packets = AsyncPacketReader(reader)
+        
+        try:
+            if dialect != MODERN:
+                start = time.perf_counter()
+                writer.write(self._create_legacy_ping(dialect))
+                await writer.drain()
+                header = await packets.read_exact(3)
+                body = await packets.read_exact(legacy_response_length(header))
+                latency = round((time.perf_counter() - start) * 1000, 2)
+                return parse_legacy_response(body), latency if measure_latency else None
+            
+            # Handshake and status request go out in one write
+            writer.write(self._create_handshake(protocol) + b'\x01\x00')
+            await writer.drain()
+            
+            if await packets.peek(2) == LEGACY_KICK_PREFIX:
+                raise PacketFramingException("Server only speaks the legacy protocol")
+            response = await self._read_response_async(packets)
+            if not response:
+                raise ServerOfflineException(f"Server {self.host}:{self.port} is offline")
+            
+            latency = await self._ping_pong_async(packets, writer) if measure_latency else None
+        finally:
+            self.bytes_read += packets.bytes_read
+            writer.close()
+        
+        return json.loads(response), latency
+    
+    async def _ping_pong_async(self, packets: AsyncPacketReader,
+                               writer: asyncio.StreamWriter) -> float:
+        """Measure Ping/Pong round-trip in milliseconds on an open status connection"""
+        try:
+            payload = int(time.time() * 1000)
+            start = time.perf_counter()
+            writer.write(self._create_ping(payload))
+            await writer.drain()
+            
+            if not self._is_pong(*await packets.read_packet(), payload):
+                return -1.0
+            return round((time.perf_counter() - start) * 1000, 2)
+        except (OSError, PacketFramingException):
+            return -1.0
+    
+    async def _read_response_async(self, packets: AsyncPacketReader) -> str:
+        """Read status response from stream"""
+        packet_id, payload = await packets.read_packet()
+        return self._decode_status(packet_id, payload)
+    
+    async def cached_ping(self) -> ServerStatus:
+        """Return a recent ping result from the status cache, pinging if needed"""
+        key = self._cache_key
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        
+        pending = _inflight.setdefault(asyncio.get_running_loop(), {})
+        task = pending.get(key)
+        if task is None:
+            task = pending[key] = asyncio.ensure_future(self._ping_and_store(key))
+            task.add_done_callback(lambda _: pending.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _ping_and_store(self, key: Tuple[Any, ...]) -> ServerStatus:
+        result = await self.ping(keep_raw=True)
+        self.cache.put(key, result)
+        return result
+    
+    async def is_online(self) -> bool:
+        """Check if server is online"""
+        try:
+            await self.cached_ping()
+            return True
+        except ServerOfflineException:
+            return False
+    
+    async def get_player_count(self) -> int:
+        """Get online player count"""
+        try:
+            info = await self.cached_ping()
+            return info['players']['online']
+        except ServerOfflineException:
+            return 0
+    
+    async def get_player_list(self) -> List[str]:
+        """Get list of online players"""
+        try:
+            info = await self.cached_ping()
+            players = info['players']['list']
+            return [player['name'] for player in players]
+        except (ServerOfflineException, KeyError):
+            return []
+    
+    async def get_motd(self) -> str:
+        """Get server MOTD"""
+        try:
+            info = await self.cached_ping()
+            return info['motd']
+        except ServerOfflineException:
+            return ""
+    
+    async def get_version(self) -> str:
+        """Get server version"""
+        try:
+            info = await self.cached_ping()
+            return info['version']
+        except ServerOfflineException:
+            return "Unknown"
+
+def _as_pinger(target: Target, timeout: float) -> AsyncServerPinger:
+    """Normalize a sweep target into an AsyncServerPinger"""
+    if isinstance(target, AsyncServerPinger):
+        return target
+    if len(target) == 3:
+        host, port, timeout = target
+    else:
+        host, port = target
+    return AsyncServerPinger(host, port, timeout)
+
+async def ping_servers(targets: Iterable[Target], concurrency: int = 256,
+                       timeout: float = 5) -> List[Union[Dict[str, Any], Exception]]:
+    """Ping many Java servers on one event loop
+    
+    Targets are ``AsyncServerPinger`` instances, ``(host, port)`` or
+    ``(host, port, timeout)`` tuples. At most ``concurrency`` connections are
+    open at once. Results come back in input order; a failed ping is returned
+    as its exception instead of aborting the sweep.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def limited(pinger: AsyncServerPinger) -> Dict[str, Any]:
+        async with semaphore:
+            return await pinger.ping()
+    
+    pingers = [_as_pinger(target, timeout) for target in targets]
+    return await asyncio.gather(*(limited(p) for p in pingers), return_exceptions=True)
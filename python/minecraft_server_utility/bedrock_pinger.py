@@ -1,96 +1,98 @@
 import socket
 import struct
-import json
+import random
 import time
 from typing import Dict, Any, Optional
 from .exceptions import ServerOfflineException
+from .cache import StatusCache, default_status_cache
+from .bedrock_pong import BedrockPong, RAKNET_MAGIC, UNCONNECTED_PONG
+from .status import BedrockStatus
+
+UNCONNECTED_PING = 0x01
+
+# Largest UDP payload; servers with long MOTDs send pongs well past 1 KB
+MAX_DATAGRAM = 65535
+
+# Identifies this process to servers; chosen once like a real client
+CLIENT_GUID = random.getrandbits(64)
+
+def create_unconnected_ping(timestamp: int, client_guid: int = CLIENT_GUID) -> bytes:
+    """Create RakNet unconnected ping carrying a timestamp the server echoes back"""
+    return (struct.pack('>BQ', UNCONNECTED_PING, timestamp) + RAKNET_MAGIC
+            + struct.pack('>Q', client_guid))
+
+def pong_timestamp(data: bytes) -> Optional[int]:
+    """Return the echoed ping timestamp of an unconnected pong, None if not a pong"""
+    if len(data) < 9 or data[0] != UNCONNECTED_PONG:
+        return None
+    return struct.unpack_from('>Q', data, 1)[0]
 
 class BedrockPinger:
     """Ping Minecraft Bedrock Edition servers"""
     
-    def __init__(self, host: str, port: int = 19132, timeout: int = 5):
+    def __init__(self, host: str, port: int = 19132, timeout: int = 5,
+                 cache: Optional[StatusCache] = None):
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.cache = cache if cache is not None else default_status_cache
+        
+    def ping(self) -> BedrockStatus:
+        """Ping Bedrock server
         
-    def ping(self) -> Dict[str, Any]:
-        """Ping Bedrock server"""
+        ``timeout`` bounds the whole call, however many stray datagrams
+        arrive before the pong.
+        """
+        sock = None
         try:
+            deadline = time.monotonic() + self.timeout
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(self.timeout)
             
-            # Create unconnected ping packet
-            packet = bytearray()
-            packet.extend(b'\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xff\x00\xfe\xfe\xfe\xfe\xfd\xfd\xfd\xfd\x12\x34\x56\x78')
-            
-            # Add client GUID
-            packet.extend(b'\x00\x00\x00\x00\x00\x00\x00\x00')
+            # Unique timestamp lets us tell our pong apart from stray datagrams
+            timestamp = time.monotonic_ns() // 1000000
+            packet = create_unconnected_ping(timestamp)
             
             # Send ping
             start_time = time.time()
-            sock.sendto(bytes(packet), (self.host, self.port))
+            sock.sendto(packet, (self.host, self.port))
             
             # Receive response
-            data, _ = sock.recvfrom(1024)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout()
+                sock.settimeout(remaining)
+                data, _ = sock.recvfrom(MAX_DATAGRAM)
+                if pong_timestamp(data) == timestamp:
+                    break
             latency = (time.time() - start_time) * 1000
             
-            # Parse response
-            response = self._parse_response(data)
-            response['latency'] = round(latency, 2)
-            response['online'] = True
-            response['host'] = self.host
-            response['port'] = self.port
-            
-            return response
+            return self._build_result(data, latency)
             
         except socket.timeout:
             raise ServerOfflineException(f"Bedrock server {self.host}:{self.port} is offline")
         except Exception as e:
             raise ServerOfflineException(f"Error pinging bedrock server: {str(e)}")
         finally:
-            sock.close()
+            if sock is not None:
+                sock.close()
+    
+    def _build_result(self, data: bytes, latency: float) -> BedrockStatus:
+        """Build result from an unconnected pong"""
+        return BedrockStatus(self.host, self.port, BedrockPong(data), round(latency, 2))
     
     def _parse_response(self, data: bytes) -> Dict[str, Any]:
         """Parse Bedrock server response"""
-        # Skip header (1 byte)
-        offset = 1
-        
-        # Read server GUID (8 bytes)
-        server_guid = struct.unpack_from('>Q', data, offset)[0]
-        offset += 8
-        
-        # Read magic (16 bytes)
-        offset += 16
-        
-        # Read server ID length
-        server_id_len = struct.unpack_from('>H', data, offset)[0]
-        offset += 2
-        
-        # Read server ID
-        server_id = data[offset:offset + server_id_len].decode('utf-8')
-        offset += server_id_len
-        
-        # Parse server info from JSON
-        server_info = json.loads(server_id.split(';')[0])
-        
-        return {
-            'server_guid': server_guid,
-            'edition': server_info.get('edition', 'Unknown'),
-            'motd': server_info.get('motd', ''),
-            'version': server_info.get('version', ''),
-            'protocol': server_info.get('protocol', 0),
-            'max_players': server_info.get('maxPlayers', 0),
-            'online_players': server_info.get('players', 0),
-            'server_id': server_info.get('serverId', ''),
-            'gamemode': server_info.get('gamemode', 'Unknown'),
-            'port_v4': server_info.get('portIPv4', 0),
-            'port_v6': server_info.get('portIPv6', 0)
-        }
+        return BedrockPong(data).to_dict()
+    
+    def cached_ping(self) -> BedrockStatus:
+        """Return a recent ping result from the status cache, pinging if needed"""
+        return self.cache.get_or_ping((self.host, self.port, 'bedrock'), self.ping)
     
     def is_online(self) -> bool:
         """Check if Bedrock server is online"""
         try:
-            self.ping()
+            self.cached_ping()
             return True
         except ServerOfflineException:
             return False
@@ -0,0 +1,157 @@
+import re
+import struct
+from typing import Dict, List, Any
+from .exceptions import BedrockException
+
+RAKNET_MAGIC = b'\x00\xff\xff\x00\xfe\xfe\xfe\xfe\xfd\xfd\xfd\xfd\x12\x34\x56\x78'
+
+UNCONNECTED_PONG = 0x1c
+
+# Packet ID, echoed ping time, server GUID, magic, advertisement length
+_HEADER = struct.Struct('>BQQ16sH')
+
+_SEPARATOR = re.compile(b';')
+
+class BedrockPong:
+    """Unconnected pong parsed lazily from a bytes-like buffer
+    
+    Only the fixed header is decoded up front, straight from the buffer
+    (``bytes``, ``bytearray`` or ``memoryview``) without copying it. The
+    ``MCPE;motd;protocol;...`` advertisement is scanned for its ``;``
+    offsets in place on first field access, and each field's slice is
+    decoded to ``str`` only when it is read, so a sweep that only wants
+    player counts never decodes or copies the MOTD. A pong built over a
+    reusable receive buffer must not outlive the next receive into it.
+    """
+    
+    __slots__ = ('timestamp', 'server_guid', '_data', '_end', '_offsets')
+    
+    FIELDS = ('edition', 'motd', 'protocol', 'version', 'players', 'max_players',
+              'server_id', 'level_name', 'gamemode', 'gamemode_id', 'port_v4', 'port_v6')
+    
+    def __init__(self, data):
+        if len(data) < _HEADER.size or data[0] != UNCONNECTED_PONG:
+            raise BedrockException("Not an unconnected pong")
+        _, self.timestamp, self.server_guid, magic, length = _HEADER.unpack_from(data)
+        if magic != RAKNET_MAGIC:
+            raise BedrockException("Pong has invalid RakNet magic")
+        self._end = _HEADER.size + length
+        if self._end > len(data):
+            raise BedrockException("Pong advertisement is truncated")
+        self._data = data
+        # End offset of each field located so far; the last field ends at _end
+        self._offsets: List[int] = []
+    
+    def _decode(self, start: int, end: int) -> str:
+        # Slicing a memoryview does not copy; a bytes slice copies just this field
+        return str(self._data[start:end], 'utf-8', 'replace')
+    
+    def _locate(self, index: int):
+        """Find field end offsets in place, stopping at index or the last field"""
+        data, end, offsets = self._data, self._end, self._offsets
+        position = offsets[-1] + 1 if offsets else _HEADER.size
+        # bytes and bytearray search in place; memoryview has no find
+        find = data.find if not isinstance(data, memoryview) else None
+        while len(offsets) <= index:
+            if find is not None:
+                found = find(b';', position, end)
+            else:
+                match = _SEPARATOR.search(data, position, end)
+                found = match.start() if match else -1
+            if found < 0:
+                offsets.append(end)
+                return
+            offsets.append(found)
+            position = found + 1
+    
+    def field(self, index: int) -> str:
+        """Decode advertisement field by position, '' when the server omits it"""
+        offsets = self._offsets
+        if len(offsets) <= index and not (offsets and offsets[-1] == self._end):
+            self._locate(index)
+        if index >= len(offsets):
+            return ''
+        start = offsets[index - 1] + 1 if index else _HEADER.size
+        return self._decode(start, offsets[index])
+    
+    def _int_field(self, index: int) -> int:
+        return _to_int(self.field(index))
+    
+    @property
+    def edition(self) -> str:
+        return self.field(0) or 'Unknown'
+    
+    @property
+    def motd(self) -> str:
+        return self.field(1)
+    
+    @property
+    def protocol(self) -> int:
+        return self._int_field(2)
+    
+    @property
+    def version(self) -> str:
+        return self.field(3)
+    
+    @property
+    def players(self) -> int:
+        return self._int_field(4)
+    
+    @property
+    def max_players(self) -> int:
+        return self._int_field(5)
+    
+    @property
+    def server_id(self) -> str:
+        return self.field(6)
+    
+    @property
+    def level_name(self) -> str:
+        return self.field(7)
+    
+    @property
+    def gamemode(self) -> str:
+        return self.field(8) or 'Unknown'
+    
+    @property
+    def gamemode_id(self) -> int:
+        return self._int_field(9)
+    
+    @property
+    def port_v4(self) -> int:
+        return self._int_field(10)
+    
+    @property
+    def port_v6(self) -> int:
+        return self._int_field(11)
+    
+    @property
+    def advertisement(self) -> str:
+        """The full advertisement string"""
+        return self._decode(_HEADER.size, self._end)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode every field into the BedrockPinger result layout"""
+        # One decode and split is cheaper than twelve single-field lookups
+        fields = self.advertisement.split(';')
+        fields.extend([''] * (len(self.FIELDS) - len(fields)))
+        return {
+            'server_guid': self.server_guid,
+            'edition': fields[0] or 'Unknown',
+            'motd': fields[1],
+            'version': fields[3],
+            'protocol': _to_int(fields[2]),
+            'max_players': _to_int(fields[5]),
+            'online_players': _to_int(fields[4]),
+            'server_id': fields[6],
+            'level_name': fields[7],
+            'gamemode': fields[8] or 'Unknown',
+            'port_v4': _to_int(fields[10]),
+            'port_v6': _to_int(fields[11])
+        }
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return 0
@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import random
+import socket
+import time
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Union
+from .bedrock_pinger import BedrockPinger, create_unconnected_ping, pong_timestamp
+from .exceptions import ServerOfflineException, BedrockException
+
+Target = Union[BedrockPinger, Tuple[str, int]]
+
+class _Probe:
+    """One outstanding unconnected ping"""
+    
+    __slots__ = ('addr', 'future', 'sent_at')
+    
+    def __init__(self, addr: Tuple[str, int], future: asyncio.Future, sent_at: float):
+        self.addr = addr
+        self.future = future
+        self.sent_at = sent_at
+
+class _ScanProtocol(asyncio.DatagramProtocol):
+    """Hand incoming pongs to the probe whose timestamp and address they match"""
+    
+    def __init__(self, pending: Dict[int, _Probe]):
+        self.pending = pending
+    
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        probe = self.pending.get(pong_timestamp(data))
+        if probe is None or probe.future.done() or probe.addr != addr[:2]:
+            return
+        probe.future.set_result((data, time.perf_counter() - probe.sent_at))
+
+class BedrockScanner:
+    """Probe many Bedrock servers from a handful of UDP sockets
+    
+    Every ping carries a unique timestamp that the server echoes in its pong,
+    so replies from any number of servers can share one socket and still be
+    matched to the right request. Pings that go unanswered are resent until
+    the server's timeout runs out: the ``timeout`` of a supplied
+    ``BedrockPinger``, or the scanner's for ``(host, port)`` targets. Address
+    resolution counts against that timeout.
+    """
+    
+    def __init__(self, timeout: float = 5, retries: int = 2, sockets: int = 1,
+                 concurrency: int = 1024):
+        self.timeout = timeout
+        self.retries = retries
+        self.sockets = sockets
+        self.concurrency = concurrency
+        self._pending: Dict[int, _Probe] = {}
+        self._tokens = itertools.count(random.getrandbits(48))
+    
+    async def scan(self, targets: Iterable[Target]) -> List[Union[Dict[str, Any], Exception]]:
+        """Ping every target, returning results or exceptions in input order"""
+        loop = asyncio.get_running_loop()
+        pingers = [t if isinstance(t, BedrockPinger) else BedrockPinger(*t, timeout=self.timeout)
+                   for t in targets]
+        transports = []
+        try:
+            for _ in range(self.sockets):
+                transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _ScanProtocol(self._pending),
+                    local_addr=('0.0.0.0', 0), family=socket.AF_INET
+                )
+                transports.append(transport)
+            
+            semaphore = asyncio.Semaphore(self.concurrency)
+            
+            async def limited(index: int, pinger: BedrockPinger) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._probe(transports[index % len(transports)], pinger)
+            
+            return await asyncio.gather(*(limited(i, p) for i, p in enumerate(pingers)),
+                                        return_exceptions=True)
+        finally:
+            for transport in transports:
+                transport.close()
+    
+    async def _probe(self, transport: asyncio.DatagramTransport,
+                     pinger: BedrockPinger) -> Dict[str, Any]:
+        """Ping one server, resending within its timeout until a pong arrives"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + pinger.timeout
+        try:
+            addr = await asyncio.wait_for(self._resolve(pinger.host, pinger.port), pinger.timeout)
+        except asyncio.TimeoutError:
+            raise ServerOfflineException(f"Bedrock server {pinger.host}:{pinger.port} could not be resolved in time")
+        pong = await self._exchange(transport, addr, deadline, pinger.timeout / (self.retries + 1))
+        if pong is None:
+            raise ServerOfflineException(f"Bedrock server {pinger.host}:{pinger.port} is offline")
+        
+        data, elapsed = pong
+        try:
+            return pinger._build_result(data, elapsed * 1000)
+        except Exception as e:
+            raise BedrockException(f"Invalid pong from {pinger.host}:{pinger.port}: {str(e)}")
+    
+    async def _exchange(self, transport: asyncio.DatagramTransport, addr: Tuple[str, int],
+                        deadline: float, interval: float) -> Optional[Tuple[bytes, float]]:
+        """Send pings every interval until one is answered, None once the deadline passes"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        tokens = []
+        try:
+            for _ in range(self.retries + 1):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                token = next(self._tokens)
+                tokens.append(token)
+                self._pending[token] = _Probe(addr, future, time.perf_counter())
+                transport.sendto(create_unconnected_ping(token), addr)
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), min(interval, remaining))
+                except asyncio.TimeoutError:
+                    continue
+            return None
+        finally:
+            for token in tokens:
+                self._pending.pop(token, None)
+    
+    async def _resolve(self, host: str, port: int) -> Tuple[str, int]:
+        """Resolve host to the IPv4 address pongs will come from"""
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        except socket.gaierror:
+            raise ServerOfflineException(f"Bedrock server {host}:{port} could not be resolved")
+        return infos[0][4][:2]
+
+async def ping_bedrock_servers(targets: Iterable[Target], timeout: float = 5, retries: int = 2,
+                               sockets: int = 1, concurrency: int = 1024
+                               ) -> List[Union[Dict[str, Any], Exception]]:
+    """Ping many Bedrock servers over shared UDP sockets
+    
+    Targets are ``BedrockPinger`` instances or ``(host, port)`` tuples.
+    Results come back in input order; a failed ping is returned as its
+    exception instead of aborting the scan.
+    """
+    scanner = BedrockScanner(timeout, retries, sockets, concurrency)
+    return await scanner.scan(targets)
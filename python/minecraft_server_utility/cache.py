@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Optional
+
+class _InFlight:
+    """A ping shared by every caller that asked for the same key"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+class StatusCache:
+    """Thread-safe TTL + LRU cache of server status results
+    
+    Keys are tuples starting with ``(host, port, edition)``; Java pingers
+    add the favicon and raw-response settings, so pingers configured
+    differently never share results. Only successful pings are
+    stored; errors are handed to every waiting caller but not cached. While a
+    ping for a key is running, other callers for that key wait for its result
+    instead of opening their own connections. Cached results are shared, so
+    callers must not mutate them.
+    """
+    
+    def __init__(self, ttl: float = 5.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached result or None"""
+        with self._lock:
+            return self._get_locked(key)
+    
+    def _get_locked(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, result = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+    
+    def put(self, key: Hashable, result: Dict[str, Any]):
+        """Store a result, evicting the least recently used entries"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def get_or_ping(self, key: Hashable, ping: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the cached result for key, or run ping once for all concurrent callers"""
+        with self._lock:
+            result = self._get_locked(key)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlight()
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = ping()
+            self.put(key, call.result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+    
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or every entry when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Shared by every pinger that isn't given its own cache
+default_status_cache = StatusCache()
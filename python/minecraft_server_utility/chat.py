@@ -0,0 +1,318 @@
+import functools
+import html
+from typing import Dict, List, Optional, Any, Tuple
+
+# name: (legacy code, html colour, ANSI SGR code)
+COLORS: Dict[str, Tuple[str, str, int]] = {
+    'black': ('0', '#000000', 30),
+    'dark_blue': ('1', '#0000AA', 34),
+    'dark_green': ('2', '#00AA00', 32),
+    'dark_aqua': ('3', '#00AAAA', 36),
+    'dark_red': ('4', '#AA0000', 31),
+    'dark_purple': ('5', '#AA00AA', 35),
+    'gold': ('6', '#FFAA00', 33),
+    'gray': ('7', '#AAAAAA', 37),
+    'dark_gray': ('8', '#555555', 90),
+    'blue': ('9', '#5555FF', 94),
+    'green': ('a', '#55FF55', 92),
+    'aqua': ('b', '#55FFFF', 96),
+    'red': ('c', '#FF5555', 91),
+    'light_purple': ('d', '#FF55FF', 95),
+    'yellow': ('e', '#FFFF55', 93),
+    'white': ('f', '#FFFFFF', 97),
+}
+
+# name: (legacy code, ANSI SGR code, CSS declaration)
+FORMATS: Tuple[Tuple[str, str, int, str], ...] = (
+    ('bold', 'l', 1, 'font-weight:bold'),
+    ('italic', 'o', 3, 'font-style:italic'),
+    ('underlined', 'n', 4, 'text-decoration:underline'),
+    ('strikethrough', 'm', 9, 'text-decoration:line-through'),
+    ('obfuscated', 'k', 5, ''),
+)
+
+RENDER_FORMATS = ('plain', 'legacy', 'ansi', 'html')
+
+# A few vanilla keys servers put in MOTDs; anything else renders its fallback or key
+TRANSLATIONS: Dict[str, str] = {
+    'chat.type.text': '<%s> %s',
+    'chat.type.announcement': '[%s] %s',
+    'multiplayer.status.unknown': '???',
+    'menu.game': 'Game Menu',
+}
+
+# (colour, bold, italic, underlined, strikethrough, obfuscated)
+Style = Tuple[Optional[str], bool, bool, bool, bool, bool]
+
+PLAIN: Style = (None, False, False, False, False, False)
+
+_CODE_COLORS = {code: name for name, (code, _, _) in COLORS.items()}
+_CODE_FORMATS = {code: i + 1 for i, (_, code, _, _) in enumerate(FORMATS)}
+
+def _merge_style(style: Style, component: Dict[str, Any]) -> Style:
+    """Apply a component's own colour and formats on top of the inherited style"""
+    color = component.get('color', style[0])
+    if color is not None and not (isinstance(color, str) and color in COLORS) and not _is_hex(color):
+        color = style[0]
+    return (color,) + tuple(
+        _flag(component[name]) if name in component else style[i + 1]
+        for i, (name, _, _, _) in enumerate(FORMATS)
+    )
+
+def _flag(value: Any) -> bool:
+    """Read a format flag; only true and "true" switch it on"""
+    return value is True or value == 'true'
+
+def _is_hex(color: Any) -> bool:
+    if not isinstance(color, str) or len(color) != 7 or color[0] != '#':
+        return False
+    try:
+        int(color[1:], 16)
+        return True
+    except ValueError:
+        return False
+
+def _legacy_runs(text: str, style: Style, runs: List[Tuple[str, Style]]):
+    """Split text on legacy section-sign codes into styled runs"""
+    if '§' not in text:
+        if text:
+            runs.append((text, style))
+        return
+    start = 0
+    i = 0
+    while i < len(text):
+        if text[i] != '§' or i + 1 >= len(text):
+            i += 1
+            continue
+        if i > start:
+            runs.append((text[start:i], style))
+        style, i = _apply_code(text, i + 2, style)
+        start = i
+    if start < len(text):
+        runs.append((text[start:], style))
+
+def _apply_code(text: str, i: int, style: Style) -> Tuple[Style, int]:
+    """Apply the legacy code just before i, returning the new style and where text resumes"""
+    code = text[i - 1].lower()
+    if code in _CODE_COLORS:
+        return (_CODE_COLORS[code],) + PLAIN[1:], i
+    if code in _CODE_FORMATS:
+        return style[:_CODE_FORMATS[code]] + (True,) + style[_CODE_FORMATS[code] + 1:], i
+    if code == 'r':
+        return PLAIN, i
+    if code == 'x':
+        # §x§R§R§G§G§B§B hex colour
+        digits = text[i + 1:i + 12:2]
+        if len(digits) == 6 and text[i:i + 12:2] == '§' * 6 and _is_hex('#' + digits):
+            return ('#' + digits.upper(),) + PLAIN[1:], i + 12
+    return style, i
+
+def _translate(component: Dict[str, Any]) -> List[Any]:
+    """Expand a translate component into literal text and argument components"""
+    key = str(component['translate'])
+    template = TRANSLATIONS.get(key, str(component.get('fallback', key)))
+    args = component.get('with', [])
+    if not isinstance(args, list):
+        args = []
+    parts: List[Any] = []
+    literal = ''
+    position = 0
+    i = 0
+    while i < len(template):
+        placeholder = _placeholder(template, i) if template[i] == '%' else None
+        if placeholder is None:
+            literal += template[i]
+            i += 1
+            continue
+        index, i = placeholder
+        if index == -2:
+            literal += '%'
+            continue
+        if index == -1:
+            index = position
+            position += 1
+        if literal:
+            parts.append(literal)
+            literal = ''
+        if 0 <= index < len(args):
+            parts.append(args[index])
+    if literal:
+        parts.append(literal)
+    return parts
+
+def _placeholder(template: str, i: int) -> Optional[Tuple[int, int]]:
+    """Parse the placeholder at a '%', returning (argument index, next position)
+    
+    The index is -1 for a positional ``%s`` and -2 for an escaped ``%%``;
+    None means the '%' is literal.
+    """
+    if i + 1 >= len(template):
+        return None
+    if template[i + 1] == '%':
+        return -2, i + 2
+    end = i + 1
+    while end < len(template) and template[end].isdigit():
+        end += 1
+    if template[end:end + 2] == '$s' and end > i + 1:
+        return int(template[i + 1:end]) - 1, end + 2
+    if template[i + 1] == 's':
+        return -1, i + 2
+    return None
+
+def _content(component: Dict[str, Any]) -> List[Any]:
+    """Text-bearing pieces of a component, before its extra"""
+    if 'text' in component:
+        return [str(component['text'])]
+    if 'translate' in component:
+        return _translate(component)
+    if 'keybind' in component:
+        return [str(component['keybind'])]
+    if 'score' in component and isinstance(component['score'], dict):
+        return [str(component['score'].get('value', ''))]
+    if 'selector' in component:
+        return [str(component['selector'])]
+    return []
+
+def flatten_chat(component: Any) -> List[Tuple[str, Style]]:
+    """Flatten a chat component into (text, style) runs
+    
+    Walks the component with an explicit stack, so arbitrarily deep
+    ``extra`` nesting cannot hit the recursion limit. Styles are inherited
+    from parent to child, and legacy section-sign codes inside text are
+    honoured. Adjacent runs with the same style are merged.
+    """
+    runs: List[Tuple[str, Style]] = []
+    stack: List[Tuple[Any, Style]] = [(component, PLAIN)]
+    while stack:
+        node, style = stack.pop()
+        if isinstance(node, list):
+            node = _list_component(node)
+        if isinstance(node, str):
+            _legacy_runs(node, style, runs)
+        elif isinstance(node, dict):
+            style = _merge_style(style, node)
+            children = _content(node)
+            extra = node.get('extra')
+            if isinstance(extra, list):
+                children = children + extra
+            for child in reversed(children):
+                stack.append((child, style))
+        elif node is not None:
+            _legacy_runs(str(node), style, runs)
+    return _merge_runs(runs)
+
+def _list_component(node: List[Any]) -> Optional[Dict[str, Any]]:
+    """Read [a, b, c] as a with b and c appended to its extra"""
+    if not node:
+        return None
+    head = node[0]
+    if not isinstance(head, dict):
+        head = {'text': head} if isinstance(head, str) else {'extra': [head]}
+    extra = head.get('extra', [])
+    return dict(head, extra=(extra if isinstance(extra, list) else []) + node[1:])
+
+def _merge_runs(runs: List[Tuple[str, Style]]) -> List[Tuple[str, Style]]:
+    """Join adjacent runs that share a style"""
+    merged: List[Tuple[List[str], Style]] = []
+    for text, style in runs:
+        if merged and merged[-1][1] == style:
+            merged[-1][0].append(text)
+        else:
+            merged.append(([text], style))
+    return [(''.join(texts), style) for texts, style in merged]
+
+def _to_plain(runs: List[Tuple[str, Style]]) -> str:
+    return ''.join(text for text, _ in runs)
+
+def _to_legacy(runs: List[Tuple[str, Style]]) -> str:
+    out = []
+    current = PLAIN
+    for text, style in runs:
+        if style != current:
+            color = style[0]
+            if color is None:
+                out.append('§r')
+            elif color in COLORS:
+                out.append('§' + COLORS[color][0])
+            else:
+                out.append('§x' + ''.join('§' + c for c in color[1:].lower()))
+            for i, (_, code, _, _) in enumerate(FORMATS):
+                if style[i + 1]:
+                    out.append('§' + code)
+            current = style
+        out.append(text)
+    return ''.join(out)
+
+def _to_ansi(runs: List[Tuple[str, Style]]) -> str:
+    out = []
+    current = PLAIN
+    for text, style in runs:
+        if style != current:
+            codes = ['0']
+            color = style[0]
+            if color in COLORS:
+                codes.append(str(COLORS[color][2]))
+            elif color is not None:
+                codes.append('38;2;%d;%d;%d' % (int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)))
+            codes.extend(str(sgr) for i, (_, _, sgr, _) in enumerate(FORMATS) if style[i + 1])
+            out.append('\x1b[' + ';'.join(codes) + 'm')
+            current = style
+        out.append(text)
+    if current != PLAIN:
+        out.append('\x1b[0m')
+    return ''.join(out)
+
+def _to_html(runs: List[Tuple[str, Style]]) -> str:
+    out = []
+    for text, style in runs:
+        text = html.escape(text).replace('\n', '<br>')
+        css = []
+        color = style[0]
+        if color is not None:
+            css.append('color:' + (COLORS[color][1] if color in COLORS else color))
+        decorations = []
+        for i, (name, _, _, declaration) in enumerate(FORMATS):
+            if not style[i + 1] or not declaration:
+                continue
+            if declaration.startswith('text-decoration:'):
+                decorations.append(declaration.split(':', 1)[1])
+            else:
+                css.append(declaration)
+        if decorations:
+            css.append('text-decoration:' + ' '.join(decorations))
+        if css:
+            out.append('<span style="%s">%s</span>' % (';'.join(css), text))
+        else:
+            out.append(text)
+    return ''.join(out)
+
+_RENDERERS = {
+    'plain': _to_plain,
+    'legacy': _to_legacy,
+    'ansi': _to_ansi,
+    'html': _to_html,
+}
+
+@functools.lru_cache(maxsize=4096)
+def _render_string(text: str, fmt: str) -> str:
+    return _RENDERERS[fmt](flatten_chat(text))
+
+def render_chat(component: Any, fmt: str = 'plain') -> str:
+    """Render a chat component (JSON object, list or legacy string) as text
+    
+    ``fmt`` is one of ``RENDER_FORMATS``: ``'plain'`` strips all styling,
+    ``'legacy'`` emits section-sign codes, ``'ansi'`` emits terminal escape
+    sequences and ``'html'`` emits escaped text in styled spans. Legacy
+    strings, which is how most servers send their MOTD, are memoized; a
+    JSON component would cost as much to key as to flatten, so it is
+    rendered directly.
+    """
+    if fmt not in _RENDERERS:
+        raise ValueError(f"fmt must be one of {', '.join(RENDER_FORMATS)}, got {fmt!r}")
+    if isinstance(component, str):
+        return _render_string(component, fmt)
+    return _RENDERERS[fmt](flatten_chat(component))
+
+def clear_render_cache():
+    """Drop memoized renderings"""
+    _render_string.cache_clear()
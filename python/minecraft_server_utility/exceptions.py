@@ -17,3 +17,15 @@ class MojangAPIException(MinecraftServerException):
 class BedrockException(MinecraftServerException):
     """Raised for Bedrock server errors"""
     pass
+
+class PacketFramingException(MinecraftServerException):
+    """Raised when a server sends a malformed or truncated packet"""
+    pass
+
+class RconException(MinecraftServerException):
+    """Raised when an RCON login or command fails"""
+    pass
+
+class QueryException(MinecraftServerException):
+    """Raised when a Query protocol response is malformed"""
+    pass
@@ -0,0 +1,106 @@
+import base64
+import binascii
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+FAVICON_MODES = ('keep', 'skip', 'hash')
+
+_PREFIX = 'data:image/png;base64,'
+
+def decode_favicon(uri: Optional[str]) -> Optional[bytes]:
+    """Decode a status favicon data URI to PNG bytes, None when absent or malformed"""
+    if not uri or ',' not in uri:
+        return None
+    try:
+        return base64.b64decode(uri.split(',', 1)[1])
+    except (binascii.Error, ValueError):
+        return None
+
+def favicon_hash(png: bytes) -> str:
+    """Content hash identifying a decoded favicon"""
+    return hashlib.sha256(png).hexdigest()
+
+class FaviconStore:
+    """Thread-safe content-addressed store holding each unique favicon once
+    
+    ``put`` returns the hash of the decoded PNG, which results keep instead
+    of the base64 string. With a ``directory`` each image is also written
+    once as ``<hash>.png``, so favicons survive restarts and can be served
+    straight from disk; lookups fall back to the directory on a memory miss.
+    """
+    
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._images: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+    
+    def put(self, png: bytes) -> str:
+        """Store decoded PNG bytes, returning their hash"""
+        digest = favicon_hash(png)
+        with self._lock:
+            if digest in self._images:
+                return digest
+            self._images[digest] = png
+        if self.directory is not None:
+            self._write(digest, png)
+        return digest
+    
+    def put_uri(self, uri: Optional[str]) -> Optional[str]:
+        """Store a status favicon data URI, returning its hash or None"""
+        png = decode_favicon(uri)
+        return self.put(png) if png is not None else None
+    
+    def get(self, digest: str) -> Optional[bytes]:
+        """Return PNG bytes for a hash, or None when unknown"""
+        with self._lock:
+            png = self._images.get(digest)
+        if png is not None or self.directory is None:
+            return png
+        try:
+            with open(self.path(digest), 'rb') as f:
+                png = f.read()
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._images[digest] = png
+        return png
+    
+    def data_uri(self, digest: str) -> Optional[str]:
+        """Rebuild the status favicon data URI for a hash"""
+        png = self.get(digest)
+        return _PREFIX + base64.b64encode(png).decode('ascii') if png is not None else None
+    
+    def path(self, digest: str) -> str:
+        """On-disk location of a stored favicon"""
+        if self.directory is None:
+            raise ValueError("FaviconStore has no directory")
+        if len(digest) != 64 or not all(c in '0123456789abcdef' for c in digest):
+            raise ValueError(f"Invalid favicon hash: {digest}")
+        return os.path.join(self.directory, f"{digest}.png")
+    
+    def _write(self, digest: str, png: bytes):
+        path = self.path(digest)
+        if os.path.exists(path):
+            return
+        # Write then rename so readers never see a partial image
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(png)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    
+    def __contains__(self, digest: str) -> bool:
+        return self.get(digest) is not None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._images)
@@ -0,0 +1,366 @@
+import math
+import mmap
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+from .monitor import ServerKey, server_key
+from .sweep import SweepResult
+
+RAW_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('timestamp', 'd'),
+    ('online', 'B'),
+    ('players_online', 'i'),
+    ('players_max', 'i'),
+    ('latency', 'f'),
+    ('protocol', 'i'),
+)
+
+ROLLUP_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('timestamp', 'd'),
+    ('samples', 'I'),
+    ('uptime', 'f'),
+    ('players_min', 'i'),
+    ('players_max', 'i'),
+    ('players_avg', 'f'),
+    ('latency_min', 'f'),
+    ('latency_max', 'f'),
+    ('latency_avg', 'f'),
+)
+
+# Rollup name: bucket width in seconds
+RESOLUTIONS: Dict[str, int] = {'1m': 60, '1h': 3600, '1d': 86400}
+
+NAN = float('nan')
+
+# Range of the 'i' columns; out-of-range reports are clamped
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+def _clamp(value: int) -> int:
+    return max(INT_MIN, min(INT_MAX, int(value)))
+
+class _Series:
+    """Append-only columnar series: sealed chunks plus a growable tail
+    
+    Sealed data never changes, so range queries can hand out views of it
+    without copying. In memory each sealed chunk is a set of arrays; on disk
+    every column is a flat file of native values. Column files are only
+    mapped while a query reads them, so an idle series holds no file
+    descriptors; a mapping lives on only as long as views returned from it.
+    """
+    
+    def __init__(self, columns: Tuple[Tuple[str, str], ...], directory: Optional[str],
+                 chunk_size: int):
+        self.columns = columns
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self._segments: List[Dict[str, memoryview]] = []
+        self._tail = {name: array(code) for name, code in columns}
+        self.rows = 0
+        # Rows in the column files and the last of their timestamps
+        self._sealed = 0
+        self._last_sealed: Optional[float] = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._open()
+            self.rows = self._sealed
+    
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.col")
+    
+    def _open(self):
+        """Count the sealed rows, trimming rows a crash left partly written"""
+        counts = []
+        for name, code in self.columns:
+            path = self._path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            counts.append(size // array(code).itemsize)
+        rows = min(counts)
+        for name, code in self.columns:
+            path = self._path(name)
+            if not os.path.exists(path):
+                continue
+            itemsize = array(code).itemsize
+            with open(path, 'r+b') as f:
+                if os.fstat(f.fileno()).st_size != rows * itemsize:
+                    f.truncate(rows * itemsize)
+        if rows == 0:
+            return
+        last = array('d')
+        with open(self._path('timestamp'), 'rb') as f:
+            f.seek((rows - 1) * last.itemsize)
+            last.frombytes(f.read(last.itemsize))
+        self._sealed = rows
+        self._last_sealed = last[0]
+    
+    def _sealed_segments(self) -> List[Dict[str, memoryview]]:
+        """Sealed chunks, mapping the column files for the caller when on disk"""
+        if self.directory is None:
+            return self._segments
+        if not self._sealed:
+            return []
+        segment = {}
+        for name, code in self.columns:
+            with open(self._path(name), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), self._sealed * array(code).itemsize,
+                                   access=mmap.ACCESS_READ)
+            segment[name] = memoryview(mapped).cast(code)
+        return [segment]
+    
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        if self._tail['timestamp']:
+            return self._tail['timestamp'][-1]
+        if self._segments:
+            return self._segments[-1]['timestamp'][-1]
+        return self._last_sealed
+    
+    def append(self, row: Tuple):
+        for (name, _), value in zip(self.columns, row):
+            self._tail[name].append(value)
+        self.rows += 1
+        if len(self._tail['timestamp']) >= self.chunk_size:
+            self.flush()
+    
+    def flush(self):
+        """Seal the tail"""
+        if not self._tail['timestamp']:
+            return
+        if self.directory is None:
+            self._segments.append({name: memoryview(self._tail[name]) for name, _ in self.columns})
+        else:
+            for name, _ in self.columns:
+                with open(self._path(name), 'ab') as f:
+                    self._tail[name].tofile(f)
+            self._sealed += len(self._tail['timestamp'])
+            self._last_sealed = self._tail['timestamp'][-1]
+        self._tail = {name: array(code) for name, code in self.columns}
+    
+    def query(self, start: float, end: float) -> Dict[str, memoryview]:
+        """Rows with start <= timestamp < end, zero-copy when they lie in one sealed chunk"""
+        pieces = []
+        for segment in self._sealed_segments() + [self._tail]:
+            timestamps = segment['timestamp']
+            if not len(timestamps) or timestamps[-1] < start or timestamps[0] >= end:
+                continue
+            lo = bisect_left(timestamps, start)
+            hi = bisect_left(timestamps, end, lo)
+            if lo < hi:
+                pieces.append((segment, lo, hi))
+        
+        if len(pieces) == 1 and pieces[0][0] is not self._tail:
+            segment, lo, hi = pieces[0]
+            return {name: segment[name][lo:hi] for name, _ in self.columns}
+        
+        result = {}
+        for name, code in self.columns:
+            column = array(code)
+            for segment, lo, hi in pieces:
+                column.frombytes(memoryview(segment[name])[lo:hi].cast('B'))
+            result[name] = memoryview(column)
+        return result
+
+class _Bucket:
+    """Running aggregate of one rollup bucket"""
+    
+    __slots__ = ('start', 'samples', 'online', 'players_min', 'players_max', 'players_sum',
+                 'latency_min', 'latency_max', 'latency_sum', 'latency_samples')
+    
+    def __init__(self, start: float):
+        self.start = start
+        self.samples = 0
+        self.online = 0
+        self.players_min = 0
+        self.players_max = 0
+        self.players_sum = 0
+        self.latency_min = math.inf
+        self.latency_max = -math.inf
+        self.latency_sum = 0.0
+        self.latency_samples = 0
+    
+    def add(self, online: int, players: int, latency: float):
+        if self.samples == 0:
+            self.players_min = self.players_max = players
+        else:
+            self.players_min = min(self.players_min, players)
+            self.players_max = max(self.players_max, players)
+        self.samples += 1
+        self.online += online
+        self.players_sum += players
+        if latency == latency:
+            self.latency_min = min(self.latency_min, latency)
+            self.latency_max = max(self.latency_max, latency)
+            self.latency_sum += latency
+            self.latency_samples += 1
+    
+    def row(self) -> Tuple:
+        measured = self.latency_samples > 0
+        return (self.start, self.samples, self.online / self.samples,
+                self.players_min, self.players_max, self.players_sum / self.samples,
+                self.latency_min if measured else NAN,
+                self.latency_max if measured else NAN,
+                self.latency_sum / self.latency_samples if measured else NAN)
+
+class _Rollup:
+    """One resolution of rollups for a server"""
+    
+    def __init__(self, width: int, series: _Series):
+        self.width = width
+        self.series = series
+        self.bucket: Optional[_Bucket] = None
+    
+    def feed(self, timestamp: float, online: int, players: int, latency: float):
+        start = timestamp - timestamp % self.width
+        if self.bucket is not None and self.bucket.start != start:
+            self.series.append(self.bucket.row())
+            self.bucket = None
+        if self.bucket is None:
+            self.bucket = _Bucket(start)
+        self.bucket.add(online, players, latency)
+    
+    @property
+    def resume_from(self) -> float:
+        """Timestamp from which raw rows still need to be fed after reopening"""
+        last = self.series.last_timestamp
+        return last + self.width if last is not None else -math.inf
+
+class _ServerHistory:
+    """Raw rows and rollups of one server"""
+    
+    def __init__(self, directory: Optional[str], chunk_size: int):
+        def path(name: str) -> Optional[str]:
+            return os.path.join(directory, name) if directory is not None else None
+        
+        self.raw = _Series(RAW_COLUMNS, path('raw'), chunk_size)
+        self.rollups = {
+            name: _Rollup(width, _Series(ROLLUP_COLUMNS, path(name), chunk_size))
+            for name, width in RESOLUTIONS.items()
+        }
+        # Rebuild the open buckets from raw rows that were not rolled up yet
+        for rollup in self.rollups.values():
+            resume = rollup.resume_from
+            rows = self.raw.query(resume, math.inf)
+            for i in range(len(rows['timestamp'])):
+                rollup.feed(rows['timestamp'][i], rows['online'][i],
+                            rows['players_online'][i], rows['latency'][i])
+    
+    def append(self, row: Tuple):
+        last = self.raw.last_timestamp
+        if last is not None and row[0] < last:
+            raise ValueError(f"History rows must be appended in time order ({row[0]} < {last})")
+        self.raw.append(row)
+        for rollup in self.rollups.values():
+            rollup.feed(row[0], row[1], row[2], row[4])
+    
+    def flush(self):
+        self.raw.flush()
+        for rollup in self.rollups.values():
+            rollup.series.flush()
+
+class HistoryStore:
+    """Compact per-server ping history with 1m/1h/1d rollups
+    
+    Each server gets a row of ``(timestamp, online, players_online,
+    players_max, latency, protocol)`` per ping, stored column by column in
+    typed arrays rather than as dicts. Rows are buffered in chunks of
+    ``chunk_size``; with a ``directory`` full chunks are appended to one file
+    per column and read back through ``mmap``, so months of history cost
+    little resident memory. Rollups with min/max/avg players and latency and
+    uptime are maintained as rows arrive.
+    
+    ``query`` returns a dict of column name to ``memoryview``, which
+    ``numpy.asarray`` wraps without copying. Views of sealed data stay valid
+    after later appends. Unmeasured latency is stored as NaN, and player
+    counts and protocols outside the 32-bit range are clamped to it.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, chunk_size: int = 4096):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self._servers: Dict[ServerKey, _ServerHistory] = {}
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key: ServerKey) -> Optional[str]:
+        if self.directory is None:
+            return None
+        host, port, edition = key
+        return os.path.join(self.directory, f"{edition}-{quote(host, safe='')}-{port}")
+    
+    def _server(self, key: ServerKey) -> _ServerHistory:
+        history = self._servers.get(key)
+        if history is None:
+            history = self._servers[key] = _ServerHistory(self._path(key), self.chunk_size)
+        return history
+    
+    def append(self, key: ServerKey, timestamp: float, online: bool, players_online: int = 0,
+               players_max: int = 0, latency: Optional[float] = None, protocol: int = -1):
+        """Append one observation of a server"""
+        if latency is None or latency < 0:
+            latency = NAN
+        with self._lock:
+            self._server(key).append((timestamp, int(online), _clamp(players_online),
+                                      _clamp(players_max), latency, _clamp(protocol)))
+    
+    def record(self, result: SweepResult, timestamp: Optional[float] = None):
+        """Append a sweep result"""
+        timestamp = time.time() if timestamp is None else timestamp
+        key = server_key(result.pinger)
+        info = result.info
+        if not result.online:
+            self.append(key, timestamp, False)
+        elif isinstance(info.get('players'), dict):
+            self.append(key, timestamp, True, info['players']['online'], info['players']['max'],
+                        info.get('latency'), info.get('protocol', -1))
+        else:
+            self.append(key, timestamp, True, info.get('online_players', 0),
+                        info.get('max_players', 0), info.get('latency'), info.get('protocol', -1))
+    
+    def query(self, key: ServerKey, start: float = -math.inf, end: float = math.inf,
+              resolution: str = 'raw') -> Dict[str, memoryview]:
+        """Columns of rows with start <= timestamp < end
+        
+        ``resolution`` is ``'raw'`` or a key of ``RESOLUTIONS``; rollup rows
+        are timestamped with their bucket start and only completed buckets
+        are returned.
+        """
+        if resolution != 'raw' and resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        with self._lock:
+            history = self._servers.get(key)
+            if history is None and self.directory is not None and os.path.isdir(self._path(key)):
+                history = self._server(key)
+            if history is None:
+                columns = RAW_COLUMNS if resolution == 'raw' else ROLLUP_COLUMNS
+                return {name: memoryview(array(code)) for name, code in columns}
+            series = history.raw if resolution == 'raw' else history.rollups[resolution].series
+            return series.query(start, end)
+    
+    def keys(self) -> List[ServerKey]:
+        """Servers with history in this store, including ones only on disk"""
+        with self._lock:
+            keys = set(self._servers)
+        if self.directory is not None:
+            for entry in os.listdir(self.directory):
+                edition, _, rest = entry.partition('-')
+                host, _, port = rest.rpartition('-')
+                if host and port.isdigit():
+                    keys.add((unquote(host), int(port), edition))
+        return sorted(keys)
+    
+    def flush(self):
+        """Write buffered rows to disk"""
+        with self._lock:
+            for history in self._servers.values():
+                history.flush()
+    
+    def close(self):
+        """Flush and forget loaded servers"""
+        self.flush()
+        with self._lock:
+            self._servers.clear()
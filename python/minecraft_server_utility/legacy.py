@@ -0,0 +1,67 @@
+import struct
+from typing import Dict, Any
+from .exceptions import PacketFramingException
+
+# Status dialects, in the order they are tried against an unknown server
+MODERN = 'modern'
+LEGACY_16 = 'legacy-1.6'
+LEGACY_BETA = 'beta'
+DIALECTS = (MODERN, LEGACY_16, LEGACY_BETA)
+
+# Protocol sent by the 1.6 MC|PingHost ping (1.6.4)
+LEGACY_PROTOCOL = 74
+
+BETA_PING = b'\xfe'
+
+# Protocol 1.7+ servers report when answering a legacy ping
+MODERN_LEGACY_PROTOCOL = 127
+
+# Kick packet ID followed by the high byte of its UTF-16 length. No canonical
+# varint starts with these bytes, so they mark a legacy server answering a
+# modern handshake.
+LEGACY_KICK_PREFIX = b'\xff\x00'
+
+_PING_HOST = 'MC|PingHost'.encode('utf-16-be')
+
+def create_legacy_ping(host: str, port: int, protocol: int = LEGACY_PROTOCOL) -> bytes:
+    """Create a 1.6 server list ping; 1.4 and 1.5 servers read only its first two bytes"""
+    host_bytes = host.encode('utf-16-be')
+    payload = (struct.pack('>BH', protocol, len(host_bytes) // 2) + host_bytes
+               + struct.pack('>i', port))
+    return (b'\xfe\x01\xfa' + struct.pack('>H', len(_PING_HOST) // 2) + _PING_HOST
+            + struct.pack('>H', len(payload)) + payload)
+
+def legacy_response_length(header: bytes) -> int:
+    """Return the body size in bytes announced by a 3-byte kick packet header"""
+    if header[0] != 0xff:
+        raise PacketFramingException("Not a legacy kick packet")
+    return struct.unpack_from('>H', header, 1)[0] * 2
+
+def parse_legacy_response(body: bytes) -> Dict[str, Any]:
+    """Parse a legacy kick packet body into a modern-shaped status document
+    
+    1.4 and later answer ``§1\\0protocol\\0version\\0motd\\0online\\0max``;
+    Beta 1.8 to 1.3 answer ``motd§online§max``.
+    """
+    text = bytes(body).decode('utf-16-be')
+    if text.startswith('\xa71\x00'):
+        fields = text.split('\x00')
+        if len(fields) < 6:
+            raise PacketFramingException("Legacy response is truncated")
+        _, protocol, version, motd, online, maximum = fields[:6]
+        protocol = int(protocol)
+    else:
+        fields = text.rsplit('\xa7', 2)
+        if len(fields) < 3:
+            raise PacketFramingException("Not a legacy status response")
+        motd, online, maximum = fields
+        version, protocol = 'Beta 1.8-1.3', -1
+    try:
+        players_online, players_max = int(online), int(maximum)
+    except ValueError:
+        raise PacketFramingException("Legacy response has invalid player counts")
+    return {
+        'version': {'name': version, 'protocol': protocol},
+        'players': {'online': players_online, 'max': players_max},
+        'description': motd,
+    }
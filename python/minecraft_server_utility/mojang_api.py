@@ -1,113 +1,314 @@
 import requests
 import base64
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Dict, List, Optional, Any
 from .exceptions import MojangAPIException
+from .mojang_cache import ProfileCache, MemoryCache, MISSING
+from .rate_limit import TokenBucket, RetryPolicy, default_rate_limiter
 
 class MojangAPI:
-    """Interact with Mojang API for player data"""
+    """Interact with Mojang API for player data
+    
+    ``search_player`` fetches on a small thread pool owned by the instance;
+    call ``close()`` (or use the client as a context manager) to release it
+    along with the HTTP session.
+    """
     
     BASE_URL = "https://api.mojang.com"
     SESSION_URL = "https://sessionserver.mojang.com"
+    BULK_LOOKUP_LIMIT = 10
     
-    def __init__(self, timeout: int = 10):
-        self.timeout = timeout
+    def __init__(self, timeout: int = 10, cache: Optional[ProfileCache] = None,
+                 positive_ttl: float = 3600, negative_ttl: float = 300,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 retry: Optional[RetryPolicy] = None):
+        self._configure(timeout, cache, positive_ttl, negative_ttl, rate_limiter, retry)
         self.session = requests.Session()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def __enter__(self) -> 'MojangAPI':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Shut down the search thread pool and close the HTTP session"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.session.close()
+    
+    def _search_executor(self) -> ThreadPoolExecutor:
+        """Return the instance's search thread pool, starting it on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='mojang-search')
+            return self._executor
+    
+    def _configure(self, timeout: int, cache: Optional[ProfileCache], positive_ttl: float,
+                   negative_ttl: float, rate_limiter: Optional[TokenBucket],
+                   retry: Optional[RetryPolicy]):
+        """Set up everything but the HTTP session, which each client brings itself"""
+        self.timeout = timeout
+        self.cache = cache if cache is not None else MemoryCache()
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a rate-limited request, retrying 429 responses
+        
+        Retry-After is honoured when the server sends it, otherwise retries
+        back off exponentially with jitter. The pause is applied to the shared
+        rate limiter so every caller slows down, not just this one.
+        """
+        send = getattr(self.session, method)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            response = send(url, timeout=self.timeout, **kwargs)
+            if not self._should_retry(response, attempt):
+                return response
+            attempt += 1
+    
+    def _should_retry(self, response, attempt: int) -> bool:
+        """Decide whether to retry a response, pausing the shared limiter if so"""
+        if response.status_code != 429 or attempt >= self.retry.max_retries:
+            return False
+        delay = self.retry.delay(attempt, response.headers.get('Retry-After'))
+        self.rate_limiter.penalize(delay)
+        return True
+    
+    def _cached(self, key: str, fetch) -> Any:
+        """Return cached value for key, fetching and storing it on a miss
+        
+        Found results use positive_ttl; None and empty results (204/404) use
+        negative_ttl. Errors are never cached.
+        """
+        value = self.cache.get(key)
+        if value is not MISSING:
+            return value
+        
+        value = fetch()
+        self._store(key, value)
+        return value
+    
+    def _store(self, key: str, value: Any):
+        """Cache value with the positive or negative TTL"""
+        self.cache.set(key, value, self.positive_ttl if value else self.negative_ttl)
+    
+    @staticmethod
+    def _normalize_uuid(uuid: str) -> str:
+        return uuid.replace('-', '').lower()
     
     def get_uuid(self, username: str) -> Optional[str]:
         """Get UUID from username"""
+        return self._cached(f"uuid:{username.lower()}", lambda: self._fetch_uuid(username))
+    
+    def _fetch_uuid(self, username: str) -> Optional[str]:
+        """Fetch UUID for username from the API"""
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/users/profiles/minecraft/{username}",
-                timeout=self.timeout
+            response = self._request(
+                'get',
+                f"{self.BASE_URL}/users/profiles/minecraft/{username}"
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('id')
-            elif response.status_code == 204:
-                return None
-            else:
-                raise MojangAPIException(f"API error: {response.status_code}")
-                
+            return self._parse_uuid(response)
         except requests.RequestException as e:
             raise MojangAPIException(f"Failed to get UUID: {str(e)}")
     
-    def get_username(self, uuid: str) -> Optional[str]:
-        """Get username from UUID"""
+    def _parse_uuid(self, response) -> Optional[str]:
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('id')
+        elif response.status_code in (204, 404):
+            return None
+        else:
+            raise MojangAPIException(f"API error: {response.status_code}")
+    
+    def get_uuids(self, usernames: List[str]) -> Dict[str, Optional[str]]:
+        """Get UUIDs for many usernames using the bulk profiles endpoint
+        
+        Names are case-folded and deduplicated, cached names are answered
+        locally and the rest are looked up BULK_LOOKUP_LIMIT at a time.
+        Returns a dict keyed by each distinct name as given, with None for
+        names that were not found.
+        """
+        names, uuids, chunks = self._plan_uuid_lookup(usernames)
+        for chunk in chunks:
+            found = self._fetch_uuids([names[key] for key in chunk])
+            self._store_uuids(chunk, found, uuids)
+        
+        return {names[key]: uuids[key] for key in names}
+    
+    def _plan_uuid_lookup(self, usernames: List[str]):
+        """Split names into cached answers and bulk-request chunks of cache misses"""
+        names: Dict[str, str] = {}
+        for username in usernames:
+            names.setdefault(username.lower(), username)
+        
+        uuids: Dict[str, Optional[str]] = {}
+        missing = []
+        for key in names:
+            value = self.cache.get(f"uuid:{key}")
+            if value is MISSING:
+                missing.append(key)
+            else:
+                uuids[key] = value
+        
+        chunks = [missing[i:i + self.BULK_LOOKUP_LIMIT]
+                  for i in range(0, len(missing), self.BULK_LOOKUP_LIMIT)]
+        return names, uuids, chunks
+    
+    def _store_uuids(self, chunk: List[str], found: Dict[str, str],
+                     uuids: Dict[str, Optional[str]]):
+        """Record one bulk response, caching names it did not return as negatives"""
+        for key in chunk:
+            uuids[key] = found.get(key)
+            self._store(f"uuid:{key}", uuids[key])
+    
+    def _fetch_uuids(self, usernames: List[str]) -> Dict[str, str]:
+        """Fetch UUIDs for up to BULK_LOOKUP_LIMIT names, keyed by lowercase name"""
         try:
-            response = self.session.get(
-                f"{self.SESSION_URL}/session/minecraft/profile/{uuid}",
-                timeout=self.timeout
+            response = self._request(
+                'post',
+                f"{self.BASE_URL}/profiles/minecraft",
+                json=usernames
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('name')
-            else:
-                raise MojangAPIException(f"API error: {response.status_code}")
-                
+            return self._parse_uuids(response)
         except requests.RequestException as e:
-            raise MojangAPIException(f"Failed to get username: {str(e)}")
+            raise MojangAPIException(f"Failed to get UUIDs: {str(e)}")
+    
+    def _parse_uuids(self, response) -> Dict[str, str]:
+        if response.status_code == 200:
+            return {profile['name'].lower(): profile['id'] for profile in response.json()}
+        else:
+            raise MojangAPIException(f"API error: {response.status_code}")
+    
+    def get_username(self, uuid: str) -> Optional[str]:
+        """Get username from UUID"""
+        profile = self.get_profile(uuid)
+        return profile.get('name') if profile else None
     
     def get_profile(self, uuid: str) -> Optional[Dict[str, Any]]:
         """Get full player profile including skin"""
+        uuid = self._normalize_uuid(uuid)
+        return self._cached(f"profile:{uuid}", lambda: self._fetch_profile(uuid))
+    
+    def _fetch_profile(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """Fetch profile for uuid from the session server"""
         try:
-            response = self.session.get(
-                f"{self.SESSION_URL}/session/minecraft/profile/{uuid}",
-                timeout=self.timeout
+            response = self._request(
+                'get',
+                f"{self.SESSION_URL}/session/minecraft/profile/{uuid}"
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Decode textures
-                if 'properties' in data:
-                    for prop in data['properties']:
-                        if prop.get('name') == 'textures':
-                            textures_data = base64.b64decode(prop['value'])
-                            textures = json.loads(textures_data)
-                            data['textures'] = textures
-                            break
-                
-                return data
-            else:
-                raise MojangAPIException(f"API error: {response.status_code}")
-                
+            return self._parse_profile(response)
         except requests.RequestException as e:
             raise MojangAPIException(f"Failed to get profile: {str(e)}")
     
+    def _parse_profile(self, response) -> Optional[Dict[str, Any]]:
+        if response.status_code == 200:
+            data = response.json()
+            
+            # Decode textures
+            if 'properties' in data:
+                for prop in data['properties']:
+                    if prop.get('name') == 'textures':
+                        textures_data = base64.b64decode(prop['value'])
+                        textures = json.loads(textures_data)
+                        data['textures'] = textures
+                        break
+            
+            return data
+        elif response.status_code in (204, 404):
+            return None
+        else:
+            raise MojangAPIException(f"API error: {response.status_code}")
+    
     def get_name_history(self, uuid: str) -> List[Dict[str, str]]:
         """Get player's name history"""
+        uuid = self._normalize_uuid(uuid)
+        return self._cached(f"names:{uuid}", lambda: self._fetch_name_history(uuid))
+    
+    def _fetch_name_history(self, uuid: str) -> List[Dict[str, str]]:
+        """Fetch name history for uuid from the API"""
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/user/profiles/{uuid}/names",
-                timeout=self.timeout
+            response = self._request(
+                'get',
+                f"{self.BASE_URL}/user/profiles/{uuid}/names"
             )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise MojangAPIException(f"API error: {response.status_code}")
-                
+            return self._parse_name_history(response)
         except requests.RequestException as e:
             raise MojangAPIException(f"Failed to get name history: {str(e)}")
     
+    def _parse_name_history(self, response) -> List[Dict[str, str]]:
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code in (204, 404):
+            return []
+        else:
+            raise MojangAPIException(f"API error: {response.status_code}")
+    
     def get_skin_url(self, uuid: str) -> Optional[str]:
         """Get player's skin URL"""
         try:
-            profile = self.get_profile(uuid)
-            if profile and 'textures' in profile:
-                textures = profile['textures']
-                if 'SKIN' in textures.get('textures', {}):
-                    return textures['textures']['SKIN'].get('url')
-            return None
+            return self._skin_url_from_profile(self.get_profile(uuid))
         except MojangAPIException:
             return None
     
+    @staticmethod
+    def _skin_url_from_profile(profile: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Extract skin URL from a profile's decoded textures"""
+        if profile and 'textures' in profile:
+            textures = profile['textures']
+            if 'SKIN' in textures.get('textures', {}):
+                return textures['textures']['SKIN'].get('url')
+        return None
+    
     def search_player(self, username: str) -> Dict[str, Any]:
         """Search for player and return comprehensive info"""
-        result = {
+        result = self._new_search_result(username)
+        
+        try:
+            uuid = self.get_uuid(username)
+            if uuid:
+                self._complete_search(result, uuid, self._search_executor())
+                
+        except MojangAPIException as e:
+            result['error'] = str(e)
+        
+        return result
+    
+    def search_players(self, usernames: List[str], max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+        """Search for many players, keyed by name as given
+        
+        UUIDs are resolved with bulk lookups, then every profile and name
+        history is fetched concurrently.
+        """
+        try:
+            uuids = self.get_uuids(usernames)
+        except MojangAPIException as e:
+            return self._failed_search_results(usernames, e)
+        
+        results = {username: self._new_search_result(username) for username in uuids}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = [
+                (results[username], uuid, executor.submit(self.get_profile, uuid),
+                 executor.submit(self.get_name_history, uuid))
+                for username, uuid in uuids.items() if uuid
+            ]
+            for result, uuid, profile, names in pending:
+                self._collect_search(result, uuid, profile, names)
+        
+        return self._alias_search_results(results, usernames)
+    
+    def _new_search_result(self, username: str) -> Dict[str, Any]:
+        return {
             'username': username,
             'found': False,
             'uuid': None,
@@ -115,17 +316,38 @@ class MojangAPI:
             'name_history': [],
             'skin_url': None
         }
-        
+    
+    def _failed_search_results(self, usernames: List[str],
+                               error: Exception) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for username in usernames:
+            results[username] = self._new_search_result(username)
+            results[username]['error'] = str(error)
+        return results
+    
+    def _alias_search_results(self, results: Dict[str, Dict[str, Any]],
+                              usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Give case variants of a searched name a copy of its result"""
+        for username in usernames:
+            if username not in results:
+                match = next(name for name in results if name.lower() == username.lower())
+                results[username] = dict(results[match], username=username)
+        return results
+    
+    def _complete_search(self, result: Dict[str, Any], uuid: str, executor: ThreadPoolExecutor):
+        """Fetch profile and name history for uuid concurrently into result"""
+        profile = executor.submit(self.get_profile, uuid)
+        names = executor.submit(self.get_name_history, uuid)
+        self._collect_search(result, uuid, profile, names)
+    
+    def _collect_search(self, result: Dict[str, Any], uuid: str,
+                        profile: Future, names: Future):
+        """Fill result from finished lookups, reusing the profile for the skin URL"""
+        result['found'] = True
+        result['uuid'] = uuid
         try:
-            uuid = self.get_uuid(username)
-            if uuid:
-                result['found'] = True
-                result['uuid'] = uuid
-                result['profile'] = self.get_profile(uuid)
-                result['name_history'] = self.get_name_history(uuid)
-                result['skin_url'] = self.get_skin_url(uuid)
-                
+            result['profile'] = profile.result()
+            result['skin_url'] = self._skin_url_from_profile(result['profile'])
+            result['name_history'] = names.result()
         except MojangAPIException as e:
             result['error'] = str(e)
-        
-        return result
@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Returned by cache lookups on a miss, since None is a valid cached value
+MISSING = object()
+
+class ProfileCache(ABC):
+    """Interface for MojangAPI caches
+    
+    Values are JSON-compatible; ``None`` and empty lists are cached too, so
+    misses are reported with ``MISSING``.
+    """
+    
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return cached value or MISSING"""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float):
+        """Store value for ttl seconds"""
+    
+    @abstractmethod
+    def clear(self):
+        """Drop every entry"""
+
+class MemoryCache(ProfileCache):
+    """Thread-safe in-memory LRU cache with per-entry expiry"""
+    
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache(ProfileCache):
+    """Persistent cache in a SQLite database, surviving process restarts
+    
+    Entries live in one table keyed by cache key, with values stored as JSON
+    and an absolute expiry timestamp. A ``MemoryCache`` in front keeps hot
+    keys off the disk.
+    """
+    
+    def __init__(self, path: str, memory_maxsize: int = 10000):
+        self.path = path
+        self._memory = MemoryCache(memory_maxsize)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS mojang_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+    
+    def get(self, key: str) -> Any:
+        value = self._memory.get(key)
+        if value is not MISSING:
+            return value
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM mojang_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return MISSING
+        
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return MISSING
+        value = json.loads(row[0])
+        self._memory.set(key, value, remaining)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: float):
+        self._memory.set(key, value, ttl)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mojang_cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl)
+            )
+    
+    def purge_expired(self) -> int:
+        """Delete expired rows, returning how many were removed"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM mojang_cache WHERE expires <= ?", (time.time(),)
+            )
+        return cursor.rowcount
+    
+    def clear(self):
+        self._memory.clear()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM mojang_cache")
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
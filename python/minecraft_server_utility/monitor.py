@@ -0,0 +1,204 @@
+import threading
+import time
+from typing import Dict, List, Optional, Any, Callable, Iterable, Iterator, NamedTuple, Tuple
+from .bedrock_pinger import BedrockPinger
+from .sweep import SweepResult, Target, ping_many
+
+ONLINE = 'online'
+OFFLINE = 'offline'
+PLAYER_JOIN = 'player_join'
+PLAYER_LEAVE = 'player_leave'
+PLAYER_COUNT = 'player_count'
+VERSION_CHANGE = 'version_change'
+MOTD_CHANGE = 'motd_change'
+LATENCY_HIGH = 'latency_high'
+LATENCY_NORMAL = 'latency_normal'
+
+EVENT_TYPES = (ONLINE, OFFLINE, PLAYER_JOIN, PLAYER_LEAVE, PLAYER_COUNT,
+               VERSION_CHANGE, MOTD_CHANGE, LATENCY_HIGH, LATENCY_NORMAL)
+
+# Servers that hide their sample fill it with entries carrying the nil UUID
+_NIL_UUID = '00000000-0000-0000-0000-000000000000'
+
+ServerKey = Tuple[str, int, str]
+
+class ServerEvent(NamedTuple):
+    """A change in one server's state between two observations"""
+    type: str
+    server: ServerKey
+    timestamp: float
+    old: Any
+    new: Any
+
+class ServerState:
+    """Last known state of one server, reduced to the fields events are built from"""
+    
+    __slots__ = ('online', 'version', 'motd', 'players', 'player_count',
+                 'latency', 'latency_high', 'updated')
+    
+    def __init__(self):
+        self.online = False
+        self.version: Optional[str] = None
+        self.motd: Optional[str] = None
+        self.players: Dict[str, Optional[str]] = {}
+        self.player_count = 0
+        self.latency: Optional[float] = None
+        self.latency_high = False
+        self.updated = 0.0
+
+def server_key(pinger: Any) -> ServerKey:
+    """Identify a pinger by ``(host, port, edition)``, like the status cache does"""
+    return (pinger.host, pinger.port, 'bedrock' if isinstance(pinger, BedrockPinger) else 'java')
+
+class FleetMonitor:
+    """Turn repeated ping results into a stream of typed change events
+    
+    Keeps the last known state of every server and compares each new
+    observation against it, so consumers only see what changed. The first
+    observation of a server produces ``ONLINE``/``OFFLINE`` and a join for
+    every sampled player; later ones produce transitions, joins and leaves,
+    player count, version and MOTD changes, and ``LATENCY_HIGH`` /
+    ``LATENCY_NORMAL`` when ``latency_threshold`` (milliseconds) is crossed.
+    Joins and leaves come from the status sample, which servers cap at a
+    handful of players, so treat them as best effort on busy servers.
+    """
+    
+    def __init__(self, latency_threshold: Optional[float] = None):
+        self.latency_threshold = latency_threshold
+        self._states: Dict[ServerKey, ServerState] = {}
+        self._listeners: List[Callable[[ServerEvent], None]] = []
+        self._lock = threading.Lock()
+    
+    def add_listener(self, callback: Callable[[ServerEvent], None]):
+        """Call callback with every event as it is produced"""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[ServerEvent], None]):
+        """Stop delivering events to callback"""
+        self._listeners.remove(callback)
+    
+    def observe(self, result: SweepResult, timestamp: Optional[float] = None) -> List[ServerEvent]:
+        """Record a sweep result, returning the events it caused"""
+        return self.update(server_key(result.pinger), result.info, timestamp)
+    
+    def update(self, key: ServerKey, info: Optional[Dict[str, Any]],
+               timestamp: Optional[float] = None) -> List[ServerEvent]:
+        """Record a status result (None when offline), returning the events it caused"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            state = self._states.get(key)
+            first = state is None
+            if first:
+                state = self._states[key] = ServerState()
+            events = self._diff(key, state, info, timestamp, first)
+            state.updated = timestamp
+        
+        for event in events:
+            for listener in self._listeners:
+                listener(event)
+        return events
+    
+    def poll(self, targets: Iterable[Target], concurrency: int = 32,
+             timeout: float = 5) -> Iterator[ServerEvent]:
+        """Sweep targets with ``ping_many`` and yield the resulting events"""
+        for result in ping_many(targets, concurrency, timeout):
+            yield from self.observe(result)
+    
+    def state(self, key: ServerKey) -> Optional[ServerState]:
+        """Last known state of a server"""
+        with self._lock:
+            return self._states.get(key)
+    
+    def servers(self) -> List[ServerKey]:
+        """Servers observed so far"""
+        with self._lock:
+            return list(self._states)
+    
+    def forget(self, key: ServerKey):
+        """Drop a server's state; its next observation counts as the first"""
+        with self._lock:
+            self._states.pop(key, None)
+    
+    def _diff(self, key: ServerKey, state: ServerState, info: Optional[Dict[str, Any]],
+              timestamp: float, first: bool) -> List[ServerEvent]:
+        """Compare info with state, updating state in place"""
+        events: List[ServerEvent] = []
+        
+        def emit(kind: str, old: Any, new: Any):
+            events.append(ServerEvent(kind, key, timestamp, old, new))
+        
+        online = info is not None and info.get('online', False)
+        self._diff_online(state, online, first, emit)
+        if online:
+            self._diff_players(state, info, emit)
+            self._diff_details(state, info, emit)
+            self._diff_latency(state, info.get('latency'), emit)
+        return events
+    
+    @staticmethod
+    def _diff_online(state: ServerState, online: bool, first: bool, emit: Callable):
+        """Emit online/offline transitions; going offline empties the server"""
+        if online != state.online or first:
+            emit(ONLINE if online else OFFLINE, None if first else state.online, online)
+        state.online = online
+        if online:
+            return
+        for name, uuid in state.players.items():
+            emit(PLAYER_LEAVE, {'name': name, 'id': uuid}, None)
+        if state.player_count:
+            emit(PLAYER_COUNT, state.player_count, 0)
+        state.players = {}
+        state.player_count = 0
+        state.latency = None
+        state.latency_high = False
+    
+    def _diff_players(self, state: ServerState, info: Dict[str, Any], emit: Callable):
+        """Emit joins, leaves and player count changes"""
+        players, count = self._players(info)
+        for name, uuid in state.players.items():
+            if name not in players:
+                emit(PLAYER_LEAVE, {'name': name, 'id': uuid}, None)
+        for name, uuid in players.items():
+            if name not in state.players:
+                emit(PLAYER_JOIN, None, {'name': name, 'id': uuid})
+        if count != state.player_count:
+            emit(PLAYER_COUNT, state.player_count, count)
+        state.players = players
+        state.player_count = count
+    
+    @staticmethod
+    def _diff_details(state: ServerState, info: Dict[str, Any], emit: Callable):
+        """Emit version and MOTD changes; the first values seen are not changes"""
+        version = info.get('version')
+        if state.version is not None and version != state.version:
+            emit(VERSION_CHANGE, state.version, version)
+        motd = info.get('motd')
+        if state.motd is not None and motd != state.motd:
+            emit(MOTD_CHANGE, state.motd, motd)
+        state.version = version
+        state.motd = motd
+    
+    def _diff_latency(self, state: ServerState, latency: Optional[float], emit: Callable):
+        """Emit latency threshold crossings"""
+        if self.latency_threshold is not None and latency is not None and latency >= 0:
+            high = latency > self.latency_threshold
+            if high != state.latency_high:
+                emit(LATENCY_HIGH if high else LATENCY_NORMAL, state.latency, latency)
+            state.latency_high = high
+        state.latency = latency
+    
+    @staticmethod
+    def _players(info: Dict[str, Any]) -> Tuple[Dict[str, Optional[str]], int]:
+        """Sampled players by name, and the online count, for Java or Bedrock results"""
+        players = info.get('players')
+        if not isinstance(players, dict):
+            # Bedrock reports a count only
+            return {}, info.get('online_players', 0)
+        sample = {}
+        for entry in players.get('list') or []:
+            if not isinstance(entry, dict):
+                continue
+            name, uuid = entry.get('name'), entry.get('id')
+            if name and uuid != _NIL_UUID:
+                sample[name] = uuid
+        return sample, players.get('online', 0)
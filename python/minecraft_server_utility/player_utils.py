@@ -14,8 +14,9 @@ class PlayerUtils:
             return None
         
         players = server_info.get('players', {}).get('list', [])
+        target = player_name.lower()
         for player in players:
-            if player.get('name', '').lower() == player_name.lower():
+            if player.get('name', '').lower() == target:
                 return player
         
         return None
@@ -27,6 +28,13 @@ class PlayerUtils:
         except:
             return None
     
+    def get_player_uuids(self, usernames: List[str]) -> Dict[str, Optional[str]]:
+        """Get UUIDs for many players in bulk requests"""
+        try:
+            return self.mojang_api.get_uuids(usernames)
+        except:
+            return {}
+    
     def get_player_skin(self, identifier: str, is_uuid: bool = False) -> Optional[str]:
         """Get player's skin URL"""
         try:
@@ -0,0 +1,182 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Any, NamedTuple
+from .monitor import ServerEvent, ServerKey, PLAYER_JOIN, PLAYER_LEAVE
+
+class Presence(NamedTuple):
+    """Where and when a player has been seen"""
+    server: ServerKey
+    name: str
+    uuid: Optional[str]
+    first_seen: float
+    last_seen: float
+    online: bool
+
+class _Seen:
+    """Mutable presence record shared by the name and UUID indexes"""
+    
+    __slots__ = ('server', 'name', 'uuid', 'first_seen', 'last_seen', 'online')
+    
+    def __init__(self, server: ServerKey, name: str, uuid: Optional[str], timestamp: float):
+        self.server = server
+        self.name = name
+        self.uuid = uuid
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.online = True
+    
+    def snapshot(self) -> Presence:
+        return Presence(self.server, self.name, self.uuid, self.first_seen,
+                        self.last_seen, self.online)
+
+def normalize_uuid(value: str) -> Optional[str]:
+    """Lowercase undashed UUID, or None when value is not a UUID"""
+    value = value.replace('-', '').lower()
+    if len(value) != 32:
+        return None
+    try:
+        int(value, 16)
+    except ValueError:
+        return None
+    return value
+
+class PresenceIndex:
+    """Fleet-wide index of which servers each player has been seen on
+    
+    Fed with ``FleetMonitor`` join and leave events (``fleet.add_listener(
+    index.apply)``), so it is updated from sweep deltas rather than rebuilt
+    from every sample. Lookups by name (case-insensitive) or UUID are dict
+    hits; prefix searches bisect a sorted list of known names, rebuilt only
+    when a search follows a change in who is known.
+    
+    Events arrive only on change, so an online presence keeps the
+    ``last_seen`` of its join; ``find`` ranks online presences as seen now.
+    """
+    
+    def __init__(self):
+        self._by_name: Dict[str, Dict[ServerKey, _Seen]] = {}
+        self._by_uuid: Dict[str, Dict[ServerKey, _Seen]] = {}
+        self._names: Optional[List[str]] = []
+        self._display: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def apply(self, event: ServerEvent):
+        """Update the index from a FleetMonitor event; other event types are ignored"""
+        if event.type == PLAYER_JOIN:
+            self.seen(event.server, event.new['name'], event.new.get('id'), event.timestamp)
+        elif event.type == PLAYER_LEAVE:
+            self.left(event.server, event.old['name'], event.timestamp)
+    
+    def seen(self, server: ServerKey, name: str, uuid: Optional[str], timestamp: float):
+        """Record a player as present on server"""
+        key = name.lower()
+        uuid = normalize_uuid(uuid) if uuid else None
+        with self._lock:
+            servers = self._by_name.get(key)
+            if servers is None:
+                servers = self._by_name[key] = {}
+                self._names = None
+            self._display[key] = name
+            record = servers.get(server)
+            if record is None:
+                record = servers[server] = _Seen(server, name, uuid, timestamp)
+            else:
+                record.last_seen = timestamp
+                record.online = True
+                record.name = name
+                if uuid is not None and record.uuid != uuid:
+                    self._unlink_uuid(record)
+                    record.uuid = uuid
+            if record.uuid is not None:
+                self._by_uuid.setdefault(record.uuid, {})[server] = record
+    
+    def left(self, server: ServerKey, name: str, timestamp: float):
+        """Record a player as gone from server"""
+        with self._lock:
+            record = self._by_name.get(name.lower(), {}).get(server)
+            if record is not None:
+                record.last_seen = timestamp
+                record.online = False
+    
+    def find(self, player: str) -> List[Presence]:
+        """Every server a player (name or UUID) has been seen on, most recent first
+        
+        Servers the player is on now come first, then the ones they left,
+        latest leave first.
+        """
+        uuid = normalize_uuid(player)
+        with self._lock:
+            records = None
+            if uuid is not None:
+                records = self._by_uuid.get(uuid)
+            if records is None:
+                records = self._by_name.get(player.lower(), {})
+            found = [record.snapshot() for record in records.values()]
+        found.sort(key=lambda presence: (presence.online, presence.last_seen), reverse=True)
+        return found
+    
+    def online_on(self, player: str) -> List[ServerKey]:
+        """Servers a player is currently on"""
+        return [presence.server for presence in self.find(player) if presence.online]
+    
+    def search(self, prefix: str, limit: int = 50) -> List[str]:
+        """Known player names starting with prefix, case-insensitively, in sorted order"""
+        prefix = prefix.lower()
+        with self._lock:
+            if self._names is None:
+                self._names = sorted(self._by_name)
+            start = bisect_left(self._names, prefix)
+            names = []
+            for key in self._names[start:start + limit]:
+                if not key.startswith(prefix):
+                    break
+                names.append(self._display[key])
+        return names
+    
+    def forget_server(self, server: ServerKey):
+        """Drop every presence recorded on server"""
+        with self._lock:
+            for key in [key for key, servers in self._by_name.items() if server in servers]:
+                self._remove(key, server)
+    
+    def prune(self, before: float) -> int:
+        """Drop offline presences last seen before a timestamp, returning how many"""
+        removed = 0
+        with self._lock:
+            stale = [(key, server) for key, servers in self._by_name.items()
+                     for server, record in servers.items()
+                     if not record.online and record.last_seen < before]
+            for key, server in stale:
+                self._remove(key, server)
+                removed += 1
+        return removed
+    
+    def _remove(self, key: str, server: ServerKey):
+        servers = self._by_name[key]
+        self._unlink_uuid(servers.pop(server))
+        if not servers:
+            del self._by_name[key]
+            del self._display[key]
+            self._names = None
+    
+    def _unlink_uuid(self, record: _Seen):
+        if record.uuid is None:
+            return
+        servers = self._by_uuid.get(record.uuid)
+        if servers is not None and servers.get(record.server) is record:
+            del servers[record.server]
+            if not servers:
+                del self._by_uuid[record.uuid]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_name)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return index sizes"""
+        with self._lock:
+            return {
+                'players': len(self._by_name),
+                'uuids': len(self._by_uuid),
+                'presences': sum(len(servers) for servers in self._by_name.values()),
+            }
@@ -0,0 +1,194 @@
+import asyncio
+import socket
+from typing import Optional, Tuple
+from .exceptions import PacketFramingException
+
+# Largest packet length the protocol's 3-byte length prefix allows
+MAX_PACKET_LENGTH = 2 ** 21 - 1
+
+def decode_varint(buffer, offset: int = 0, end: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """Decode varint at offset, returning (value, next offset)
+    
+    Returns None when the buffer ends before the varint does.
+    """
+    if end is None:
+        end = len(buffer)
+    result = 0
+    shift = 0
+    while offset < end:
+        byte = buffer[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not (byte & 0x80):
+            return result, offset
+        shift += 7
+        if shift >= 35:
+            raise PacketFramingException("VarInt is too big")
+    return None
+
+class _FrameBuffer:
+    """Preallocated receive buffer shared by the sync and async packet readers
+    
+    Views handed out by ``_take`` point into the buffer and are only valid
+    until the next read on the same reader.
+    """
+    
+    def __init__(self, initial_size: int = 4096):
+        self._buf = bytearray(initial_size)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+        self.bytes_read = 0
+    
+    @property
+    def available(self) -> int:
+        return self._end - self._start
+    
+    @staticmethod
+    def _check_size(size: int):
+        """Reject a peer-supplied length before any buffer is sized for it"""
+        if size < 0 or size > MAX_PACKET_LENGTH:
+            raise PacketFramingException(f"Packet length {size} is out of range")
+    
+    def _reserve(self, size: int):
+        """Make room for size contiguous bytes starting at the read position"""
+        if self._start + size <= len(self._buf):
+            return
+        pending = self._view[self._start:self._end]
+        if size <= len(self._buf):
+            self._buf[:len(pending)] = bytes(pending)
+        else:
+            # Grow geometrically; never resize in place since views may be exported
+            buf = bytearray(max(size, len(self._buf) * 2))
+            buf[:len(pending)] = pending
+            self._buf = buf
+            self._view = memoryview(buf)
+        self._end = len(pending)
+        self._start = 0
+    
+    def _free_space(self) -> memoryview:
+        """Writable view of the unused tail of the buffer"""
+        if self._end == len(self._buf):
+            self._reserve(self.available + 1)
+        return self._view[self._end:]
+    
+    def _commit(self, count: int):
+        """Mark count bytes written into the free space as received"""
+        if not count:
+            raise PacketFramingException("Connection closed mid-packet")
+        self._end += count
+        self.bytes_read += count
+    
+    def _try_varint(self) -> Optional[int]:
+        """Consume a varint if one is fully buffered"""
+        decoded = decode_varint(self._buf, self._start, self._end)
+        if decoded is None:
+            return None
+        value, self._start = decoded
+        return value
+    
+    def _take(self, size: int) -> memoryview:
+        """Consume size buffered bytes as a view"""
+        view = self._view[self._start:self._start + size]
+        self._start += size
+        return view
+    
+    @staticmethod
+    def _split_packet(body: memoryview) -> Tuple[int, memoryview]:
+        """Split packet body into packet ID and payload"""
+        decoded = decode_varint(body)
+        if decoded is None:
+            raise PacketFramingException("Packet is missing its ID")
+        packet_id, offset = decoded
+        return packet_id, body[offset:]
+
+class PacketReader(_FrameBuffer):
+    """Read length-prefixed packets from a blocking socket with recv_into"""
+    
+    def __init__(self, sock: socket.socket, initial_size: int = 4096):
+        super().__init__(initial_size)
+        self.sock = sock
+    
+    def _fill(self):
+        self._commit(self.sock.recv_into(self._free_space()))
+    
+    def read_varint(self) -> int:
+        """Read varint from socket"""
+        while True:
+            value = self._try_varint()
+            if value is not None:
+                return value
+            self._fill()
+    
+    def read_exact(self, size: int) -> memoryview:
+        """Read exactly size bytes, returned as a view into the buffer"""
+        self._check_size(size)
+        self._reserve(size)
+        while self.available < size:
+            self._fill()
+        return self._take(size)
+    
+    def peek(self, size: int) -> memoryview:
+        """Return the next size bytes without consuming them"""
+        self._check_size(size)
+        self._reserve(size)
+        while self.available < size:
+            self._fill()
+        return self._view[self._start:self._start + size]
+    
+    def read_packet(self) -> Tuple[int, memoryview]:
+        """Read one packet, returning (packet ID, payload view)"""
+        length = self.read_varint()
+        return self._split_packet(self.read_exact(length))
+
+class AsyncPacketReader(_FrameBuffer):
+    """Read length-prefixed packets from an asyncio stream"""
+    
+    def __init__(self, reader: asyncio.StreamReader, initial_size: int = 4096):
+        super().__init__(initial_size)
+        self.reader = reader
+    
+    async def _fill(self):
+        space = self._free_space()
+        data = await self.reader.read(len(space))
+        space[:len(data)] = data
+        self._commit(len(data))
+    
+    async def read_varint(self) -> int:
+        """Read varint from stream"""
+        while True:
+            value = self._try_varint()
+            if value is not None:
+                return value
+            await self._fill()
+    
+    async def read_exact(self, size: int) -> memoryview:
+        """Read exactly size bytes, returned as a view into the buffer"""
+        self._check_size(size)
+        self._reserve(size)
+        while self.available < size:
+            await self._fill()
+        return self._take(size)
+    
+    async def peek(self, size: int) -> memoryview:
+        """Return the next size bytes without consuming them"""
+        self._check_size(size)
+        self._reserve(size)
+        while self.available < size:
+            await self._fill()
+        return self._view[self._start:self._start + size]
+    
+    async def read_packet(self) -> Tuple[int, memoryview]:
+        """Read one packet, returning (packet ID, payload view)"""
+        length = await self.read_varint()
+        return self._split_packet(await self.read_exact(length))
+
+def read_string(payload: memoryview, offset: int = 0) -> Tuple[str, int]:
+    """Decode a varint-prefixed UTF-8 string, returning (string, next offset)"""
+    decoded = decode_varint(payload, offset)
+    if decoded is None:
+        raise PacketFramingException("String length is truncated")
+    length, offset = decoded
+    if offset + length > len(payload):
+        raise PacketFramingException("String is truncated")
+    return str(payload[offset:offset + length], 'utf-8'), offset + length
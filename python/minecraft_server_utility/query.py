@@ -0,0 +1,190 @@
+import random
+import socket
+import struct
+import time
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from .exceptions import ServerOfflineException, QueryException
+
+MAGIC = b'\xfe\xfd'
+TYPE_HANDSHAKE = 0x09
+TYPE_STAT = 0x00
+
+# Servers only honour the low nibble of each session ID byte
+SESSION_MASK = 0x0F0F0F0F
+
+MAX_DATAGRAM = 65535
+
+# Servers rotate challenge tokens every 30 seconds; reuse ours a little less
+TOKEN_TTL = 25.0
+
+# Fixed padding the server sends before the key/value and player sections
+_KV_PADDING = b'splitnum\x00\x80\x00'
+_PLAYER_PADDING = b'\x01player_\x00\x00'
+
+# Type, session ID
+_HEADER = struct.Struct('>Bi')
+
+def new_session_id() -> int:
+    """Random session ID with only the bits servers honour"""
+    return random.getrandbits(32) & SESSION_MASK
+
+def create_handshake(session_id: int) -> bytes:
+    """Create a Query handshake requesting a challenge token"""
+    return MAGIC + _HEADER.pack(TYPE_HANDSHAKE, session_id)
+
+def create_full_stat(session_id: int, token: int) -> bytes:
+    """Create a full stat request"""
+    return MAGIC + _HEADER.pack(TYPE_STAT, session_id) + struct.pack('>i', token) + b'\x00' * 4
+
+def response_header(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return ``(type, session_id)`` of a Query response, None if too short"""
+    if len(data) < _HEADER.size:
+        return None
+    return _HEADER.unpack_from(data)
+
+def parse_token(data: bytes) -> int:
+    """Parse the challenge token from a handshake response"""
+    try:
+        return int(data[_HEADER.size:].split(b'\x00', 1)[0])
+    except ValueError:
+        raise QueryException("Handshake response has no challenge token")
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+def parse_plugins(value: str) -> Tuple[str, List[str]]:
+    """Split the ``plugins`` value into server software and plugin list"""
+    software, _, plugins = value.partition(':')
+    return software.strip(), [plugin.strip() for plugin in plugins.split(';') if plugin.strip()]
+
+def parse_full_stat(data: bytes) -> Dict[str, Any]:
+    """Parse a full stat response into its key/values and complete player list"""
+    body = data[_HEADER.size:]
+    if not body.startswith(_KV_PADDING):
+        raise QueryException("Not a full stat response")
+    kv_end = body.find(b'\x00\x00' + _PLAYER_PADDING)
+    if kv_end < 0:
+        raise QueryException("Full stat response is truncated")
+    fields = body[len(_KV_PADDING):kv_end + 1].split(b'\x00')
+    values = {
+        fields[i].decode('utf-8', 'replace'): fields[i + 1].decode('utf-8', 'replace')
+        for i in range(0, len(fields) - 1, 2)
+    }
+    names = body[kv_end + 2 + len(_PLAYER_PADDING):].split(b'\x00')
+    players = [name.decode('utf-8', 'replace') for name in names if name]
+    software, plugins = parse_plugins(values.get('plugins', ''))
+    return {
+        'motd': values.get('hostname', ''),
+        'gametype': values.get('gametype', ''),
+        'game_id': values.get('game_id', ''),
+        'version': values.get('version', ''),
+        'software': software,
+        'plugins': plugins,
+        'map': values.get('map', ''),
+        'players_online': _to_int(values.get('numplayers', '0')),
+        'players_max': _to_int(values.get('maxplayers', '0')),
+        'host_port': _to_int(values.get('hostport', '0')),
+        'host_ip': values.get('hostip', ''),
+        'players': players,
+        'raw': values,
+    }
+
+class QueryClient:
+    """Query a Minecraft Java Edition server over the GameSpy4 UDP protocol
+    
+    Unlike the status ping, a full stat lists every online player and the
+    server's plugins. The server must have ``enable-query=true``; its query
+    port defaults to the game port. Servers tie challenge tokens to the
+    address they were issued to, so the client keeps its UDP socket open and
+    reuses the token for ``token_ttl`` seconds instead of repeating the
+    handshake on every poll.
+    """
+    
+    def __init__(self, host: str, port: int = 25565, timeout: float = 5,
+                 token_ttl: float = TOKEN_TTL):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.token_ttl = token_ttl
+        self.handshakes = 0
+        self._sock: Optional[socket.socket] = None
+        self._token: Optional[int] = None
+        self._token_expires = 0.0
+    
+    def __enter__(self) -> 'QueryClient':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Close the socket, dropping the cached token"""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._token = None
+    
+    def query(self) -> Dict[str, Any]:
+        """Run a full stat query"""
+        try:
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._sock.settimeout(self.timeout)
+                self._sock.connect((self.host, self.port))
+            cached = self._token is not None and self._token_expires > time.monotonic()
+            if not cached:
+                self._handshake()
+            try:
+                data, latency = self._full_stat()
+            except socket.timeout:
+                if not cached:
+                    raise
+                # The server drops requests carrying a token it has expired
+                self._handshake()
+                data, latency = self._full_stat()
+        except socket.timeout:
+            self.close()
+            raise ServerOfflineException(f"Query {self.host}:{self.port} did not respond")
+        except OSError as e:
+            self.close()
+            raise ServerOfflineException(f"Error querying server: {str(e)}")
+        return self._build_result(data, latency)
+    
+    def _handshake(self):
+        self._token = parse_token(self._request(TYPE_HANDSHAKE, create_handshake))
+        self._token_expires = time.monotonic() + self.token_ttl
+        self.handshakes += 1
+    
+    def _full_stat(self) -> Tuple[bytes, float]:
+        token = self._token
+        start = time.perf_counter()
+        data = self._request(TYPE_STAT, lambda session: create_full_stat(session, token))
+        return data, (time.perf_counter() - start) * 1000
+    
+    def _request(self, packet_type: int, build: Callable[[int], bytes]) -> bytes:
+        """Send one request and wait for the response carrying its session ID"""
+        session = new_session_id()
+        self._sock.send(build(session))
+        while True:
+            data = self._sock.recv(MAX_DATAGRAM)
+            if response_header(data) == (packet_type, session):
+                return data
+    
+    def _build_result(self, data: bytes, latency: float) -> Dict[str, Any]:
+        """Build result dict from a full stat response"""
+        result = parse_full_stat(data)
+        result['online'] = True
+        result['host'] = self.host
+        result['port'] = self.port
+        result['latency'] = round(latency, 2)
+        return result
+    
+    def get_player_list(self) -> List[str]:
+        """Get every online player's name"""
+        try:
+            return self.query()['players']
+        except (ServerOfflineException, QueryException):
+            return []
@@ -0,0 +1,164 @@
+import asyncio
+import socket
+import time
+from typing import Dict, List, Any, Callable, Iterable, Tuple, Union
+from .cache import StatusCache
+from .query import (
+    QueryClient, TYPE_HANDSHAKE, TYPE_STAT, TOKEN_TTL,
+    new_session_id, create_handshake, create_full_stat, response_header, parse_token,
+)
+from .exceptions import ServerOfflineException
+
+Target = Union[QueryClient, Tuple[str, int]]
+
+# Address, packet type, session ID
+_RequestKey = Tuple[Tuple[str, int], int, int]
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    """Hand incoming responses to the request whose address, type and session they match"""
+    
+    def __init__(self, pending: Dict[_RequestKey, Tuple[asyncio.Future, float]]):
+        self.pending = pending
+    
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        header = response_header(data)
+        if header is None:
+            return
+        request = self.pending.get((addr[:2],) + header)
+        if request is None or request[0].done():
+            return
+        future, sent_at = request
+        future.set_result((data, time.perf_counter() - sent_at))
+
+class QueryScanner:
+    """Run full stat queries against many servers from a handful of UDP sockets
+    
+    Responses echo the request's session ID, so any number of servers can
+    share a socket. Each server is always queried from the same socket,
+    which keeps its challenge token valid; tokens are cached for
+    ``token_ttl`` seconds while the scanner stays open, so repeated scans
+    skip the handshake. Unanswered requests are resent until ``timeout``
+    runs out.
+    """
+    
+    def __init__(self, timeout: float = 5, retries: int = 2, sockets: int = 1,
+                 concurrency: int = 1024, token_ttl: float = TOKEN_TTL):
+        self.timeout = timeout
+        self.retries = retries
+        self.sockets = sockets
+        self.concurrency = concurrency
+        self.tokens = StatusCache(ttl=token_ttl, maxsize=65536)
+        self.handshakes = 0
+        self._transports: List[asyncio.DatagramTransport] = []
+        self._pending: Dict[_RequestKey, Tuple[asyncio.Future, float]] = {}
+    
+    async def __aenter__(self) -> 'QueryScanner':
+        return self
+    
+    async def __aexit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Close the sockets, dropping every cached token"""
+        for transport in self._transports:
+            transport.close()
+        self._transports = []
+        self.tokens.invalidate()
+    
+    async def _open(self):
+        loop = asyncio.get_running_loop()
+        while len(self._transports) < self.sockets:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _QueryProtocol(self._pending),
+                local_addr=('0.0.0.0', 0), family=socket.AF_INET
+            )
+            self._transports.append(transport)
+    
+    async def scan(self, targets: Iterable[Target]) -> List[Union[Dict[str, Any], Exception]]:
+        """Query every target, returning results or exceptions in input order"""
+        clients = [t if isinstance(t, QueryClient) else QueryClient(*t, timeout=self.timeout)
+                   for t in targets]
+        await self._open()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def limited(client: QueryClient) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._query(client)
+        
+        return await asyncio.gather(*(limited(c) for c in clients), return_exceptions=True)
+    
+    async def _query(self, client: QueryClient) -> Dict[str, Any]:
+        """Full stat one server, handshaking only when no fresh token is cached"""
+        addr = await self._resolve(client.host, client.port)
+        transport = self._transports[hash(addr) % len(self._transports)]
+        token = self.tokens.get(addr)
+        cached = token is not None
+        try:
+            if not cached:
+                token = await self._handshake(transport, addr)
+            try:
+                data, elapsed = await self._request(
+                    transport, addr, TYPE_STAT, lambda session: create_full_stat(session, token))
+            except asyncio.TimeoutError:
+                if not cached:
+                    raise
+                # The server drops requests carrying a token it has expired
+                self.tokens.invalidate(addr)
+                token = await self._handshake(transport, addr)
+                data, elapsed = await self._request(
+                    transport, addr, TYPE_STAT, lambda session: create_full_stat(session, token))
+        except asyncio.TimeoutError:
+            raise ServerOfflineException(f"Query {client.host}:{client.port} did not respond")
+        return client._build_result(data, elapsed * 1000)
+    
+    async def _handshake(self, transport: asyncio.DatagramTransport, addr: Tuple[str, int]) -> int:
+        data, _ = await self._request(transport, addr, TYPE_HANDSHAKE, create_handshake)
+        token = parse_token(data)
+        self.tokens.put(addr, token)
+        self.handshakes += 1
+        return token
+    
+    async def _request(self, transport: asyncio.DatagramTransport, addr: Tuple[str, int],
+                       packet_type: int, build: Callable[[int], bytes]) -> Tuple[bytes, float]:
+        """Send a request, resending with fresh session IDs until a response or timeout"""
+        future = asyncio.get_running_loop().create_future()
+        interval = self.timeout / (self.retries + 1)
+        keys = []
+        try:
+            for _ in range(self.retries + 1):
+                key = (addr, packet_type, new_session_id())
+                while key in self._pending:
+                    key = (addr, packet_type, new_session_id())
+                keys.append(key)
+                self._pending[key] = (future, time.perf_counter())
+                transport.sendto(build(key[2]), addr)
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), interval)
+                except asyncio.TimeoutError:
+                    continue
+            raise asyncio.TimeoutError()
+        finally:
+            for key in keys:
+                self._pending.pop(key, None)
+    
+    async def _resolve(self, host: str, port: int) -> Tuple[str, int]:
+        """Resolve host to the IPv4 address responses will come from"""
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        except socket.gaierror:
+            raise ServerOfflineException(f"Query {host}:{port} could not be resolved")
+        return infos[0][4][:2]
+
+async def query_servers(targets: Iterable[Target], timeout: float = 5, retries: int = 2,
+                        sockets: int = 1, concurrency: int = 1024
+                        ) -> List[Union[Dict[str, Any], Exception]]:
+    """Run full stat queries against many servers over shared UDP sockets
+    
+    Targets are ``QueryClient`` instances or ``(host, port)`` tuples.
+    Results come back in input order; a failed query is returned as its
+    exception instead of aborting the batch. Keep a ``QueryScanner`` open
+    instead to reuse challenge tokens across polls.
+    """
+    async with QueryScanner(timeout, retries, sockets, concurrency) as scanner:
+        return await scanner.scan(targets)
@@ -0,0 +1,118 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Any
+
+class TokenBucket:
+    """Thread-safe token bucket that spaces requests out to a sustained rate
+    
+    Callers reserve a token and sleep for as long as the bucket is in debt,
+    so waiting requests are served in arrival order. ``penalize`` pauses every
+    caller, which is how a 429 from the server is applied to the whole
+    process rather than just the request that got it.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+    
+    def reserve(self) -> float:
+        """Take one token, returning how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            self.acquired += 1
+            wait = max(0.0, -self._tokens / self.rate, self._blocked_until - now)
+            self.total_wait += wait
+            return wait
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        wait = self.reserve()
+        if wait <= 0:
+            return
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            time.sleep(wait)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+    
+    async def acquire_async(self):
+        """Wait on the event loop until a request may be sent"""
+        wait = self.reserve()
+        if wait <= 0:
+            return
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+    
+    def penalize(self, seconds: float):
+        """Hold back every caller for at least seconds"""
+        with self._lock:
+            self.throttled += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and throughput counters"""
+        with self._lock:
+            return {
+                'waiting': self.waiting,
+                'max_waiting': self.max_waiting,
+                'acquired': self.acquired,
+                'throttled': self.throttled,
+                'total_wait': round(self.total_wait, 3),
+            }
+
+class RetryPolicy:
+    """Retry schedule for 429 responses: Retry-After when given, else jittered exponential backoff"""
+    
+    def __init__(self, max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 60.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+    
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number attempt (0-based)"""
+        seconds = self._parse_retry_after(retry_after)
+        if seconds is not None:
+            return min(seconds, self.backoff_max)
+        # Full jitter keeps retries from many callers from lining up
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+# Mojang allows roughly 600 requests per 10 minutes per IP
+default_rate_limiter = TokenBucket(rate=1.0, capacity=600)
@@ -0,0 +1,478 @@
+import asyncio
+import itertools
+import socket
+import struct
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Iterable, Tuple, Union
+from .exceptions import ServerOfflineException, RconException
+
+TYPE_RESPONSE = 0
+TYPE_COMMAND = 2
+TYPE_AUTH_RESPONSE = 2
+TYPE_LOGIN = 3
+# Servers answer unknown packet types in order with the same request ID, so
+# one sent after each command marks the end of its (possibly split) response
+TYPE_MARKER = 200
+
+# Request ID, type
+_HEADER = struct.Struct('<ii')
+_LENGTH = struct.Struct('<i')
+
+MAX_PACKET = 1 << 20
+
+# Vanilla servers take one 1460-byte read per request and drop the
+# connection if it does not hold exactly one whole packet
+MAX_REQUEST = 1460
+
+RconTarget = Tuple[str, int, str]
+
+def encode_packet(request_id: int, packet_type: int, payload: str) -> bytes:
+    """Frame one RCON packet"""
+    body = _HEADER.pack(request_id, packet_type) + payload.encode('utf-8') + b'\x00\x00'
+    return _LENGTH.pack(len(body)) + body
+
+def check_request(payload: str):
+    """Raise RconException if payload does not fit in one request packet"""
+    size = _LENGTH.size + _HEADER.size + len(payload.encode('utf-8')) + 2
+    if size > MAX_REQUEST:
+        raise RconException(f"RCON request of {size} bytes exceeds the {MAX_REQUEST}-byte packet limit")
+
+class _PacketBuffer:
+    """Split a byte stream into ``(request_id, type, payload)`` RCON packets"""
+    
+    def __init__(self):
+        self._data = bytearray()
+    
+    def feed(self, chunk: bytes) -> List[Tuple[int, int, bytes]]:
+        self._data += chunk
+        packets = []
+        offset = 0
+        while len(self._data) - offset >= 4:
+            length = _LENGTH.unpack_from(self._data, offset)[0]
+            if length < 10 or length > MAX_PACKET:
+                raise RconException(f"Invalid RCON packet length: {length}")
+            if len(self._data) - offset - 4 < length:
+                break
+            request_id, packet_type = _HEADER.unpack_from(self._data, offset + 4)
+            packets.append((request_id, packet_type, bytes(self._data[offset + 12:offset + 2 + length])))
+            offset += 4 + length
+        del self._data[:offset]
+        return packets
+
+class _Exchange:
+    """Bookkeeping for commands sent but not yet fully answered"""
+    
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.fragments: Dict[int, List[bytes]] = {}
+        self.markers: Dict[int, int] = {}
+    
+    def next_id(self) -> int:
+        request_id = next(self._ids)
+        if request_id >= 2 ** 31 - 1:
+            self._ids = itertools.count(1)
+            request_id = next(self._ids)
+        return request_id
+    
+    def frame(self, command: str) -> Tuple[int, bytes]:
+        """Register a command, returning its ID and the packet to send"""
+        command_id = self.next_id()
+        self.fragments[command_id] = []
+        return command_id, encode_packet(command_id, TYPE_COMMAND, command)
+    
+    def marker(self, command_id: int) -> bytes:
+        """Register the marker packet that ends a command's response"""
+        marker_id = self.next_id()
+        self.markers[marker_id] = command_id
+        return encode_packet(marker_id, TYPE_MARKER, '')
+    
+    def discard(self, command_id: int):
+        """Forget a command and its marker, so late responses are ignored"""
+        self.fragments.pop(command_id, None)
+        for marker_id in [key for key, value in self.markers.items() if value == command_id]:
+            del self.markers[marker_id]
+    
+    def receive(self, request_id: int, payload: bytes) -> Optional[Tuple[int, str]]:
+        """Route a response packet, returning (command_id, text) once a command completes"""
+        if request_id == -1:
+            raise RconException("RCON session is not authenticated")
+        if request_id in self.fragments:
+            self.fragments[request_id].append(payload)
+            return None
+        command_id = self.markers.pop(request_id, None)
+        if command_id is None:
+            return None
+        return command_id, b''.join(self.fragments.pop(command_id)).decode('utf-8', 'replace')
+
+class RconClient:
+    """Send commands to a Minecraft server over RCON
+    
+    One authenticated TCP connection is kept open between calls. Vanilla
+    servers read each request with a single fixed-size read, so every packet
+    is written on its own and answered before the next one is sent.
+    Responses are matched back by request ID, and responses the server
+    splits over several packets are reassembled.
+    """
+    
+    def __init__(self, host: str, port: int = 25575, password: str = '', timeout: float = 5):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._buffer = _PacketBuffer()
+        self._backlog: Deque[Tuple[int, int, bytes]] = deque()
+        self._exchange = _Exchange()
+    
+    def __enter__(self) -> 'RconClient':
+        self.connect()
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+    
+    def connect(self):
+        """Open and authenticate the connection"""
+        if self._sock is not None:
+            return
+        try:
+            self._sock = socket.create_connection((self.host, self.port), self.timeout)
+        except OSError as e:
+            raise ServerOfflineException(f"RCON {self.host}:{self.port} is unreachable: {str(e)}")
+        try:
+            check_request(self.password)
+            login_id = self._exchange.next_id()
+            self._sock.sendall(encode_packet(login_id, TYPE_LOGIN, self.password))
+            while True:
+                request_id, packet_type, _ = self._read_packet()
+                if packet_type != TYPE_AUTH_RESPONSE:
+                    continue
+                if request_id != login_id:
+                    raise RconException(f"RCON authentication to {self.host}:{self.port} failed")
+                break
+        except OSError as e:
+            self.close()
+            raise RconException(f"RCON login to {self.host}:{self.port} failed: {str(e)}")
+        except BaseException:
+            self.close()
+            raise
+    
+    def close(self):
+        """Close the connection"""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._buffer = _PacketBuffer()
+        self._backlog.clear()
+        self._exchange = _Exchange()
+    
+    def command(self, command: str) -> str:
+        """Run one command and return its response"""
+        return self.commands([command])[0]
+    
+    def commands(self, commands: Iterable[str]) -> List[str]:
+        """Run commands one after another on one connection, returning responses in order"""
+        commands = list(commands)
+        for command in commands:
+            check_request(command)
+        self.connect()
+        try:
+            return [self._run(command) for command in commands]
+        except (OSError, RconException) as e:
+            self.close()
+            if isinstance(e, RconException):
+                raise
+            raise RconException(f"RCON {self.host}:{self.port} failed: {str(e)}")
+    
+    def _run(self, command: str) -> str:
+        """Send a command, then its marker once the response has started"""
+        command_id, packet = self._exchange.frame(command)
+        self._sock.sendall(packet)
+        marked = False
+        while True:
+            request_id, _, payload = self._read_packet()
+            done = self._exchange.receive(request_id, payload)
+            if done is not None and done[0] == command_id:
+                return done[1]
+            if not marked and self._exchange.fragments.get(command_id):
+                self._sock.sendall(self._exchange.marker(command_id))
+                marked = True
+    
+    def _read_packet(self) -> Tuple[int, int, bytes]:
+        while not self._backlog:
+            chunk = self._sock.recv(65536)
+            if not chunk:
+                raise RconException(f"RCON {self.host}:{self.port} closed the connection")
+            self._backlog.extend(self._buffer.feed(chunk))
+        return self._backlog.popleft()
+
+class AsyncRconClient:
+    """RCON client for asyncio with concurrent commands
+    
+    Any number of coroutines may call ``command`` at once. They share the
+    connection and take turns, since vanilla servers only accept one packet
+    in flight; a background reader hands each response to the caller whose
+    request ID it carries.
+    """
+    
+    def __init__(self, host: str, port: int = 25575, password: str = '', timeout: float = 5):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._exchange = _Exchange()
+        self._waiters: Dict[int, Tuple[asyncio.Event, asyncio.Future]] = {}
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._send_lock: Optional[asyncio.Lock] = None
+    
+    async def __aenter__(self) -> 'AsyncRconClient':
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
+    
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+    
+    async def connect(self):
+        """Open and authenticate the connection"""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+            self._send_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.connected:
+                return
+            await asyncio.wait_for(self._open(), self.timeout)
+    
+    async def _open(self):
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ServerOfflineException(f"RCON {self.host}:{self.port} is unreachable: {str(e)}")
+        buffer = _PacketBuffer()
+        self._exchange = _Exchange()
+        login_id = self._exchange.next_id()
+        writer.write(encode_packet(login_id, TYPE_LOGIN, self.password))
+        try:
+            authenticated = None
+            while authenticated is None:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    raise RconException(f"RCON {self.host}:{self.port} closed the connection")
+                for request_id, packet_type, _ in buffer.feed(chunk):
+                    if packet_type == TYPE_AUTH_RESPONSE:
+                        authenticated = request_id == login_id
+                        break
+            if not authenticated:
+                raise RconException(f"RCON authentication to {self.host}:{self.port} failed")
+        except BaseException:
+            writer.close()
+            raise
+        self._writer = writer
+        self._reader_task = asyncio.ensure_future(self._read_loop(reader, writer, buffer))
+    
+    async def _read_loop(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         buffer: _PacketBuffer):
+        error: Exception = RconException(f"RCON {self.host}:{self.port} closed the connection")
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                for request_id, _, payload in buffer.feed(chunk):
+                    if request_id in self._waiters:
+                        self._waiters[request_id][0].set()
+                    done = self._exchange.receive(request_id, payload)
+                    if done is not None:
+                        _, waiter = self._waiters.pop(done[0], (None, None))
+                        if waiter is not None and not waiter.done():
+                            waiter.set_result(done[1])
+        except (OSError, RconException) as e:
+            error = e if isinstance(e, RconException) else RconException(str(e))
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+            for started, waiter in self._waiters.values():
+                if not waiter.done():
+                    waiter.set_exception(error)
+                started.set()
+            self._waiters.clear()
+    
+    async def close(self):
+        """Close the connection"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+    
+    async def command(self, command: str) -> str:
+        """Run one command and return its response"""
+        check_request(command)
+        await self.connect()
+        async with self._send_lock:
+            writer = self._writer
+            if writer is None:
+                raise RconException(f"RCON {self.host}:{self.port} closed the connection")
+            command_id, packet = self._exchange.frame(command)
+            started = asyncio.Event()
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters[command_id] = (started, waiter)
+            try:
+                return await asyncio.wait_for(self._run(writer, command_id, packet, started, waiter),
+                                              self.timeout)
+            except asyncio.TimeoutError:
+                raise RconException(f"RCON {self.host}:{self.port} timed out running {command!r}")
+            finally:
+                self._waiters.pop(command_id, None)
+                self._exchange.discard(command_id)
+    
+    async def _run(self, writer: asyncio.StreamWriter, command_id: int, packet: bytes,
+                   started: asyncio.Event, waiter: asyncio.Future) -> str:
+        """Send a command, then its marker once the response has started"""
+        writer.write(packet)
+        await writer.drain()
+        await started.wait()
+        if not waiter.done():
+            writer.write(self._exchange.marker(command_id))
+            await writer.drain()
+        return await waiter
+    
+    async def commands(self, commands: Iterable[str]) -> List[str]:
+        """Run commands on one connection, returning responses in order"""
+        return list(await asyncio.gather(*(self.command(command) for command in commands)))
+
+class RconPool:
+    """Authenticated RCON connections kept open per server
+    
+    A command to a server reuses its connection, reconnecting if it was
+    dropped. Commands to the same server are serialized; ``broadcast`` runs
+    one command on many servers from a thread pool.
+    """
+    
+    def __init__(self, timeout: float = 5):
+        self.timeout = timeout
+        self._clients: Dict[Tuple[str, int], Tuple[RconClient, threading.Lock]] = {}
+        self._lock = threading.Lock()
+    
+    def _client(self, host: str, port: int, password: str) -> Tuple[RconClient, threading.Lock]:
+        with self._lock:
+            entry = self._clients.get((host, port))
+            if entry is not None and entry[0].password != password:
+                with entry[1]:
+                    entry[0].close()
+                entry = None
+            if entry is None:
+                entry = self._clients[(host, port)] = (
+                    RconClient(host, port, password, self.timeout), threading.Lock())
+            return entry
+    
+    def commands(self, host: str, port: int, password: str, commands: Iterable[str]) -> List[str]:
+        """Run commands on one server over its pooled connection"""
+        client, lock = self._client(host, port, password)
+        with lock:
+            return client.commands(commands)
+    
+    def command(self, host: str, port: int, password: str, command: str) -> str:
+        """Run one command on one server"""
+        return self.commands(host, port, password, [command])[0]
+    
+    def broadcast(self, targets: Iterable[RconTarget], command: str,
+                  concurrency: int = 32) -> List[Union[str, Exception]]:
+        """Run command on every ``(host, port, password)`` target, results in input order"""
+        def run(target: RconTarget) -> Union[str, Exception]:
+            try:
+                return self.command(*target, command)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(run, list(targets)))
+    
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            for client, lock in self._clients.values():
+                with lock:
+                    client.close()
+            self._clients.clear()
+
+class AsyncRconPool:
+    """Authenticated asyncio RCON connections kept open per server
+    
+    Each server gets one connection shared by all concurrent commands to
+    it.
+    """
+    
+    def __init__(self, timeout: float = 5):
+        self.timeout = timeout
+        self._clients: Dict[Tuple[str, int], AsyncRconClient] = {}
+    
+    async def __aenter__(self) -> 'AsyncRconPool':
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
+    
+    async def _client(self, host: str, port: int, password: str) -> AsyncRconClient:
+        client = self._clients.get((host, port))
+        if client is None or client.password != password:
+            stale = client
+            client = self._clients[(host, port)] = AsyncRconClient(host, port, password, self.timeout)
+            if stale is not None:
+                await stale.close()
+        return client
+    
+    async def command(self, host: str, port: int, password: str, command: str) -> str:
+        """Run one command on one server"""
+        return await (await self._client(host, port, password)).command(command)
+    
+    async def commands(self, host: str, port: int, password: str,
+                       commands: Iterable[str]) -> List[str]:
+        """Run commands on one server over its pooled connection"""
+        return await (await self._client(host, port, password)).commands(commands)
+    
+    async def broadcast(self, targets: Iterable[RconTarget], command: str,
+                        concurrency: int = 256) -> List[Union[str, Exception]]:
+        """Run command on every ``(host, port, password)`` target, results in input order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(target: RconTarget) -> str:
+            async with semaphore:
+                return await self.command(*target, command)
+        
+        return await asyncio.gather(*(run(target) for target in targets), return_exceptions=True)
+    
+    async def close(self):
+        """Close every pooled connection"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.close()
+
+async def rcon_broadcast(targets: Iterable[RconTarget], command: str, concurrency: int = 256,
+                         timeout: float = 5) -> List[Union[str, Exception]]:
+    """Run one RCON command on many servers concurrently
+    
+    Targets are ``(host, port, password)`` tuples. Results come back in input
+    order; a failure is returned as its exception instead of aborting the
+    broadcast.
+    """
+    async with AsyncRconPool(timeout) as pool:
+        return await pool.broadcast(targets, command, concurrency)
@@ -0,0 +1,329 @@
+import asyncio
+import errno
+import ipaddress
+import random
+import selectors
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Hashable, Iterable, NamedTuple, Tuple
+from .exceptions import ServerOfflineException
+
+try:
+    import dns.asyncresolver
+    import dns.exception
+    import dns.resolver
+except ImportError:
+    dns = None
+
+DEFAULT_PORT = 25565
+SRV_PREFIX = '_minecraft._tcp.'
+
+# RFC 8305 recommends 250 ms between connection attempts
+HAPPY_EYEBALLS_DELAY = 0.25
+
+# (family, sockaddr) as returned by getaddrinfo
+Address = Tuple[int, tuple]
+
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+class Target(NamedTuple):
+    """Where a server address actually points"""
+    host: str
+    port: int
+    addresses: List[Address]
+    srv: bool
+
+class SrvRecord(NamedTuple):
+    """One ``_minecraft._tcp`` SRV record"""
+    priority: int
+    weight: int
+    port: int
+    target: str
+
+def is_ip(host: str) -> bool:
+    """Check whether host is an IPv4 or IPv6 literal"""
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+def pick_srv(records: List[SrvRecord]) -> SrvRecord:
+    """Pick a record from the lowest priority, weighted by weight (RFC 2782)"""
+    best = min(record.priority for record in records)
+    candidates = [record for record in records if record.priority == best]
+    total = sum(record.weight for record in candidates)
+    if total == 0:
+        return random.choice(candidates)
+    point = random.uniform(0, total)
+    for record in candidates:
+        point -= record.weight
+        if point <= 0:
+            return record
+    return candidates[-1]
+
+def interleave(addresses: List[Address]) -> List[Address]:
+    """Alternate address families, starting with the resolver's first choice (RFC 8305)"""
+    by_family: Dict[int, List[Address]] = {}
+    for address in addresses:
+        by_family.setdefault(address[0], []).append(address)
+    queues = list(by_family.values())
+    ordered = []
+    while queues:
+        for queue in queues:
+            ordered.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+class Resolver:
+    """TTL-respecting cache of SRV lookups and resolved addresses
+    
+    A host given with the default port is first looked up as a
+    ``_minecraft._tcp`` SRV record, like the vanilla client does. SRV answers
+    are cached for their record TTL and missing records for
+    ``negative_ttl``. SRV lookups need the optional ``dnspython`` package
+    (``pip install minecraft-server-utility[dns]``); without it hosts are
+    used as given. ``getaddrinfo`` does not report TTLs, so addresses are
+    cached for ``address_ttl`` seconds.
+    """
+    
+    def __init__(self, srv: bool = True, address_ttl: float = 60.0,
+                 negative_ttl: float = 300.0, maxsize: int = 4096):
+        self.srv = srv and dns is not None
+        self.address_ttl = address_ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+    
+    def _put(self, key: Hashable, value: Any, ttl: float):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, host: Optional[str] = None):
+        """Drop cached entries for host, or everything"""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+                return
+            host = host.lower()
+            for key in [key for key in self._entries if key[1] == host]:
+                del self._entries[key]
+    
+    def _wants_srv(self, host: str, port: int) -> bool:
+        return self.srv and port == DEFAULT_PORT and not is_ip(host)
+    
+    def resolve(self, host: str, port: int = DEFAULT_PORT, timeout: float = 5) -> Target:
+        """Resolve host and port to connectable addresses, following SRV records"""
+        target_host, target_port, srv = host, port, False
+        if self._wants_srv(host, port):
+            found, records = self._get(('srv', host.lower()))
+            if not found:
+                records = self._store_srv(host, self._query_srv(SRV_PREFIX + host, timeout))
+            if records:
+                record = pick_srv(records)
+                target_host, target_port, srv = record.target, record.port, True
+        
+        found, addresses = self._get(('addr', target_host.lower(), target_port))
+        if not found:
+            try:
+                infos = socket.getaddrinfo(target_host, target_port, type=socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                raise ServerOfflineException(f"Server {target_host}:{target_port} could not be resolved: {str(e)}")
+            addresses = self._store_addresses(target_host, target_port, infos)
+        return Target(target_host, target_port, addresses, srv)
+    
+    async def resolve_async(self, host: str, port: int = DEFAULT_PORT, timeout: float = 5) -> Target:
+        """Resolve without blocking the event loop"""
+        target_host, target_port, srv = host, port, False
+        if self._wants_srv(host, port):
+            found, records = self._get(('srv', host.lower()))
+            if not found:
+                records = self._store_srv(host, await self._query_srv_async(SRV_PREFIX + host, timeout))
+            if records:
+                record = pick_srv(records)
+                target_host, target_port, srv = record.target, record.port, True
+        
+        found, addresses = self._get(('addr', target_host.lower(), target_port))
+        if not found:
+            loop = asyncio.get_running_loop()
+            try:
+                infos = await loop.getaddrinfo(target_host, target_port, type=socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                raise ServerOfflineException(f"Server {target_host}:{target_port} could not be resolved: {str(e)}")
+            addresses = self._store_addresses(target_host, target_port, infos)
+        return Target(target_host, target_port, addresses, srv)
+    
+    def _store_srv(self, host: str, answer: Optional[Tuple[List[SrvRecord], float]]
+                   ) -> Optional[List[SrvRecord]]:
+        """Cache an SRV answer; None means the lookup failed and is not cached"""
+        if answer is None:
+            return None
+        records, ttl = answer
+        self._put(('srv', host.lower()), records, ttl if records else self.negative_ttl)
+        return records
+    
+    def _store_addresses(self, host: str, port: int, infos: List[tuple]) -> List[Address]:
+        addresses = interleave([(info[0], info[4]) for info in infos])
+        self._put(('addr', host.lower(), port), addresses, self.address_ttl)
+        return addresses
+    
+    def _query_srv(self, name: str, timeout: float) -> Optional[Tuple[List[SrvRecord], float]]:
+        """Look up SRV records, returning ``(records, ttl)`` or None on lookup failure"""
+        try:
+            return self._srv_answer(dns.resolver.resolve(name, 'SRV', lifetime=timeout))
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return [], 0.0
+        except dns.exception.DNSException:
+            return None
+    
+    async def _query_srv_async(self, name: str, timeout: float
+                               ) -> Optional[Tuple[List[SrvRecord], float]]:
+        try:
+            return self._srv_answer(await dns.asyncresolver.resolve(name, 'SRV', lifetime=timeout))
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return [], 0.0
+        except dns.exception.DNSException:
+            return None
+    
+    @staticmethod
+    def _srv_answer(answer: Any) -> Tuple[List[SrvRecord], float]:
+        records = [SrvRecord(rr.priority, rr.weight, rr.port, rr.target.to_text(omit_final_dot=True))
+                   for rr in answer]
+        # A lone "." target means the service is explicitly unavailable
+        records = [record for record in records if record.target not in ('', '.')]
+        return records, answer.rrset.ttl
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit counters"""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+def connect(addresses: List[Address], timeout: float,
+            delay: float = HAPPY_EYEBALLS_DELAY) -> socket.socket:
+    """Race TCP connections to addresses, starting the next one every ``delay`` seconds
+    
+    The first connection to complete wins and the others are closed. A
+    failed attempt starts the next address immediately.
+    """
+    deadline = time.monotonic() + timeout
+    pending = list(addresses)
+    attempts: Dict[socket.socket, tuple] = {}
+    selector = selectors.DefaultSelector()
+    errors: List[OSError] = []
+    next_start = 0.0
+    try:
+        while pending or attempts:
+            now = time.monotonic()
+            if now >= deadline:
+                raise socket.timeout("timed out")
+            if pending and (not attempts or now >= next_start):
+                family, sockaddr = pending.pop(0)
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                err = sock.connect_ex(sockaddr)
+                if err != 0 and err not in _IN_PROGRESS:
+                    sock.close()
+                    errors.append(OSError(err, f"Connect to {sockaddr[0]} failed"))
+                    next_start = now
+                    continue
+                selector.register(sock, selectors.EVENT_WRITE)
+                attempts[sock] = sockaddr
+                next_start = now + delay
+                continue
+            wait = deadline - now
+            if pending:
+                wait = min(wait, next_start - now)
+            for key, _ in selector.select(max(wait, 0)):
+                sock = key.fileobj
+                selector.unregister(sock)
+                sockaddr = attempts.pop(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err == 0:
+                    sock.setblocking(True)
+                    return sock
+                sock.close()
+                errors.append(OSError(err, f"Connect to {sockaddr[0]} failed"))
+                next_start = now
+        if errors:
+            raise errors[-1]
+        raise OSError("No addresses to connect to")
+    finally:
+        for sock in attempts:
+            sock.close()
+        selector.close()
+
+async def _connect_one(family: int, sockaddr: tuple) -> socket.socket:
+    """Open one non-blocking connection, closing the socket if it fails"""
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        await asyncio.get_running_loop().sock_connect(sock, sockaddr)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+def _close_late_winner(task: asyncio.Task):
+    """Close the socket of an attempt that connected after the race was decided"""
+    if not task.cancelled() and task.exception() is None:
+        task.result().close()
+
+def _first_connected(done: Iterable[asyncio.Task],
+                     errors: List[BaseException]) -> Optional[socket.socket]:
+    """Pick one connected socket from finished attempts, closing the others"""
+    winner = None
+    for task in done:
+        if task.exception() is not None:
+            errors.append(task.exception())
+        elif winner is None:
+            winner = task.result()
+        else:
+            task.result().close()
+    return winner
+
+async def connect_async(addresses: List[Address],
+                        delay: float = HAPPY_EYEBALLS_DELAY) -> socket.socket:
+    """Race TCP connections to addresses without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    remaining = list(addresses)
+    pending = set()
+    errors: List[BaseException] = []
+    try:
+        while remaining or pending:
+            if remaining:
+                pending.add(loop.create_task(_connect_one(*remaining.pop(0))))
+            done, pending = await asyncio.wait(pending, timeout=delay if remaining else None,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            winner = _first_connected(done, errors)
+            if winner is not None:
+                return winner
+        if errors:
+            raise errors[-1]
+        raise OSError("No addresses to connect to")
+    finally:
+        for task in pending:
+            task.cancel()
+            task.add_done_callback(_close_late_winner)
+
+# Resolver shared by every pinger that isn't given its own
+default_resolver = Resolver()
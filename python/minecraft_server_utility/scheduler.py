@@ -0,0 +1,203 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Callable, Iterable
+from .monitor import FleetMonitor, ServerEvent, ServerKey, server_key
+from .sweep import Pinger, SweepResult, Target, _as_pinger, _run
+
+class _Entry:
+    """Scheduling state of one server"""
+    
+    __slots__ = ('key', 'pinger', 'base', 'interval', 'failures', 'deadline', 'in_flight')
+    
+    def __init__(self, key: ServerKey, pinger: Pinger, interval: float):
+        self.key = key
+        self.pinger = pinger
+        self.base = interval
+        self.interval = interval
+        self.failures = 0
+        self.deadline = 0.0
+        self.in_flight = False
+
+class PollScheduler:
+    """Poll many servers on individual, adaptive, jittered deadlines
+    
+    Servers sit in a heap ordered by their next deadline. Each starts at its
+    base ``interval``; offline servers back off exponentially up to
+    ``max_interval``, servers whose state keeps changing (any ``FleetMonitor``
+    event) are polled faster down to ``min_interval``, and stable servers
+    drift back to their base. Every deadline is jittered by ``jitter`` so
+    polls spread out instead of bursting together.
+    
+    ``rate`` caps dispatched pings per second and ``concurrency`` caps pings
+    in flight, so the load stays fixed however many servers are scheduled:
+    when more are due than the budget allows, they run late in deadline
+    order and ``stats()['max_lag']`` shows by how much.
+    """
+    
+    BACKOFF = 2.0
+    SPEEDUP = 0.5
+    RELAX = 1.5
+    # Longest run() sleeps before noticing that stop was set
+    STOP_POLL = 0.5
+    
+    def __init__(self, interval: float = 60, min_interval: float = 5,
+                 max_interval: float = 900, jitter: float = 0.1, rate: float = 100,
+                 concurrency: int = 32, timeout: float = 5,
+                 monitor: Optional[FleetMonitor] = None):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.rate = rate
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.monitor = monitor if monitor is not None else FleetMonitor()
+        self._entries: Dict[ServerKey, _Entry] = {}
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        # Set by add() and finished pings so run() re-plans right away
+        self._wakeup = threading.Event()
+        self.dispatched = 0
+        self.completed = 0
+        self.max_lag = 0.0
+    
+    def add(self, target: Target, interval: Optional[float] = None) -> ServerKey:
+        """Schedule a server, returning its key; re-adding replaces the old entry"""
+        pinger = _as_pinger(target, self.timeout)
+        key = server_key(pinger)
+        entry = _Entry(key, pinger, interval if interval is not None else self.interval)
+        with self._lock:
+            self._entries[key] = entry
+            # Spread first polls over the jitter window rather than firing all at once
+            self._push(entry, time.monotonic() + random.uniform(0, entry.base * self.jitter))
+        self._wakeup.set()
+        return key
+    
+    def add_many(self, targets: Iterable[Target], interval: Optional[float] = None) -> List[ServerKey]:
+        """Schedule many servers"""
+        return [self.add(target, interval) for target in targets]
+    
+    def remove(self, key: ServerKey):
+        """Stop polling a server"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def interval_of(self, key: ServerKey) -> Optional[float]:
+        """Current polling interval of a server"""
+        entry = self._entries.get(key)
+        return entry.interval if entry is not None else None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _push(self, entry: _Entry, deadline: float):
+        entry.deadline = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), entry))
+    
+    def _pop_due(self, now: float) -> Optional[_Entry]:
+        """Pop the earliest due entry if the budget allows dispatching it now"""
+        while self._heap and self._heap[0][0] <= now and self._next_slot <= now:
+            deadline, _, entry = heapq.heappop(self._heap)
+            # Stale heap items are left behind by remove() and re-add()
+            if self._entries.get(entry.key) is not entry or entry.deadline != deadline:
+                continue
+            self._next_slot = max(self._next_slot, now) + 1.0 / self.rate
+            self.max_lag = max(self.max_lag, now - deadline)
+            entry.in_flight = True
+            return entry
+        return None
+    
+    def _next_wakeup(self, now: float) -> Optional[float]:
+        """Seconds until the next entry could be dispatched, None when idle"""
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - now, self._next_slot - now)
+    
+    def reschedule(self, key: ServerKey, online: bool, changed: bool,
+                   now: Optional[float] = None) -> Optional[float]:
+        """Adapt a server's interval after a poll and queue its next deadline"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.in_flight = False
+            if not online:
+                # Stop counting once the cap is reached so the power cannot overflow
+                if entry.base > 0 and entry.base * self.BACKOFF ** entry.failures < self.max_interval:
+                    entry.failures += 1
+                entry.interval = min(self.max_interval, entry.base * self.BACKOFF ** entry.failures)
+            elif changed:
+                entry.failures = 0
+                entry.interval = max(self.min_interval, min(entry.interval, entry.base) * self.SPEEDUP)
+            else:
+                entry.failures = 0
+                entry.interval = min(entry.base, entry.interval * self.RELAX)
+            spread = 1 + random.uniform(-self.jitter, self.jitter)
+            self._push(entry, now + entry.interval * spread)
+            return entry.interval
+    
+    def run(self, callback: Optional[Callable[[SweepResult, List[ServerEvent]], None]] = None,
+            duration: Optional[float] = None, stop: Optional[threading.Event] = None):
+        """Poll until duration elapses or stop is set
+        
+        ``callback`` receives each ``SweepResult`` with the events the
+        monitor derived from it.
+        """
+        stop = stop if stop is not None else threading.Event()
+        end = time.monotonic() + duration if duration is not None else None
+        pending: Dict[Any, _Entry] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while not stop.is_set():
+                now = time.monotonic()
+                if end is not None and now >= end:
+                    break
+                while len(pending) < self.concurrency:
+                    with self._lock:
+                        entry = self._pop_due(now)
+                    if entry is None:
+                        break
+                    self.dispatched += 1
+                    future = executor.submit(_run, entry.pinger)
+                    future.add_done_callback(lambda _: self._wakeup.set())
+                    pending[future] = entry
+                
+                timeout = self._next_wakeup(now) if len(pending) < self.concurrency else None
+                if end is not None:
+                    timeout = min(timeout if timeout is not None else end - now, max(0.0, end - now))
+                self._wakeup.wait(min(timeout, self.STOP_POLL) if timeout is not None else self.STOP_POLL)
+                self._wakeup.clear()
+                for future in [future for future in pending if future.done()]:
+                    self._complete(pending.pop(future), future.result(), callback)
+            
+            for future in list(pending):
+                self._complete(pending.pop(future), future.result(), callback)
+    
+    def _complete(self, entry: _Entry, result: SweepResult,
+                  callback: Optional[Callable[[SweepResult, List[ServerEvent]], None]]):
+        self.completed += 1
+        # A first observation reports everything; it is not a change
+        first = self.monitor.state(entry.key) is None
+        events = self.monitor.observe(result)
+        self.reschedule(entry.key, result.online, bool(events) and not first)
+        if callback is not None:
+            callback(result, events)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return scheduling counters"""
+        with self._lock:
+            return {
+                'servers': len(self._entries),
+                # Every live entry not in flight has exactly one live heap item
+                'queued': sum(not entry.in_flight for entry in self._entries.values()),
+                'dispatched': self.dispatched,
+                'completed': self.completed,
+                'max_lag': round(self.max_lag, 3),
+            }
@@ -2,64 +2,214 @@ import socket
 import json
 import struct
 import time
-from typing import Dict, List, Optional, Any
-from .exceptions import ServerOfflineException, InvalidServerException
+from typing import Dict, List, Optional, Any, Tuple
+from .exceptions import ServerOfflineException, InvalidServerException, PacketFramingException
+from .protocol import PacketReader, read_string
+from .cache import StatusCache, default_status_cache
+from .status import ServerStatus, parse_motd
+from .favicon import FaviconStore, FAVICON_MODES
+from .resolver import Resolver, default_resolver, connect
+from .legacy import (
+    MODERN, LEGACY_BETA, DIALECTS, BETA_PING, LEGACY_KICK_PREFIX, MODERN_LEGACY_PROTOCOL,
+    create_legacy_ping, legacy_response_length, parse_legacy_response,
+)
+
+# Handshake protocol for servers we have not heard from yet (1.19.4)
+PROTOCOL_VERSION = 762
+
+# How long to remember which status dialect a server speaks
+DIALECT_TTL = 3600.0
+
+# Failures that mean the server did not understand a dialect; only these try the next one
+DIALECT_ERRORS = (PacketFramingException, ValueError, ConnectionResetError, BrokenPipeError)
 
 class ServerPinger:
-    """Ping Minecraft Java Edition servers"""
+    """Ping Minecraft Java Edition servers
     
-    def __init__(self, host: str, port: int = 25565, timeout: int = 5):
+    The address is resolved through ``resolver``, which follows
+    ``_minecraft._tcp`` SRV records and caches lookups, and connections race
+    the resolved IPv6 and IPv4 addresses. The handshake always carries the
+    host and port as given.
+    """
+    
+    def __init__(self, host: str, port: int = 25565, timeout: int = 5,
+                 cache: Optional[StatusCache] = None, favicon: str = 'keep',
+                 favicon_store: Optional[FaviconStore] = None,
+                 resolver: Optional[Resolver] = None,
+                 dialects: Optional[StatusCache] = None):
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.cache = cache if cache is not None else default_status_cache
+        self.favicon = self._favicon_mode(favicon)
+        self.favicon_store = favicon_store
+        self.resolver = resolver if resolver is not None else default_resolver
+        self.dialects = dialects if dialects is not None else default_dialect_cache
+        self.bytes_read = 0
+    
+    def ping(self, measure_latency: bool = True, keep_raw: bool = True,
+             favicon: Optional[str] = None) -> ServerStatus:
+        """Ping server and return comprehensive information
+        
+        Latency is the Ping/Pong round-trip on the status connection. Pass
+        ``measure_latency=False`` to skip it when only the status is needed;
+        ``latency`` is then ``None``. Pass ``keep_raw=False`` to drop the
+        decoded status JSON, leaving ``raw_response`` as ``None``.
+        ``favicon`` overrides the pinger's favicon mode for this call:
+        ``'keep'``, ``'skip'`` or ``'hash'``.
         
-    def ping(self) -> Dict[str, Any]:
-        """Ping server and return comprehensive information"""
+        Servers that don't speak the modern status protocol are retried with
+        the 1.6 and then the beta legacy ping. The dialect that answered, and
+        the protocol a modern server reported, are remembered in ``dialects``
+        so later pings go straight to it. Only protocol and framing errors
+        fall back; every attempt shares one ``timeout``.
+        """
+        favicon = self._favicon_mode(favicon or self.favicon)
+        deadline = time.monotonic() + self.timeout
+        plan, protocol = self._dialect_plan()
+        error = None
+        for dialect in plan:
+            try:
+                data, latency = self._exchange(dialect, protocol, measure_latency,
+                                               self._remaining(deadline))
+            except (socket.timeout, ConnectionRefusedError):
+                raise ServerOfflineException(f"Server {self.host}:{self.port} is offline")
+            except ServerOfflineException:
+                raise
+            except DIALECT_ERRORS as e:
+                error = error or e
+                continue
+            except Exception as e:
+                error = e
+                break
+            return self._finish(dialect, data, latency, keep_raw, favicon)
+        
+        self.dialects.invalidate(self._dialect_key)
+        raise InvalidServerException(f"Error pinging server: {str(error)}")
+    
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        """Seconds left before deadline, raising socket.timeout once it has passed"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("timed out")
+        return remaining
+    
+    def _exchange(self, dialect: str, protocol: int, measure_latency: bool,
+                  timeout: Optional[float] = None) -> Tuple[Dict[str, Any], Optional[float]]:
+        """Run one status exchange in dialect, returning the status document and latency"""
+        sock = self._connect(timeout)
+        reader = PacketReader(sock)
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((self.host, self.port))
+            if dialect != MODERN:
+                start = time.perf_counter()
+                self._send_packet(sock, self._create_legacy_ping(dialect))
+                header = reader.read_exact(3)
+                body = reader.read_exact(legacy_response_length(header))
+                latency = round((time.perf_counter() - start) * 1000, 2)
+                return parse_legacy_response(body), latency if measure_latency else None
             
             # Send handshake packet
-            handshake = self._create_handshake()
+            handshake = self._create_handshake(protocol)
             self._send_packet(sock, handshake)
             
             # Send status request
             self._send_packet(sock, b'\x01\x00')
             
             # Read response
-            response = self._read_response(sock)
-            sock.close()
+            if reader.peek(2) == LEGACY_KICK_PREFIX:
+                raise PacketFramingException("Server only speaks the legacy protocol")
+            response = self._read_response(reader)
             
             if not response:
                 raise ServerOfflineException(f"Server {self.host}:{self.port} is offline")
             
-            # Parse JSON response
-            data = json.loads(response)
-            
-            return {
-                'online': True,
-                'host': self.host,
-                'port': self.port,
-                'version': data.get('version', {}).get('name', 'Unknown'),
-                'protocol': data.get('version', {}).get('protocol', -1),
-                'players': {
-                    'online': data.get('players', {}).get('online', 0),
-                    'max': data.get('players', {}).get('max', 0),
-                    'list': data.get('players', {}).get('sample', [])
-                },
-                'motd': self._parse_motd(data.get('description', {})),
-                'favicon': data.get('favicon'),
-                'latency': self._measure_latency(),
-                'raw_response': data
-            }
-            
+            latency = self._ping_pong(sock, reader) if measure_latency else None
+        finally:
+            self.bytes_read += reader.bytes_read
+            sock.close()
+        
+        # Parse JSON response
+        return json.loads(response), latency
+    
+    @property
+    def _cache_key(self) -> Tuple[Any, ...]:
+        """Status cache key, including the settings that shape a cached result"""
+        # Cached pings always keep the raw response; a favicon store only
+        # matters in 'hash' mode, where it receives the images
+        store = self.favicon_store if self.favicon == 'hash' else None
+        return (self.host, self.port, 'java', self.favicon, True, store)
+    
+    @property
+    def _dialect_key(self) -> Tuple[str, int, str]:
+        return (self.host, self.port, 'java')
+    
+    def _dialect_plan(self) -> Tuple[Tuple[str, ...], int]:
+        """Dialects to try and the handshake protocol, from what worked last time"""
+        remembered = self.dialects.get(self._dialect_key)
+        if remembered is None:
+            return DIALECTS, PROTOCOL_VERSION
+        return (remembered[0],), remembered[1]
+    
+    def _remember_dialect(self, dialect: str, data: Dict[str, Any]):
+        """Record the dialect that answered and the protocol the server reported"""
+        version = data.get('version') if isinstance(data, dict) else None
+        protocol = version.get('protocol') if isinstance(version, dict) else None
+        if dialect != MODERN and protocol == MODERN_LEGACY_PROTOCOL:
+            # A modern server answered the fallback, or a remembered legacy
+            # server has since upgraded; try the modern dialect again next time
+            self.dialects.invalidate(self._dialect_key)
+            return
+        if dialect != MODERN or not isinstance(protocol, int) or protocol <= 0:
+            protocol = PROTOCOL_VERSION
+        self.dialects.put(self._dialect_key, (dialect, protocol))
+    
+    def _create_legacy_ping(self, dialect: str) -> bytes:
+        """Create the legacy ping for dialect"""
+        if dialect == LEGACY_BETA:
+            return BETA_PING
+        return create_legacy_ping(self.host, self.port)
+    
+    def _connect(self, timeout: Optional[float] = None) -> socket.socket:
+        """Open a TCP connection to the resolved server address"""
+        timeout = self.timeout if timeout is None else timeout
+        target = self.resolver.resolve(self.host, self.port, timeout)
+        try:
+            sock = connect(target.addresses, timeout)
         except (socket.timeout, ConnectionRefusedError):
             raise ServerOfflineException(f"Server {self.host}:{self.port} is offline")
+        except OSError as e:
+            raise ServerOfflineException(f"Server {self.host}:{self.port} is unreachable: {str(e)}")
+        sock.settimeout(timeout)
+        return sock
+    
+    def _finish(self, dialect: str, data: Any, latency: Optional[float],
+                keep_raw: bool, favicon: str) -> ServerStatus:
+        """Remember the dialect and build the result, reporting a malformed status as invalid"""
+        try:
+            self._remember_dialect(dialect, data)
+            return self._build_result(data, latency, keep_raw, favicon)
+        except InvalidServerException:
+            raise
         except Exception as e:
-            raise InvalidServerException(f"Error pinging server: {str(e)}")
+            raise InvalidServerException(f"Invalid status response: {str(e)}")
+    
+    def _build_result(self, data: Dict[str, Any], latency: Optional[float],
+                      keep_raw: bool = True, favicon: str = 'keep') -> ServerStatus:
+        """Build result from decoded status JSON"""
+        if not isinstance(data, dict):
+            raise InvalidServerException("Status response is not a JSON object")
+        return ServerStatus(self.host, self.port, data, latency, keep_raw,
+                            favicon, self.favicon_store)
     
-    def _create_handshake(self) -> bytes:
+    @staticmethod
+    def _favicon_mode(favicon: str) -> str:
+        """Validate a favicon mode"""
+        if favicon not in FAVICON_MODES:
+            raise ValueError(f"favicon must be one of {', '.join(FAVICON_MODES)}, got {favicon!r}")
+        return favicon
+    
+    def _create_handshake(self, protocol: Optional[int] = None) -> bytes:
         """Create handshake packet"""
         host_bytes = self.host.encode('utf-8')
         packet = b''
@@ -68,7 +218,7 @@ class ServerPinger:
         packet += b'\x00'
         
         # Protocol version (varint)
-        packet += self._pack_varint(762)  # 1.19.4 protocol
+        packet += self._pack_varint(PROTOCOL_VERSION if protocol is None else protocol)
         
         # Server address (varint + string)
         packet += self._pack_varint(len(host_bytes))
@@ -88,29 +238,16 @@ class ServerPinger:
         """Send packet to socket"""
         sock.sendall(data)
     
-    def _read_response(self, sock: socket.socket) -> str:
+    def _read_response(self, reader: PacketReader) -> str:
         """Read response from socket"""
-        # Read packet length
-        length = self._read_varint(sock)
-        
-        # Read packet ID
-        packet_id = self._read_varint(sock)
-        
+        packet_id, payload = reader.read_packet()
+        return self._decode_status(packet_id, payload)
+    
+    def _decode_status(self, packet_id: int, payload: memoryview) -> str:
+        """Decode status response packet into its JSON string"""
         if packet_id != 0x00:
             return ""
-        
-        # Read string length
-        string_length = self._read_varint(sock)
-        
-        # Read JSON string
-        data = b''
-        while len(data) < string_length:
-            chunk = sock.recv(string_length - len(data))
-            if not chunk:
-                break
-            data += chunk
-        
-        return data.decode('utf-8')
+        return read_string(payload)[0]
     
     def _pack_varint(self, value: int) -> bytes:
         """Pack integer as varint"""
@@ -125,50 +262,40 @@ class ServerPinger:
                 break
         return bytes(result)
     
-    def _read_varint(self, sock: socket.socket) -> int:
-        """Read varint from socket"""
-        result = 0
-        shift = 0
-        while True:
-            byte = sock.recv(1)
-            if not byte:
-                break
-            byte = byte[0]
-            result |= (byte & 0x7F) << shift
-            shift += 7
-            if not (byte & 0x80):
-                break
-        return result
-    
     def _parse_motd(self, motd_data: Any) -> str:
         """Parse MOTD from server response"""
-        if isinstance(motd_data, str):
-            return motd_data
-        elif isinstance(motd_data, dict):
-            # Extract text from JSON motd
-            text = motd_data.get('text', '')
-            if 'extra' in motd_data:
-                for extra in motd_data.get('extra', []):
-                    text += extra.get('text', '')
-            return text.strip()
-        return str(motd_data)
-    
-    def _measure_latency(self) -> float:
-        """Measure ping latency in milliseconds"""
+        return parse_motd(motd_data)
+    
+    def _create_ping(self, payload: int) -> bytes:
+        """Create status Ping packet carrying a timestamp payload"""
+        return b'\x09\x01' + struct.pack('>q', payload)
+    
+    def _ping_pong(self, sock: socket.socket, reader: PacketReader) -> float:
+        """Measure Ping/Pong round-trip in milliseconds on an open status connection"""
         try:
-            start = time.time()
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((self.host, self.port))
-            sock.close()
-            return round((time.time() - start) * 1000, 2)
-        except:
+            payload = int(time.time() * 1000)
+            start = time.perf_counter()
+            self._send_packet(sock, self._create_ping(payload))
+            
+            if not self._is_pong(*reader.read_packet(), payload):
+                return -1.0
+            return round((time.perf_counter() - start) * 1000, 2)
+        except (OSError, PacketFramingException):
             return -1.0
     
+    def _is_pong(self, packet_id: int, payload: memoryview, sent: int) -> bool:
+        """Check that a packet is the Pong echoing our Ping payload"""
+        return (packet_id == 0x01 and len(payload) >= 8
+                and struct.unpack_from('>q', payload)[0] == sent)
+    
+    def cached_ping(self) -> ServerStatus:
+        """Return a recent ping result from the status cache, pinging if needed"""
+        return self.cache.get_or_ping(self._cache_key, lambda: self.ping(keep_raw=True))
+    
     def is_online(self) -> bool:
         """Check if server is online"""
         try:
-            self.ping()
+            self.cached_ping()
             return True
         except ServerOfflineException:
             return False
@@ -176,7 +303,7 @@ class ServerPinger:
     def get_player_count(self) -> int:
         """Get online player count"""
         try:
-            info = self.ping()
+            info = self.cached_ping()
             return info['players']['online']
         except ServerOfflineException:
             return 0
@@ -184,7 +311,7 @@ class ServerPinger:
     def get_player_list(self) -> List[str]:
         """Get list of online players"""
         try:
-            info = self.ping()
+            info = self.cached_ping()
             players = info['players']['list']
             return [player['name'] for player in players]
         except (ServerOfflineException, KeyError):
@@ -193,7 +320,7 @@ class ServerPinger:
     def get_motd(self) -> str:
         """Get server MOTD"""
         try:
-            info = self.ping()
+            info = self.cached_ping()
             return info['motd']
         except ServerOfflineException:
             return ""
@@ -201,7 +328,10 @@ class ServerPinger:
     def get_version(self) -> str:
         """Get server version"""
         try:
-            info = self.ping()
+            info = self.cached_ping()
             return info['version']
         except ServerOfflineException:
             return "Unknown"
+
+# Status dialects remembered for every pinger that isn't given its own cache
+default_dialect_cache = StatusCache(ttl=DIALECT_TTL, maxsize=65536)
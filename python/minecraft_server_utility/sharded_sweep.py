@@ -0,0 +1,228 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import queue
+import socket
+import struct
+import time
+from typing import Dict, List, Optional, Any, Iterable, Iterator, NamedTuple, Tuple
+from .async_pinger import AsyncServerPinger
+from .exceptions import MinecraftServerException, ServerOfflineException
+
+# Record status codes
+OK = 0
+TIMEOUT = 1
+OFFLINE = 2
+ERROR = 3
+
+# Index, status, players online, players max, protocol, latency (NaN for None)
+_RECORD = struct.Struct('<IBiiif')
+_LENGTH = struct.Struct('<H')
+
+class SweepRecord(NamedTuple):
+    """Compact outcome of one ping in a sharded sweep"""
+    index: int
+    host: str
+    port: int
+    status: int
+    players_online: int
+    players_max: int
+    protocol: int
+    latency: Optional[float]
+    version: str
+    motd: str
+    players: Tuple[str, ...]
+    error: str
+    
+    @property
+    def online(self) -> bool:
+        return self.status == OK
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode('utf-8', 'replace')
+    if len(data) > 0xFFFF:
+        # Cut on a character boundary so the receiver can decode it
+        data = data[:0xFFFF].decode('utf-8', 'ignore').encode('utf-8')
+    return _LENGTH.pack(len(data)) + data
+
+def _checked(record: SweepRecord) -> SweepRecord:
+    """Turn a record whose numbers don't fit the packed layout into an error record"""
+    latency = math.nan if record.latency is None else record.latency
+    try:
+        _RECORD.pack(record.index, record.status, record.players_online,
+                     record.players_max, record.protocol, latency)
+    except struct.error as e:
+        return record._replace(status=ERROR, players_online=0, players_max=0, protocol=-1,
+                               latency=None, version='', motd='', players=(),
+                               error=f"Status does not fit a sweep record: {str(e)}")
+    return record
+
+def encode_records(records: Iterable[SweepRecord]) -> bytes:
+    """Pack records for the result channel; host and port are left to the receiver"""
+    parts = []
+    for record in records:
+        latency = math.nan if record.latency is None else record.latency
+        parts.append(_RECORD.pack(record.index, record.status, record.players_online,
+                                  record.players_max, record.protocol, latency))
+        parts.append(_pack_str(record.version))
+        parts.append(_pack_str(record.motd))
+        parts.append(_pack_str('\n'.join(record.players)))
+        parts.append(_pack_str(record.error))
+    return b''.join(parts)
+
+def decode_records(data: bytes, targets: List[Tuple[str, int]]) -> List[SweepRecord]:
+    """Unpack records, filling host and port back in from the target list"""
+    records = []
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        index, status, online, maximum, protocol, latency = _RECORD.unpack_from(view, offset)
+        offset += _RECORD.size
+        strings = []
+        for _ in range(4):
+            length = _LENGTH.unpack_from(view, offset)[0]
+            offset += _LENGTH.size
+            strings.append(str(view[offset:offset + length], 'utf-8', 'replace'))
+            offset += length
+        version, motd, players, error = strings
+        host, port = targets[index]
+        records.append(SweepRecord(index, host, port, status, online, maximum, protocol,
+                                   None if math.isnan(latency) else round(latency, 2),
+                                   version, motd, tuple(players.split('\n')) if players else (),
+                                   error))
+    return records
+
+def _classify(error: Exception) -> int:
+    """Map a ping exception to a record status"""
+    if not isinstance(error, ServerOfflineException):
+        return ERROR
+    if isinstance(error.__context__, (asyncio.TimeoutError, socket.timeout)):
+        return TIMEOUT
+    return OFFLINE
+
+async def _sweep_shard(worker: int, shard: List[Tuple[int, str, int]], concurrency: int,
+                       timeout: float, batch_size: int, channel: Any) -> Dict[str, Any]:
+    """Ping one shard on this process's event loop, streaming packed batches"""
+    counts = dict.fromkeys(('pings', 'online', 'timeouts', 'offline', 'errors', 'bytes'), 0)
+    keys = {OK: 'online', TIMEOUT: 'timeouts', OFFLINE: 'offline', ERROR: 'errors'}
+    batch: List[SweepRecord] = []
+    todo = iter(shard)
+    
+    async def ping(index: int, host: str, port: int) -> SweepRecord:
+        pinger = AsyncServerPinger(host, port, timeout)
+        try:
+            status = await pinger.ping(keep_raw=False, favicon='skip')
+            record = SweepRecord(index, host, port, OK, status.players_online, status.players_max,
+                                 status.protocol, status.latency, status.version, status.motd,
+                                 tuple(str(player.get('name', '')) for player in status.sample), '')
+        except Exception as e:
+            record = SweepRecord(index, host, port, _classify(e), 0, 0, -1, None, '', '', (), str(e))
+        counts['bytes'] += pinger.bytes_read
+        return _checked(record)
+    
+    async def run():
+        for target in todo:
+            record = await ping(*target)
+            counts['pings'] += 1
+            counts[keys[record.status]] += 1
+            batch.append(record)
+            if len(batch) >= batch_size:
+                channel.put((worker, encode_records(batch)))
+                batch.clear()
+    
+    await asyncio.gather(*(run() for _ in range(min(concurrency, len(shard)) or 1)))
+    if batch:
+        channel.put((worker, encode_records(batch)))
+    return counts
+
+def _sweep_worker(worker: int, shard: List[Tuple[int, str, int]], concurrency: int,
+                  timeout: float, batch_size: int, channel: Any):
+    """Process entry point: sweep a shard, then report its counters"""
+    start = time.process_time()
+    counts = asyncio.run(_sweep_shard(worker, shard, concurrency, timeout, batch_size, channel))
+    counts['cpu'] = round(time.process_time() - start, 3)
+    channel.put((worker, counts))
+
+class ShardedSweeper:
+    """Sweep very large Java server lists across a pool of processes
+    
+    Targets are dealt round-robin into one shard per worker process, and
+    each worker pings its shard on its own event loop with up to
+    ``concurrency`` connections open. JSON decoding and MOTD parsing stay in
+    the workers; only packed ``SweepRecord`` batches cross the process
+    boundary. Aggregate throughput is available from ``stats()`` once a
+    sweep has finished.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, concurrency: int = 256,
+                 timeout: float = 5, batch_size: int = 256, context: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.context = multiprocessing.get_context(context)
+        self._stats: Dict[str, Any] = {}
+    
+    def sweep(self, targets: Iterable[Tuple[str, int]]) -> Iterator[SweepRecord]:
+        """Ping every ``(host, port)`` target, yielding records in completion order"""
+        targets = [(host, port) for host, port in targets]
+        workers = max(1, min(self.workers, len(targets)))
+        channel = self.context.Queue()
+        processes = []
+        for worker in range(workers):
+            shard = [(index,) + targets[index] for index in range(worker, len(targets), workers)]
+            process = self.context.Process(
+                target=_sweep_worker, daemon=True,
+                args=(worker, shard, self.concurrency, self.timeout, self.batch_size, channel)
+            )
+            processes.append(process)
+        
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        reports: Dict[int, Dict[str, Any]] = {}
+        try:
+            while len(reports) < workers:
+                try:
+                    worker, payload = channel.get(timeout=0.5)
+                except queue.Empty:
+                    for worker, process in enumerate(processes):
+                        if worker not in reports and not process.is_alive() and process.exitcode != 0:
+                            raise MinecraftServerException(
+                                f"Sweep worker {worker} exited with code {process.exitcode}")
+                    continue
+                if isinstance(payload, dict):
+                    reports[worker] = payload
+                else:
+                    yield from decode_records(payload, targets)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            channel.close()
+        self._stats = self._aggregate(reports, time.perf_counter() - start)
+    
+    def _aggregate(self, reports: Dict[int, Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+        totals = dict.fromkeys(('pings', 'online', 'timeouts', 'offline', 'errors', 'bytes'), 0)
+        for counts in reports.values():
+            for key in totals:
+                totals[key] += counts[key]
+        totals['elapsed'] = round(elapsed, 3)
+        totals['pings_per_sec'] = round(totals['pings'] / elapsed, 1) if elapsed else 0.0
+        totals['bytes_per_sec'] = round(totals['bytes'] / elapsed, 1) if elapsed else 0.0
+        totals['workers'] = [reports[worker] for worker in sorted(reports)]
+        return totals
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return aggregate and per-worker counters of the last completed sweep"""
+        return dict(self._stats)
+
+def sweep_sharded(targets: Iterable[Tuple[str, int]], workers: Optional[int] = None,
+                  concurrency: int = 256, timeout: float = 5) -> List[SweepRecord]:
+    """Ping many Java servers across processes, returning records in input order"""
+    sweeper = ShardedSweeper(workers, concurrency, timeout)
+    records = list(sweeper.sweep(targets))
+    records.sort(key=lambda record: record.index)
+    return records
@@ -0,0 +1,225 @@
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Any, Iterator
+from .bedrock_pong import BedrockPong
+from .chat import render_chat
+from .favicon import FaviconStore, decode_favicon, favicon_hash
+
+def parse_motd(motd_data: Any) -> str:
+    """Parse MOTD from server response"""
+    return render_chat(motd_data).strip()
+
+_UNSET = object()
+
+class _StatusMapping(Mapping):
+    """Read-only dict interface over a slotted status object"""
+    
+    __slots__ = ()
+    
+    _KEYS: tuple = ()
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize every field into a plain dict"""
+        return {key: getattr(self, key) for key in self._KEYS}
+    
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.host}:{self.port} latency={self.latency}>"
+
+class ServerStatus(_StatusMapping):
+    """Java Edition status result with lazily decoded fields
+    
+    Reads like the dict ``ServerPinger.ping()`` used to return, but is not
+    a ``dict``: use ``to_dict()`` to serialize or modify it. The MOTD is
+    flattened and the player dict is built on first access. With
+    ``keep_raw=False`` the decoded status JSON is not retained; only the parts
+    this object exposes are kept alive.
+    
+    ``favicon`` is one of ``FAVICON_MODES``: ``'keep'`` holds the base64
+    string, ``'skip'`` drops it and ``'hash'`` keeps only ``favicon_hash``,
+    handing the image to ``favicon_store`` when one is given.
+    """
+    
+    __slots__ = ('host', 'port', 'latency', 'version', 'protocol', 'players_online',
+                 'players_max', '_sample', '_description', '_favicon', '_favicon_hash',
+                 '_favicon_store', '_raw', '_motd')
+    
+    _KEYS = ('online', 'host', 'port', 'version', 'protocol', 'players', 'motd',
+             'favicon', 'favicon_hash', 'latency', 'raw_response')
+    
+    def __init__(self, host: str, port: int, data: Dict[str, Any],
+                 latency: Optional[float], keep_raw: bool = True, favicon: str = 'keep',
+                 favicon_store: Optional[FaviconStore] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        version = data.get('version')
+        if not isinstance(version, dict):
+            version = {}
+        self.version = version.get('name', 'Unknown')
+        self.protocol = version.get('protocol', -1)
+        players = data.get('players')
+        if not isinstance(players, dict):
+            players = {}
+        self.players_online = players.get('online', 0)
+        self.players_max = players.get('max', 0)
+        self._sample = players.get('sample')
+        self._description = data.get('description', {})
+        self._favicon_store = favicon_store
+        if favicon == 'keep':
+            self._favicon = data.get('favicon')
+            self._favicon_hash = _UNSET
+        else:
+            # Drop the base64 string from the raw response too
+            uri = data.pop('favicon', None)
+            self._favicon = None
+            self._favicon_hash = None
+            if favicon == 'hash' and uri:
+                self._favicon_hash = self._hash_favicon(decode_favicon(uri))
+        self._raw = data if keep_raw else None
+        self._motd = _UNSET
+    
+    @property
+    def online(self) -> bool:
+        return True
+    
+    @property
+    def motd(self) -> str:
+        if self._motd is _UNSET:
+            self._motd = parse_motd(self._description)
+        return self._motd
+    
+    def render_motd(self, fmt: str = 'plain') -> str:
+        """Render the MOTD as plain text, legacy codes, ANSI or HTML"""
+        return render_chat(self._description, fmt)
+    
+    @property
+    def sample(self) -> List[Dict[str, str]]:
+        return self._sample if self._sample is not None else []
+    
+    @property
+    def players(self) -> Dict[str, Any]:
+        return {'online': self.players_online, 'max': self.players_max, 'list': self.sample}
+    
+    @property
+    def favicon(self) -> Optional[str]:
+        return self._favicon
+    
+    @property
+    def favicon_hash(self) -> Optional[str]:
+        """Content hash of the decoded favicon"""
+        if self._favicon_hash is _UNSET:
+            self._favicon_hash = self._hash_favicon(decode_favicon(self._favicon))
+        return self._favicon_hash
+    
+    @property
+    def favicon_bytes(self) -> Optional[bytes]:
+        """Decode the PNG favicon, None when absent or malformed"""
+        if self._favicon is not None:
+            return decode_favicon(self._favicon)
+        if self._favicon_store is not None and self._favicon_hash:
+            return self._favicon_store.get(self._favicon_hash)
+        return None
+    
+    def _hash_favicon(self, png: Optional[bytes]) -> Optional[str]:
+        if png is None:
+            return None
+        if self._favicon_store is not None:
+            return self._favicon_store.put(png)
+        return favicon_hash(png)
+    
+    @property
+    def raw_response(self) -> Optional[Dict[str, Any]]:
+        return self._raw
+
+class BedrockStatus(_StatusMapping):
+    """Bedrock Edition status result decoded lazily from its pong
+    
+    Reads like the dict ``BedrockPinger.ping()`` used to return; each field
+    is decoded from the pong only when it is read.
+    """
+    
+    __slots__ = ('host', 'port', 'latency', 'pong')
+    
+    _KEYS = ('online', 'host', 'port', 'server_guid', 'edition', 'motd', 'version',
+             'protocol', 'max_players', 'online_players', 'server_id', 'level_name',
+             'gamemode', 'port_v4', 'port_v6', 'latency')
+    
+    def __init__(self, host: str, port: int, pong: BedrockPong, latency: float):
+        self.host = host
+        self.port = port
+        self.pong = pong
+        self.latency = latency
+    
+    @property
+    def online(self) -> bool:
+        return True
+    
+    @property
+    def server_guid(self) -> int:
+        return self.pong.server_guid
+    
+    @property
+    def edition(self) -> str:
+        return self.pong.edition
+    
+    @property
+    def motd(self) -> str:
+        return self.pong.motd
+    
+    def render_motd(self, fmt: str = 'plain') -> str:
+        """Render the MOTD as plain text, legacy codes, ANSI or HTML"""
+        return render_chat(self.pong.motd, fmt)
+    
+    @property
+    def version(self) -> str:
+        return self.pong.version
+    
+    @property
+    def protocol(self) -> int:
+        return self.pong.protocol
+    
+    @property
+    def max_players(self) -> int:
+        return self.pong.max_players
+    
+    @property
+    def online_players(self) -> int:
+        return self.pong.players
+    
+    @property
+    def server_id(self) -> str:
+        return self.pong.server_id
+    
+    @property
+    def level_name(self) -> str:
+        return self.pong.level_name
+    
+    @property
+    def gamemode(self) -> str:
+        return self.pong.gamemode
+    
+    @property
+    def port_v4(self) -> int:
+        return self.pong.port_v4
+    
+    @property
+    def port_v6(self) -> int:
+        return self.pong.port_v6
+    
+    def to_dict(self) -> Dict[str, Any]:
+        result = self.pong.to_dict()
+        result.update(online=True, host=self.host, port=self.port, latency=self.latency)
+        return result
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+from .server_pinger import ServerPinger
+from .bedrock_pinger import BedrockPinger
+
+Pinger = Union[ServerPinger, BedrockPinger]
+Target = Union[Pinger, Tuple[str, int], Tuple[str, int, str]]
+
+class SweepResult(NamedTuple):
+    """Outcome of one ping in a sweep"""
+    pinger: Pinger
+    info: Optional[Dict[str, Any]]
+    error: Optional[Exception]
+    
+    @property
+    def online(self) -> bool:
+        return self.info is not None and self.info.get('online', False)
+
+def _as_pinger(target: Target, timeout: float) -> Pinger:
+    """Normalize a sweep target into a ServerPinger or BedrockPinger"""
+    if isinstance(target, (ServerPinger, BedrockPinger)):
+        return target
+    if len(target) == 3:
+        host, port, edition = target
+    else:
+        (host, port), edition = target, 'java'
+    if edition == 'bedrock':
+        return BedrockPinger(host, port, timeout)
+    if edition == 'java':
+        return ServerPinger(host, port, timeout)
+    raise ValueError(f"Unknown edition: {edition}")
+
+def _run(pinger: Pinger) -> SweepResult:
+    """Ping one server, capturing the error instead of raising"""
+    try:
+        return SweepResult(pinger, pinger.ping(), None)
+    except Exception as e:
+        return SweepResult(pinger, None, e)
+
+def ping_many(targets: Iterable[Target], concurrency: int = 32,
+              timeout: float = 5) -> Iterator[SweepResult]:
+    """Ping Java and Bedrock servers concurrently, yielding results as they finish
+    
+    Targets are ``ServerPinger``/``BedrockPinger`` instances, ``(host, port)``
+    tuples for Java servers or ``(host, port, edition)`` tuples where edition is
+    ``'java'`` or ``'bedrock'``. At most ``concurrency`` pings run at once and
+    targets are consumed lazily, so very long or generated target lists are fine.
+    Results are yielded in completion order, not input order.
+    """
+    targets = iter(targets)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = set()
+        for target in targets:
+            pending.add(executor.submit(_run, _as_pinger(target, timeout)))
+            if len(pending) >= concurrency:
+                break
+        
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                for target in targets:
+                    pending.add(executor.submit(_run, _as_pinger(target, timeout)))
+                    break
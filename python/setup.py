@@ -54,9 +54,16 @@ setup(
         "requests>=2.25.0",
     ],
     extras_require={
+        "async": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "dns": [
+            "dnspython>=2.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "httpx[http2]>=0.24.0",
             "flake8>=6.0.0",
             "black>=23.0.0",
             "twine>=4.0.0",
@@ -0,0 +1,409 @@
+"""
+Minimal in-process Minecraft servers for tests
+"""
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+def pack_varint(value):
+    """Pack integer as varint"""
+    result = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value != 0:
+            byte |= 0x80
+        result.append(byte)
+        if value == 0:
+            break
+    return bytes(result)
+
+def read_varint(rfile):
+    """Read varint from a file-like object, None on EOF"""
+    result = 0
+    shift = 0
+    while True:
+        byte = rfile.read(1)
+        if not byte:
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        shift += 7
+        if not (byte[0] & 0x80):
+            return result
+
+def status_payload(players_online=3, players_max=20, sample=None, motd="A Minecraft Server",
+                   version="1.20.1", protocol=763, favicon=None):
+    """Build a status response JSON document"""
+    data = {
+        'version': {'name': version, 'protocol': protocol},
+        'players': {
+            'online': players_online,
+            'max': players_max,
+            'sample': sample if sample is not None else [],
+        },
+        'description': motd,
+    }
+    if favicon is not None:
+        data['favicon'] = favicon
+    return data
+
+def status_response(status):
+    """Frame a status response packet carrying a JSON document"""
+    body = json.dumps(status).encode('utf-8')
+    body = b'\x00' + pack_varint(len(body)) + body
+    return pack_varint(len(body)) + body
+
+def pong_response(ping):
+    """Frame the pong answering a ping packet (id included)"""
+    return b'\x09\x01' + ping[1:9]
+
+class _JavaStatusHandler(socketserver.StreamRequestHandler):
+    """Answer handshake, status request and ping packets"""
+    
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        while True:
+            length = read_varint(self.rfile)
+            if length is None:
+                return
+            packet = self.rfile.read(length)
+            packet_id = packet[0]
+            if packet_id == 0x00 and len(packet) > 1:
+                server.handshakes.append(packet)
+            elif packet_id == 0x00:
+                self.wfile.write(status_response(server.status))
+            elif packet_id == 0x01:
+                self.wfile.write(pong_response(packet))
+                return
+
+class FakeJavaServer(socketserver.ThreadingTCPServer):
+    """Threaded Java Edition status server bound to an ephemeral port"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, status=None):
+        super().__init__(('127.0.0.1', 0), _JavaStatusHandler)
+        self.status = status if status is not None else status_payload()
+        self.connections = 0
+        self.handshakes = []
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+def unused_port():
+    """Return a local TCP port with nothing listening on it"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+RAKNET_MAGIC = b'\x00\xff\xff\x00\xfe\xfe\xfe\xfe\xfd\xfd\xfd\xfd\x12\x34\x56\x78'
+
+def bedrock_server_id(motd="Dedicated Server", protocol=594, version="1.20.10", players=2,
+                      max_players=10, server_guid=1234, level="Bedrock level",
+                      gamemode="Survival", port_v4=19132, port_v6=19133):
+    """Build the semicolon-separated advertisement string of a Bedrock pong"""
+    return (f"MCPE;{motd};{protocol};{version};{players};{max_players};{server_guid};"
+            f"{level};{gamemode};1;{port_v4};{port_v6};")
+
+def bedrock_pong(timestamp, server_id, server_guid=1234):
+    """Build an unconnected pong echoing timestamp"""
+    body = server_id.encode('utf-8')
+    return (b'\x1c' + timestamp + server_guid.to_bytes(8, 'big') + RAKNET_MAGIC
+            + len(body).to_bytes(2, 'big') + body)
+
+class FakeBedrockServer(socketserver.ThreadingUDPServer):
+    """UDP responder answering unconnected pings, optionally dropping the first few"""
+    
+    daemon_threads = True
+    
+    def __init__(self, server_id=None, drop=0):
+        super().__init__(('127.0.0.1', 0), _BedrockPingHandler)
+        self.server_id = server_id if server_id is not None else bedrock_server_id()
+        self.drop = drop
+        self.pings = []
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+class _BedrockPingHandler(socketserver.BaseRequestHandler):
+    """Echo the ping timestamp back in a pong"""
+    
+    def handle(self):
+        data, sock = self.request
+        if data[:1] != b'\x01':
+            return
+        server = self.server
+        server.pings.append(data)
+        if len(server.pings) <= server.drop:
+            return
+        sock.sendto(bedrock_pong(data[1:9], server.server_id), self.client_address)
+
+def rcon_packet(request_id, packet_type, payload=b''):
+    """Frame an RCON packet"""
+    body = struct.pack('<ii', request_id, packet_type) + payload + b'\x00\x00'
+    return struct.pack('<i', len(body)) + body
+
+class _RconHandler(socketserver.StreamRequestHandler):
+    """Answer RCON login, command and unknown-type packets like a vanilla server"""
+    
+    authenticated = False
+    
+    def answer(self, body):
+        """Return the response packets for one request body"""
+        server = self.server
+        request_id, packet_type = struct.unpack_from('<ii', body)
+        payload = body[8:-2]
+        if packet_type == 3:
+            self.authenticated = payload.decode() == server.password
+            return [rcon_packet(request_id if self.authenticated else -1, 2)]
+        if not self.authenticated:
+            return [rcon_packet(-1, 2)]
+        if packet_type == 2:
+            command = payload.decode()
+            server.commands.append(command)
+            response = server.respond(command).encode('utf-8')
+            chunks = [response[i:i + server.fragment_size]
+                      for i in range(0, len(response), server.fragment_size)] or [b'']
+            return [rcon_packet(request_id, 0, chunk) for chunk in chunks]
+        return [rcon_packet(request_id, 0, b'Unknown request %x' % packet_type)]
+    
+    def handle(self):
+        self.server.connections += 1
+        while True:
+            header = self.rfile.read(4)
+            if len(header) < 4:
+                return
+            body = self.rfile.read(struct.unpack('<i', header)[0])
+            self.wfile.write(b''.join(self.answer(body)))
+
+class _VanillaRconHandler(_RconHandler):
+    """Read each request with one 1460-byte read and write each response packet separately, like vanilla"""
+    
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        while True:
+            data = self.request.recv(1460)
+            if len(data) < 14:
+                return
+            if struct.unpack_from('<i', data)[0] != len(data) - 4:
+                server.rejected += 1
+                return
+            for packet in self.answer(data[4:]):
+                self.request.sendall(packet)
+
+class FakeRconServer(socketserver.ThreadingTCPServer):
+    """Threaded RCON server that echoes commands, splitting long responses"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    handler = _RconHandler
+    
+    def __init__(self, password='secret', respond=None, fragment_size=4096):
+        super().__init__(('127.0.0.1', 0), self.handler)
+        self.password = password
+        self.respond = respond if respond is not None else (lambda command: f"ran {command}")
+        self.fragment_size = fragment_size
+        self.connections = 0
+        self.rejected = 0
+        self.commands = []
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+class FakeVanillaRconServer(FakeRconServer):
+    """RCON server that drops the connection when a read holds anything but one whole packet"""
+    
+    handler = _VanillaRconHandler
+
+def query_full_stat(session_id, values, players):
+    """Build a full stat response from key/values and player names"""
+    body = b''.join(key.encode() + b'\x00' + value.encode() + b'\x00' for key, value in values.items())
+    names = b''.join(name.encode() + b'\x00' for name in players)
+    return (b'\x00' + struct.pack('>i', session_id) + b'splitnum\x00\x80\x00' + body
+            + b'\x00\x01player_\x00\x00' + names + b'\x00')
+
+class _QueryHandler(socketserver.BaseRequestHandler):
+    """Answer handshakes and full stats, checking tokens against the client address"""
+    
+    def handle(self):
+        data, sock = self.request
+        server = self.server
+        if data[:2] != b'\xfe\xfd':
+            return
+        packet_type = data[2]
+        session_id = struct.unpack_from('>i', data, 3)[0]
+        if packet_type == 0x09:
+            server.handshakes += 1
+            token = server.next_token
+            server.next_token += 1
+            server.tokens[self.client_address] = token
+            sock.sendto(b'\x09' + struct.pack('>i', session_id) + str(token).encode() + b'\x00',
+                        self.client_address)
+        elif packet_type == 0x00 and len(data) == 15:
+            token = struct.unpack_from('>i', data, 7)[0]
+            if server.tokens.get(self.client_address) != token:
+                return
+            server.stats += 1
+            sock.sendto(query_full_stat(session_id, server.values, server.players),
+                        self.client_address)
+
+class FakeQueryServer(socketserver.ThreadingUDPServer):
+    """UDP server speaking the Query protocol with per-client challenge tokens"""
+    
+    daemon_threads = True
+    
+    def __init__(self, players=None, values=None):
+        super().__init__(('127.0.0.1', 0), _QueryHandler)
+        self.players = players if players is not None else ['Alice', 'Bob']
+        self.values = values if values is not None else {
+            'hostname': 'A Minecraft Server',
+            'gametype': 'SMP',
+            'game_id': 'MINECRAFT',
+            'version': '1.20.1',
+            'plugins': 'Paper on 1.20.1: WorldEdit 7.2.15; EssentialsX 2.20.1',
+            'map': 'world',
+            'numplayers': str(len(self.players)),
+            'maxplayers': '100',
+            'hostport': '25565',
+            'hostip': '127.0.0.1',
+        }
+        self.tokens = {}
+        self.next_token = 9513307
+        self.handshakes = 0
+        self.stats = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+def legacy_kick(text):
+    """Frame a legacy 0xFF kick packet"""
+    body = text.encode('utf-16-be')
+    return b'\xff' + struct.pack('>H', len(body) // 2) + body
+
+class _LegacyHandler(socketserver.BaseRequestHandler):
+    """Answer 0xFE pings like a 1.6 or beta server, kicking anything else"""
+    
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        sock = self.request
+        data = sock.recv(1024)
+        server.requests.append(data)
+        if data[:1] != b'\xfe' or (server.dialect == 'beta' and len(data) > 1):
+            sock.sendall(legacy_kick("Protocol error"))
+        elif server.dialect == 'beta':
+            sock.sendall(legacy_kick(f"{server.motd}\xa7{server.players_online}\xa7{server.players_max}"))
+        else:
+            sock.sendall(legacy_kick(f"\xa71\x00{server.protocol}\x001.6.4\x00{server.motd}\x00"
+                                     f"{server.players_online}\x00{server.players_max}"))
+        sock.close()
+
+class FakeLegacyServer(socketserver.ThreadingTCPServer):
+    """Pre-1.7 server that only understands the legacy server list ping"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, dialect='1.6', motd='\xa7aOld Server', players_online=4, players_max=16,
+                 protocol=78):
+        super().__init__(('127.0.0.1', 0), _LegacyHandler)
+        self.dialect = dialect
+        self.protocol = protocol
+        self.motd = motd
+        self.players_online = players_online
+        self.players_max = players_max
+        self.connections = 0
+        self.requests = []
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+class _StallHandler(socketserver.BaseRequestHandler):
+    """Hold the connection silently, then close it"""
+    
+    def handle(self):
+        self.server.connections += 1
+        time.sleep(self.server.delay)
+
+class StallingServer(socketserver.ThreadingTCPServer):
+    """TCP server that accepts, says nothing for ``delay`` seconds and hangs up"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, delay):
+        super().__init__(('127.0.0.1', 0), _StallHandler)
+        self.delay = delay
+        self.connections = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,123 @@
+"""
+Tests for the async Mojang API client
+"""
+import asyncio
+import base64
+import json
+import threading
+import unittest
+from unittest import mock
+from minecraft_server_utility.mojang_cache import ProfileCache, MISSING
+from minecraft_server_utility.rate_limit import TokenBucket
+
+try:
+    import httpx
+    from minecraft_server_utility import AsyncMojangAPI
+except ImportError:
+    httpx = None
+
+def mojang_handler(players, calls):
+    """Build an httpx handler that serves the Mojang endpoints for players"""
+    def handler(request):
+        path = request.url.path
+        calls.append(path)
+        for uuid, name in players.items():
+            if path == f'/users/profiles/minecraft/{name}':
+                return httpx.Response(200, json={'id': uuid, 'name': name})
+            if path == f'/session/minecraft/profile/{uuid}':
+                textures = {'textures': {'SKIN': {'url': f'http://skins/{name}'}}}
+                value = base64.b64encode(json.dumps(textures).encode()).decode()
+                return httpx.Response(200, json={'id': uuid, 'name': name,
+                                                 'properties': [{'name': 'textures', 'value': value}]})
+            if path == f'/user/profiles/{uuid}/names':
+                return httpx.Response(200, json=[{'name': name}])
+        if path == '/profiles/minecraft':
+            wanted = [n.lower() for n in json.loads(request.content)]
+            return httpx.Response(200, json=[{'id': u, 'name': n} for u, n in players.items()
+                                             if n.lower() in wanted])
+        return httpx.Response(204)
+    return handler
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncMojangAPI(unittest.TestCase):
+    """Test AsyncMojangAPI against a mock transport"""
+    
+    def make_api(self, calls, cache=None):
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(mojang_handler({'aaa': 'Alice', 'bbb': 'Bob'}, calls))
+        )
+        return AsyncMojangAPI(cache=cache, rate_limiter=TokenBucket(rate=1000, capacity=100),
+                              client=client)
+    
+    def test_uses_only_httpx_session(self):
+        """Test the client does not open a requests session it never uses"""
+        with mock.patch('minecraft_server_utility.mojang_api.requests.Session') as session:
+            api = AsyncMojangAPI()
+        
+        session.assert_not_called()
+        self.assertIsInstance(api.session, httpx.AsyncClient)
+        asyncio.run(api.aclose())
+    
+    def test_search_player(self):
+        """Test async search_player fetches the profile once"""
+        calls = []
+        
+        async def run():
+            async with self.make_api(calls) as api:
+                return await api.search_player('Alice')
+        
+        result = asyncio.run(run())
+        self.assertTrue(result['found'])
+        self.assertEqual(result['skin_url'], 'http://skins/Alice')
+        self.assertEqual(calls.count('/session/minecraft/profile/aaa'), 1)
+    
+    def test_search_players_and_cache(self):
+        """Test batch search uses one bulk lookup and populates the cache"""
+        calls = []
+        
+        async def run():
+            async with self.make_api(calls) as api:
+                results = await api.search_players(['Alice', 'Bob', 'ghost'])
+                uuid = await api.get_uuid('bob')
+                return results, uuid
+        
+        results, uuid = asyncio.run(run())
+        self.assertEqual(calls.count('/profiles/minecraft'), 1)
+        self.assertEqual(results['Bob']['name_history'], [{'name': 'Bob'}])
+        self.assertFalse(results['ghost']['found'])
+        self.assertEqual(uuid, 'bbb')
+    
+    def test_cache_io_off_the_event_loop(self):
+        """Test a persistent cache is read and written from executor threads"""
+        calls = []
+        cache = ThreadRecordingCache()
+        
+        async def run():
+            async with self.make_api(calls, cache) as api:
+                await api.search_players(['Alice', 'ghost'])
+                await api.get_uuid('alice')
+        
+        asyncio.run(run())
+        self.assertTrue(cache.threads)
+        self.assertNotIn(threading.get_ident(), cache.threads)
+
+class ThreadRecordingCache(ProfileCache):
+    """Dict-backed cache recording which threads call it"""
+    
+    def __init__(self):
+        self.values = {}
+        self.threads = set()
+    
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.values.get(key, MISSING)
+    
+    def set(self, key, value, ttl):
+        self.threads.add(threading.get_ident())
+        self.values[key] = value
+    
+    def clear(self):
+        self.values.clear()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for the asyncio Java status pinger
+"""
+import asyncio
+import socket
+import time
+import unittest
+from unittest import mock
+from minecraft_server_utility import AsyncServerPinger, StatusCache, ping_servers
+from minecraft_server_utility.exceptions import ServerOfflineException, MinecraftServerException
+from .fake_servers import FakeJavaServer, StallingServer, status_payload, unused_port
+
+class TestAsyncServerPinger(unittest.TestCase):
+    """Test AsyncServerPinger against a local fake server"""
+    
+    def test_ping_matches_sync_result_shape(self):
+        """Test async ping returns the ServerPinger result dict"""
+        status = status_payload(players_online=7, sample=[{'name': 'Steve', 'id': '0'}])
+        with FakeJavaServer(status) as server:
+            info = asyncio.run(AsyncServerPinger('127.0.0.1', server.port).ping())
+        
+        self.assertTrue(info['online'])
+        self.assertEqual(info['players']['online'], 7)
+        self.assertEqual(info['players']['list'][0]['name'], 'Steve')
+        self.assertEqual(info['version'], '1.20.1')
+        self.assertEqual(info['motd'], 'A Minecraft Server')
+    
+    def test_latency_from_ping_pong(self):
+        """Test latency comes from Ping/Pong on the status connection"""
+        with FakeJavaServer() as server:
+            pinger = AsyncServerPinger('127.0.0.1', server.port)
+            info = asyncio.run(pinger.ping())
+            skipped = asyncio.run(pinger.ping(measure_latency=False))
+            connections = server.connections
+        
+        self.assertEqual(connections, 2)
+        self.assertGreaterEqual(info['latency'], 0)
+        self.assertIsNone(skipped['latency'])
+    
+    def test_concurrent_getters_share_one_ping(self):
+        """Test concurrent cached getters open a single connection"""
+        async def dashboard(pinger):
+            return await asyncio.gather(pinger.get_player_count(), pinger.get_motd(),
+                                        pinger.get_version(), pinger.is_online())
+        
+        with FakeJavaServer() as server:
+            pinger = AsyncServerPinger('127.0.0.1', server.port, cache=StatusCache(ttl=30))
+            count, motd, version, online = asyncio.run(dashboard(pinger))
+            connections = server.connections
+        
+        self.assertEqual(connections, 1)
+        self.assertEqual((count, version, online), (3, '1.20.1', True))
+    
+    def test_offline_server(self):
+        """Test refused connection raises ServerOfflineException"""
+        pinger = AsyncServerPinger('127.0.0.1', unused_port(), timeout=1)
+        with self.assertRaises(ServerOfflineException):
+            asyncio.run(pinger.ping())
+        self.assertFalse(asyncio.run(pinger.is_online()))
+    
+    def test_one_deadline_across_dialects(self):
+        """Test legacy fallbacks share the ping's timeout instead of each getting their own"""
+        with StallingServer(delay=0.4) as server:
+            pinger = AsyncServerPinger('127.0.0.1', server.port, timeout=0.5, dialects=StatusCache())
+            start = time.monotonic()
+            with self.assertRaises(ServerOfflineException):
+                asyncio.run(pinger.ping())
+            elapsed = time.monotonic() - start
+        
+        self.assertLess(elapsed, 0.9)
+    
+    def test_socket_closed_when_stream_setup_fails(self):
+        """Test the connected socket is closed if wrapping it in a stream fails"""
+        client, peer = socket.socketpair()
+        
+        async def connected(addresses):
+            return client
+        
+        pinger = AsyncServerPinger('127.0.0.1', 25565, timeout=1, dialects=StatusCache())
+        with mock.patch('minecraft_server_utility.async_pinger.connect_async', connected), \
+                mock.patch('asyncio.open_connection', side_effect=OSError("no transport")):
+            with self.assertRaises(MinecraftServerException):
+                asyncio.run(pinger.ping())
+        peer.close()
+        self.assertEqual(client.fileno(), -1)
+    
+    def test_ping_servers_keeps_order_and_errors(self):
+        """Test ping_servers returns results and exceptions in input order"""
+        with FakeJavaServer() as server:
+            targets = [('127.0.0.1', server.port), ('127.0.0.1', unused_port(), 1),
+                       ('127.0.0.1', server.port)]
+            results = asyncio.run(ping_servers(targets, concurrency=2))
+        
+        self.assertTrue(results[0]['online'])
+        self.assertIsInstance(results[1], ServerOfflineException)
+        self.assertTrue(results[2]['online'])
+
+if __name__ == '__main__':
+    unittest.main()
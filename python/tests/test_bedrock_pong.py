@@ -0,0 +1,73 @@
+"""
+Tests for the Bedrock pong parser
+"""
+import asyncio
+import unittest
+from minecraft_server_utility import BedrockPinger, BedrockScanner, StatusCache
+from minecraft_server_utility.bedrock_pong import BedrockPong
+from minecraft_server_utility.exceptions import BedrockException
+from .fake_servers import FakeBedrockServer, bedrock_pong, bedrock_server_id
+
+TIMESTAMP = b'\x00' * 7 + b'\x2a'
+
+class TestBedrockPong(unittest.TestCase):
+    """Test BedrockPong"""
+    
+    def test_typed_fields(self):
+        """Test advertisement fields are split and typed"""
+        pong = BedrockPong(bedrock_pong(TIMESTAMP, bedrock_server_id(), server_guid=99))
+        
+        self.assertEqual(pong.timestamp, 42)
+        self.assertEqual(pong.server_guid, 99)
+        self.assertEqual(pong.edition, 'MCPE')
+        self.assertEqual(pong.motd, 'Dedicated Server')
+        self.assertEqual(pong.protocol, 594)
+        self.assertEqual((pong.players, pong.max_players), (2, 10))
+        self.assertEqual(pong.gamemode, 'Survival')
+        self.assertEqual((pong.port_v4, pong.port_v6), (19132, 19133))
+    
+    def test_memoryview_fields_located_lazily(self):
+        """Test a pong over a memoryview decodes fields without scanning past them"""
+        data = bedrock_pong(TIMESTAMP, bedrock_server_id(motd='Lazy MOTD'))
+        view = memoryview(bytearray(data))
+        pong = BedrockPong(view)
+        
+        self.assertEqual(pong.edition, 'MCPE')
+        self.assertEqual(len(pong._offsets), 1)
+        self.assertEqual(pong.players, 2)
+        self.assertEqual(len(pong._offsets), 5)
+        self.assertEqual(pong.field(40), '')
+        self.assertEqual(pong.advertisement, str(data[35:], 'utf-8'))
+        self.assertEqual(pong.to_dict(), BedrockPong(data).to_dict())
+    
+    def test_short_advertisement(self):
+        """Test servers that omit trailing fields still parse"""
+        pong = BedrockPong(bedrock_pong(TIMESTAMP, 'MCEE;Classroom;390;1.14.50;1;40'))
+        self.assertEqual(pong.edition, 'MCEE')
+        self.assertEqual(pong.max_players, 40)
+        self.assertEqual(pong.gamemode, 'Unknown')
+        self.assertEqual(pong.port_v4, 0)
+    
+    def test_oversized_and_truncated(self):
+        """Test long advertisements parse and truncated ones are rejected"""
+        motd = '§a' + 'x' * 3000
+        data = bedrock_pong(TIMESTAMP, bedrock_server_id(motd=motd))
+        self.assertEqual(BedrockPong(data).motd, motd)
+        with self.assertRaises(BedrockException):
+            BedrockPong(data[:100])
+        with self.assertRaises(BedrockException):
+            BedrockPong(b'\x01' + data[1:])
+    
+    def test_pingers_parse_real_pongs(self):
+        """Test BedrockPinger and BedrockScanner report a live server"""
+        with FakeBedrockServer(bedrock_server_id(motd='y' * 1500)) as server:
+            info = BedrockPinger('127.0.0.1', server.port, timeout=2, cache=StatusCache()).ping()
+            scanned = asyncio.run(BedrockScanner(timeout=2).scan([('127.0.0.1', server.port)]))[0]
+        
+        for result in (info, scanned):
+            self.assertTrue(result['online'])
+            self.assertEqual(result['motd'], 'y' * 1500)
+            self.assertEqual(result['online_players'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
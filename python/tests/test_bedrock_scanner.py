@@ -0,0 +1,88 @@
+"""
+Tests for the multiplexed Bedrock scanner
+"""
+import asyncio
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+from minecraft_server_utility import BedrockPinger, BedrockScanner, StatusCache
+from minecraft_server_utility.bedrock_pinger import create_unconnected_ping, pong_timestamp
+from minecraft_server_utility.exceptions import ServerOfflineException
+from .fake_servers import FakeBedrockServer, bedrock_pong, bedrock_server_id
+
+class TestBedrockScanner(unittest.TestCase):
+    """Test BedrockScanner"""
+    
+    def test_ping_packet_carries_timestamp(self):
+        """Test the ping timestamp round-trips through a pong"""
+        packet = create_unconnected_ping(0x0102030405060708)
+        self.assertEqual(len(packet), 33)
+        pong = bedrock_pong(packet[1:9], bedrock_server_id())
+        self.assertEqual(pong_timestamp(pong), 0x0102030405060708)
+        self.assertIsNone(pong_timestamp(b'\x01' + packet[1:9]))
+    
+    def test_lost_pings_are_retried_with_fresh_timestamps(self):
+        """Test unanswered pings are resent until the deadline"""
+        with FakeBedrockServer(drop=10) as server:
+            scanner = BedrockScanner(timeout=0.3, retries=2)
+            results = asyncio.run(scanner.scan([('127.0.0.1', server.port)]))
+            pings = list(server.pings)
+        
+        self.assertIsInstance(results[0], ServerOfflineException)
+        self.assertEqual(len(pings), 3)
+        self.assertEqual(len({ping[1:9] for ping in pings}), 3)
+        self.assertEqual(scanner._pending, {})
+    
+    def test_pinger_timeout_honoured(self):
+        """Test a supplied pinger's own timeout bounds its probe"""
+        with FakeBedrockServer(drop=10) as server:
+            scanner = BedrockScanner(timeout=10, retries=2)
+            start = time.monotonic()
+            results = asyncio.run(scanner.scan([BedrockPinger('127.0.0.1', server.port, timeout=0.3)]))
+            elapsed = time.monotonic() - start
+        
+        self.assertIsInstance(results[0], ServerOfflineException)
+        self.assertLess(elapsed, 2)
+
+class TestBedrockPingerDeadline(unittest.TestCase):
+    """Test BedrockPinger against a noisy peer"""
+    
+    def test_stray_datagrams_do_not_extend_timeout(self):
+        """Test pongs for other pings cannot keep a ping running past its timeout"""
+        peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        peer.bind(('127.0.0.1', 0))
+        peer.settimeout(2)
+        stop = threading.Event()
+        
+        def noise():
+            _, client = peer.recvfrom(2048)
+            stray = bedrock_pong(b'\x00' * 8, bedrock_server_id())
+            # Bounded so a regression fails the test instead of hanging it
+            end = time.monotonic() + 3
+            while not stop.is_set() and time.monotonic() < end:
+                peer.sendto(stray, client)
+                time.sleep(0.05)
+        thread = threading.Thread(target=noise)
+        thread.start()
+        try:
+            pinger = BedrockPinger('127.0.0.1', peer.getsockname()[1], timeout=0.3, cache=StatusCache())
+            start = time.monotonic()
+            with self.assertRaises(ServerOfflineException):
+                pinger.ping()
+            self.assertLess(time.monotonic() - start, 1)
+        finally:
+            stop.set()
+            thread.join()
+            peer.close()
+    
+    def test_socket_creation_failure(self):
+        """Test a socket that cannot be created is reported as offline"""
+        pinger = BedrockPinger('127.0.0.1', 19132, timeout=0.3, cache=StatusCache())
+        with mock.patch('minecraft_server_utility.bedrock_pinger.socket.socket', side_effect=OSError("no sockets")):
+            with self.assertRaises(ServerOfflineException):
+                pinger.ping()
+
+if __name__ == '__main__':
+    unittest.main()
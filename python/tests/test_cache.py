@@ -0,0 +1,94 @@
+"""
+Tests for the shared status cache
+"""
+import threading
+import time
+import unittest
+from minecraft_server_utility import ServerPinger, StatusCache
+from .fake_servers import FakeJavaServer, status_payload
+
+class TestStatusCache(unittest.TestCase):
+    """Test StatusCache"""
+    
+    def test_ttl_and_lru_eviction(self):
+        """Test entries expire after ttl and least recently used are evicted"""
+        cache = StatusCache(ttl=0.05, maxsize=2)
+        cache.put('a', {'n': 1})
+        cache.put('b', {'n': 2})
+        cache.get('a')
+        cache.put('c', {'n': 3})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'n': 1})
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('a'))
+    
+    def test_concurrent_callers_share_one_ping(self):
+        """Test a stampede on one key runs a single ping"""
+        cache = StatusCache(ttl=10)
+        calls = []
+        release = threading.Event()
+        
+        def slow_ping():
+            calls.append(1)
+            release.wait(2)
+            return {'online': True}
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_ping('k', slow_ping)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'online': True}] * 8)
+    
+    def test_errors_are_not_cached(self):
+        """Test a failed ping is retried on the next call"""
+        cache = StatusCache(ttl=10)
+        with self.assertRaises(ValueError):
+            cache.get_or_ping('k', lambda: (_ for _ in ()).throw(ValueError()))
+        self.assertEqual(cache.get_or_ping('k', lambda: {'ok': 1}), {'ok': 1})
+    
+    def test_getters_reuse_one_ping(self):
+        """Test ServerPinger getters share a cached status"""
+        with FakeJavaServer() as server:
+            pinger = ServerPinger('127.0.0.1', server.port, cache=StatusCache(ttl=30))
+            pinger.get_player_count()
+            pinger.get_motd()
+            pinger.get_version()
+            self.assertTrue(pinger.is_online())
+            connections = server.connections
+        
+        self.assertEqual(connections, 1)
+    
+    def test_zero_ttl_pings_every_call(self):
+        """Test a zero-TTL cache opts the getters out of reuse"""
+        with FakeJavaServer() as server:
+            pinger = ServerPinger('127.0.0.1', server.port, cache=StatusCache(ttl=0))
+            pinger.get_player_count()
+            pinger.get_motd()
+            connections = server.connections
+        
+        self.assertEqual(connections, 2)
+    
+    def test_pinger_settings_keep_results_apart(self):
+        """Test pingers with different favicon modes don't share cached results"""
+        cache = StatusCache(ttl=30)
+        with FakeJavaServer(status_payload(favicon='data:image/png;base64,cG5n')) as server:
+            stripped = ServerPinger('127.0.0.1', server.port, cache=cache, favicon='skip').cached_ping()
+            full = ServerPinger('127.0.0.1', server.port, cache=cache).cached_ping()
+            again = ServerPinger('127.0.0.1', server.port, cache=cache).cached_ping()
+            connections = server.connections
+        
+        self.assertIsNone(stripped['favicon'])
+        self.assertEqual(full['favicon'], 'data:image/png;base64,cG5n')
+        self.assertIsNotNone(full['raw_response'])
+        self.assertIs(again, full)
+        self.assertEqual(connections, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the chat component renderer
+"""
+import unittest
+from minecraft_server_utility import render_chat, flatten_chat
+from minecraft_server_utility.chat import _render_string, clear_render_cache
+from minecraft_server_utility.status import parse_motd
+
+MOTD = {
+    'text': '',
+    'extra': [
+        {'text': 'Hyp', 'color': 'gold', 'bold': True,
+         'extra': [{'text': 'ixel', 'bold': False}]},
+        {'text': ' Network', 'color': '#12ABEF'},
+    ],
+}
+
+class TestRenderChat(unittest.TestCase):
+    """Test render_chat"""
+    
+    def test_plain_nested(self):
+        """Test nested extras and inherited styles flatten in order"""
+        self.assertEqual(render_chat(MOTD), 'Hypixel Network')
+        runs = flatten_chat(MOTD)
+        self.assertEqual(runs[0], ('Hyp', ('gold', True, False, False, False, False)))
+        self.assertEqual(runs[1][1][0], 'gold')
+        self.assertFalse(runs[1][1][1])
+    
+    def test_legacy_codes(self):
+        """Test section-sign strings are re-emitted minimally and stripped for plain text"""
+        text = '§6§lHyp§r§7ixel'
+        self.assertEqual(render_chat(text), 'Hypixel')
+        self.assertEqual(render_chat(text, 'legacy'), '§6§lHyp§7ixel')
+        self.assertEqual(render_chat(MOTD, 'legacy'),
+                         '§6§lHyp§6ixel§x§1§2§a§b§e§f Network')
+    
+    def test_ansi_and_html(self):
+        """Test terminal and HTML output"""
+        self.assertEqual(render_chat({'text': 'hi', 'color': 'red'}, 'ansi'), '\x1b[0;91mhi\x1b[0m')
+        self.assertEqual(render_chat({'text': '<b>', 'color': 'red', 'underlined': True}, 'html'),
+                         '<span style="color:#FF5555;text-decoration:underline">&lt;b&gt;</span>')
+        self.assertEqual(render_chat('a\nb', 'html'), 'a<br>b')
+    
+    def test_format_flags(self):
+        """Test only true and "true" switch a format on"""
+        for value, expected in ((True, True), ('true', True), ('false', False), (1, False), ('', False)):
+            self.assertEqual(flatten_chat({'text': 'a', 'bold': value})[0][1][1], expected, value)
+        parent = {'text': '', 'bold': True, 'extra': [{'text': 'a', 'bold': 'false'}]}
+        self.assertFalse(flatten_chat(parent)[0][1][1])
+    
+    def test_memoizes_strings_only(self):
+        """Test legacy strings are memoized and components render uncached"""
+        clear_render_cache()
+        render_chat('§aHello')
+        render_chat('§aHello')
+        render_chat({'text': 'Hello'})
+        info = _render_string.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+    
+    def test_translate(self):
+        """Test translate keys substitute their arguments"""
+        component = {'translate': 'chat.type.text', 'with': ['Steve', {'text': 'hi', 'color': 'red'}]}
+        self.assertEqual(render_chat(component), '<Steve> hi')
+        self.assertEqual(render_chat({'translate': 'x.y', 'fallback': '%2$s-%1$s', 'with': ['a', 'b']}), 'b-a')
+        self.assertEqual(render_chat({'translate': 'unknown.key'}), 'unknown.key')
+    
+    def test_unhashable_color(self):
+        """Test a non-string colour is ignored instead of raising"""
+        runs = flatten_chat({'text': 'a', 'color': ['red']})
+        self.assertEqual(runs, [('a', (None, False, False, False, False, False))])
+        self.assertEqual(render_chat({'text': 'a', 'color': {'name': 'red'}}, 'ansi'), 'a')
+    
+    def test_translate_non_string(self):
+        """Test non-string translate keys and fallbacks render as text"""
+        self.assertEqual(render_chat({'translate': 5}), '5')
+        self.assertEqual(render_chat({'translate': 'x.y', 'fallback': 7}), '7')
+        self.assertEqual(render_chat({'translate': ['a']}), "['a']")
+    
+    def test_deep_nesting(self):
+        """Test deeply nested components do not hit the recursion limit"""
+        component = {'text': 'x'}
+        for _ in range(5000):
+            component = {'text': '', 'extra': [component]}
+        self.assertEqual(render_chat(component), 'x')
+    
+    def test_invalid_format(self):
+        """Test unknown formats are rejected"""
+        with self.assertRaises(ValueError):
+            render_chat('x', 'rtf')
+    
+    def test_parse_motd(self):
+        """Test the status MOTD uses the full renderer"""
+        self.assertEqual(parse_motd(MOTD), 'Hypixel Network')
+        self.assertEqual(parse_motd([{'text': 'a'}, 'b', {'text': 'c'}]), 'abc')
+    
+    def test_parse_motd_strips_legacy_codes(self):
+        """Test plain-string MOTDs lose their section-sign codes"""
+        self.assertEqual(parse_motd('§6§lHypixel §r§7Network '), 'Hypixel Network')
+        self.assertEqual(render_chat('§6Hypixel', 'legacy'), '§6Hypixel')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests for favicon modes and the FaviconStore
+"""
+import base64
+import os
+import tempfile
+import unittest
+from minecraft_server_utility import ServerPinger, FaviconStore, StatusCache
+from .fake_servers import FakeJavaServer, status_payload
+
+PNG = b'\x89PNG\r\n\x1a\nfake image'
+URI = 'data:image/png;base64,' + base64.b64encode(PNG).decode()
+
+class TestFaviconStore(unittest.TestCase):
+    """Test FaviconStore"""
+    
+    def test_dedup_in_memory(self):
+        """Test identical images are stored once"""
+        store = FaviconStore()
+        first = store.put_uri(URI)
+        second = store.put(PNG)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.get(first), PNG)
+        self.assertEqual(store.data_uri(first), URI)
+        self.assertIsNone(store.put_uri('not a data uri'))
+    
+    def test_disk_roundtrip(self):
+        """Test images written to disk are found by a new store"""
+        with tempfile.TemporaryDirectory() as directory:
+            digest = FaviconStore(directory).put(PNG)
+            reopened = FaviconStore(directory)
+            
+            self.assertEqual(os.listdir(directory), [f"{digest}.png"])
+            self.assertEqual(reopened.get(digest), PNG)
+            self.assertNotIn('0' * 64, reopened)
+            self.assertNotIn('../escape', reopened)
+
+class TestFaviconModes(unittest.TestCase):
+    """Test ping favicon options"""
+    
+    def ping(self, **kwargs):
+        with FakeJavaServer(status_payload(favicon=URI)) as server:
+            pinger = ServerPinger('127.0.0.1', server.port, cache=StatusCache(), **kwargs)
+            return pinger, pinger.ping()
+    
+    def test_keep(self):
+        """Test the default keeps the base64 favicon"""
+        _, info = self.ping()
+        self.assertEqual(info['favicon'], URI)
+        self.assertEqual(info.favicon_bytes, PNG)
+        self.assertEqual(len(info['favicon_hash']), 64)
+    
+    def test_skip(self):
+        """Test skip drops the favicon from the result and raw response"""
+        _, info = self.ping(favicon='skip')
+        self.assertIsNone(info['favicon'])
+        self.assertIsNone(info['favicon_hash'])
+        self.assertNotIn('favicon', info['raw_response'])
+    
+    def test_hash_with_store(self):
+        """Test hash mode keeps only a reference into the store"""
+        store = FaviconStore()
+        _, info = self.ping(favicon='hash', favicon_store=store)
+        
+        self.assertIsNone(info['favicon'])
+        self.assertEqual(store.get(info['favicon_hash']), PNG)
+        self.assertEqual(info.favicon_bytes, PNG)
+    
+    def test_invalid_mode(self):
+        """Test unknown modes are rejected"""
+        with self.assertRaises(ValueError):
+            ServerPinger('127.0.0.1', favicon='maybe')
+
+if __name__ == '__main__':
+    unittest.main()
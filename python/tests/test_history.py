@@ -0,0 +1,135 @@
+"""
+Tests for the columnar HistoryStore
+"""
+import math
+import os
+import tempfile
+import unittest
+from minecraft_server_utility import HistoryStore, ServerPinger, SweepResult
+from minecraft_server_utility.status import ServerStatus
+from .fake_servers import status_payload
+
+KEY = ('example.com', 25565, 'java')
+
+def fill(store, rows=180, start=0):
+    for i in range(rows):
+        online = i % 10 != 9
+        store.append(KEY, start + i * 20.0, online, i % 7 if online else 0, 20,
+                     5.0 + i % 3 if online else None, 763)
+
+class TestHistoryStore(unittest.TestCase):
+    """Test HistoryStore"""
+    
+    def test_raw_range_query(self):
+        """Test half-open range queries across chunks and the tail"""
+        store = HistoryStore(chunk_size=16)
+        fill(store)
+        rows = store.query(KEY, 100, 400)
+        
+        self.assertEqual(list(rows['timestamp']), [100.0 + 20 * i for i in range(15)])
+        self.assertEqual(rows['players_max'].tolist(), [20] * 15)
+        self.assertTrue(math.isnan(store.query(KEY, 180, 181)['latency'][0]))
+        self.assertEqual(len(store.query(('other', 1, 'java'))['timestamp']), 0)
+    
+    def test_rollups(self):
+        """Test minute buckets aggregate players, latency and uptime"""
+        store = HistoryStore()
+        fill(store)
+        minutes = store.query(KEY, resolution='1m')
+        
+        # 180 rows every 20s span 60 minutes; the last one is still open
+        self.assertEqual(len(minutes['timestamp']), 59)
+        self.assertEqual(minutes['samples'][0], 3)
+        self.assertEqual((minutes['players_min'][0], minutes['players_max'][0]), (0, 2))
+        self.assertAlmostEqual(minutes['latency_avg'][0], 6.0)
+        self.assertAlmostEqual(sum(minutes['uptime']) / 59, 0.9, places=1)
+        with self.assertRaises(ValueError):
+            store.query(KEY, resolution='1w')
+    
+    def test_out_of_order(self):
+        """Test rows must arrive in time order"""
+        store = HistoryStore()
+        store.append(KEY, 10, True)
+        with self.assertRaises(ValueError):
+            store.append(KEY, 5, True)
+    
+    def test_disk_roundtrip(self):
+        """Test memory-mapped history survives reopening and keeps rollups going"""
+        with tempfile.TemporaryDirectory() as directory:
+            store = HistoryStore(directory, chunk_size=32)
+            fill(store, rows=90)
+            view = store.query(KEY, 0, 320)['timestamp']
+            fill(store, rows=10, start=1800)
+            store.close()
+            
+            reopened = HistoryStore(directory, chunk_size=32)
+            self.assertEqual(reopened.keys(), [KEY])
+            self.assertEqual(len(reopened.query(KEY)['timestamp']), 100)
+            self.assertEqual(view.tolist(), [20.0 * i for i in range(16)])
+            fill(reopened, rows=90, start=2000)
+            minutes = reopened.query(KEY, resolution='1m')
+            self.assertEqual(len(set(minutes['timestamp'].tolist())), len(minutes['timestamp']))
+            # Every row is rolled up exactly once; only the row at 3780s is still open
+            self.assertEqual(sum(minutes['samples']), 189)
+    
+    def test_partial_first_flush_trimmed(self):
+        """Test a column written alone by a crashed first flush is trimmed on reopen"""
+        with tempfile.TemporaryDirectory() as directory:
+            store = HistoryStore(directory, chunk_size=4)
+            fill(store, rows=4)
+            store.close()
+            raw = next(os.path.join(root, 'raw') for root, dirs, _ in os.walk(directory)
+                       if 'raw' in dirs)
+            for name in os.listdir(raw):
+                if name != 'timestamp.col':
+                    open(os.path.join(raw, name), 'wb').close()
+            
+            reopened = HistoryStore(directory, chunk_size=4)
+            self.assertEqual(len(reopened.query(KEY)['timestamp']), 0)
+            self.assertEqual(os.path.getsize(os.path.join(raw, 'timestamp.col')), 0)
+            fill(reopened, rows=4, start=1000)
+            reopened.close()
+            
+            rows = HistoryStore(directory, chunk_size=4).query(KEY)
+            self.assertEqual(rows['timestamp'].tolist(), [1000.0, 1020.0, 1040.0, 1060.0])
+            self.assertEqual(rows['players_online'].tolist(), [0, 1, 2, 3])
+    
+    @unittest.skipUnless(os.path.isdir('/proc/self/fd'), "needs /proc/self/fd")
+    def test_many_servers_hold_no_descriptors(self):
+        """Test a large on-disk fleet does not keep a descriptor per column open"""
+        with tempfile.TemporaryDirectory() as directory:
+            store = HistoryStore(directory, chunk_size=4)
+            before = len(os.listdir('/proc/self/fd'))
+            for port in range(300):
+                for i in range(5):
+                    store.append(('example.com', port, 'java'), i * 60.0, True, 1, 20, 5.0, 763)
+            store.flush()
+            self.assertLess(len(os.listdir('/proc/self/fd')) - before, 10)
+            self.assertEqual(len(store.query(('example.com', 7, 'java'))['timestamp']), 5)
+            store.close()
+    
+    def test_out_of_range_values_clamped(self):
+        """Test bogus player counts and protocols are clamped instead of breaking recording"""
+        store = HistoryStore()
+        store.append(KEY, 1, True, 10 ** 10, -10 ** 10, 5.0, 2 ** 40)
+        rows = store.query(KEY)
+        
+        self.assertEqual(rows['players_online'].tolist(), [2 ** 31 - 1])
+        self.assertEqual(rows['players_max'].tolist(), [-2 ** 31])
+        self.assertEqual(rows['protocol'].tolist(), [2 ** 31 - 1])
+    
+    def test_record_sweep_result(self):
+        """Test sweep results map onto history rows"""
+        store = HistoryStore()
+        pinger = ServerPinger('example.com')
+        info = ServerStatus('example.com', 25565, status_payload(players_online=4), 12.0)
+        store.record(SweepResult(pinger, info, None), timestamp=1)
+        store.record(SweepResult(pinger, None, OSError()), timestamp=2)
+        rows = store.query(KEY)
+        
+        self.assertEqual(rows['online'].tolist(), [1, 0])
+        self.assertEqual(rows['players_online'].tolist(), [4, 0])
+        self.assertEqual(rows['protocol'].tolist(), [763, -1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for legacy status fallback and dialect memory
+"""
+import asyncio
+import time
+import unittest
+from unittest import mock
+from minecraft_server_utility import ServerPinger, AsyncServerPinger
+from minecraft_server_utility.cache import StatusCache
+from minecraft_server_utility.legacy import (
+    MODERN, LEGACY_16, LEGACY_BETA, create_legacy_ping, parse_legacy_response
+)
+from minecraft_server_utility.exceptions import (
+    InvalidServerException, PacketFramingException, ServerOfflineException
+)
+from .fake_servers import FakeJavaServer, FakeLegacyServer, StallingServer, status_payload
+
+def pinger(cls, port, dialects):
+    return cls('127.0.0.1', port, timeout=2, cache=StatusCache(ttl=0), dialects=dialects)
+
+class TestLegacyPackets(unittest.TestCase):
+    """Test legacy ping building and parsing"""
+    
+    def test_legacy_ping_layout(self):
+        """Test the 1.6 ping carries MC|PingHost, host and port"""
+        packet = create_legacy_ping('mc.example', 25565)
+        self.assertEqual(packet[:5], b'\xfe\x01\xfa\x00\x0b')
+        self.assertEqual(packet[5:27].decode('utf-16-be'), 'MC|PingHost')
+        self.assertIn('mc.example'.encode('utf-16-be'), packet)
+        self.assertEqual(packet[-4:], (25565).to_bytes(4, 'big'))
+    
+    def test_parse_both_formats(self):
+        """Test 1.4+ and beta responses parse into status documents"""
+        modern = parse_legacy_response('\xa71\x0078\x001.6.4\x00Hi\x003\x0020'.encode('utf-16-be'))
+        self.assertEqual(modern['version'], {'name': '1.6.4', 'protocol': 78})
+        self.assertEqual(modern['players'], {'online': 3, 'max': 20})
+        beta = parse_legacy_response('\xa7cRed \xa7 MOTD\xa71\xa710'.encode('utf-16-be'))
+        self.assertEqual(beta['description'], '\xa7cRed \xa7 MOTD')
+        self.assertEqual(beta['players'], {'online': 1, 'max': 10})
+
+class TestDialectFallback(unittest.TestCase):
+    """Test ServerPinger dialect detection"""
+    
+    def test_legacy_16_detected_and_remembered(self):
+        """Test a 1.6 server is detected once, then pinged directly"""
+        dialects = StatusCache(ttl=60)
+        with FakeLegacyServer() as server:
+            first = pinger(ServerPinger, server.port, dialects).ping()
+            second = pinger(ServerPinger, server.port, dialects).ping()
+            connections = server.connections
+        
+        self.assertEqual(first['version'], '1.6.4')
+        self.assertEqual(first['motd'], 'Old Server')
+        self.assertEqual(second['players']['online'], 4)
+        self.assertEqual(connections, 3)
+        self.assertEqual(dialects.get(('127.0.0.1', server.port, 'java'))[0], LEGACY_16)
+    
+    def test_beta_fallback(self):
+        """Test a beta server is reached after the 1.6 ping is refused"""
+        dialects = StatusCache(ttl=60)
+        with FakeLegacyServer(dialect='beta') as server:
+            info = pinger(ServerPinger, server.port, dialects).ping()
+            requests = list(server.requests)
+        
+        self.assertEqual(info['players']['max'], 16)
+        self.assertEqual(info['protocol'], -1)
+        self.assertEqual(requests[-1], b'\xfe')
+        self.assertEqual(dialects.get(('127.0.0.1', server.port, 'java'))[0], LEGACY_BETA)
+    
+    def test_modern_server_answering_fallback_not_remembered(self):
+        """Test a legacy answer carrying the 1.7+ protocol does not pin the host to legacy"""
+        dialects = StatusCache(ttl=60)
+        with FakeLegacyServer(protocol=127) as server:
+            info = pinger(ServerPinger, server.port, dialects).ping()
+        
+        self.assertEqual(info['protocol'], 127)
+        self.assertIsNone(dialects.get(('127.0.0.1', server.port, 'java')))
+    
+    def test_upgraded_server_forgets_legacy_dialect(self):
+        """Test a host remembered as legacy goes back to modern pings once it reports 1.7+"""
+        with FakeLegacyServer(protocol=127) as server:
+            key = ('127.0.0.1', server.port, 'java')
+            dialects = StatusCache(ttl=60)
+            dialects.put(key, (LEGACY_16, 762))
+            pinger(ServerPinger, server.port, dialects).ping()
+            requests = list(server.requests)
+        
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0][:1], b'\xfe')
+        self.assertIsNone(dialects.get(key))
+    
+    def test_modern_protocol_negotiated(self):
+        """Test later handshakes carry the protocol the server reported"""
+        dialects = StatusCache(ttl=60)
+        with FakeJavaServer(status_payload(protocol=763)) as server:
+            pinger(ServerPinger, server.port, dialects).ping()
+            pinger(ServerPinger, server.port, dialects).ping()
+            handshakes = list(server.handshakes)
+        
+        self.assertEqual(handshakes[0][1:3], b'\xfa\x05')
+        self.assertEqual(handshakes[1][1:3], b'\xfb\x05')
+        self.assertEqual(dialects.get(('127.0.0.1', server.port, 'java')), (MODERN, 763))
+    
+    def test_one_deadline_across_dialects(self):
+        """Test fallbacks share the ping's timeout instead of each getting their own"""
+        with StallingServer(delay=0.4) as server:
+            slow = ServerPinger('127.0.0.1', server.port, timeout=0.5, dialects=StatusCache())
+            start = time.monotonic()
+            with self.assertRaises(ServerOfflineException):
+                slow.ping()
+            elapsed = time.monotonic() - start
+        
+        self.assertLess(elapsed, 0.9)
+    
+    def test_only_protocol_errors_fall_back(self):
+        """Test framing errors try the next dialect and other failures stop at once"""
+        target = pinger(ServerPinger, 25565, StatusCache())
+        with mock.patch.object(ServerPinger, '_exchange', side_effect=PacketFramingException("bad")) as exchange:
+            with self.assertRaises(InvalidServerException):
+                target.ping()
+        self.assertEqual(exchange.call_count, 3)
+        
+        with mock.patch.object(ServerPinger, '_exchange', side_effect=RuntimeError("boom")) as exchange:
+            with self.assertRaises(InvalidServerException):
+                target.ping()
+        self.assertEqual(exchange.call_count, 1)
+    
+    def test_async_fallback(self):
+        """Test AsyncServerPinger falls back the same way"""
+        dialects = StatusCache(ttl=60)
+        with FakeLegacyServer() as server:
+            info = asyncio.run(pinger(AsyncServerPinger, server.port, dialects).ping())
+        
+        self.assertEqual(info['players']['max'], 16)
+        self.assertEqual(dialects.get(('127.0.0.1', server.port, 'java'))[0], LEGACY_16)
+
+if __name__ == '__main__':
+    unittest.main()
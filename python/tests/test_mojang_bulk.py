@@ -0,0 +1,52 @@
+"""
+Tests for bulk Mojang UUID lookups
+"""
+import unittest
+from unittest.mock import patch, MagicMock
+from minecraft_server_utility import MojangAPI
+
+def bulk_response(request_names, known):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = [
+        {'id': known[name.lower()], 'name': name.capitalize()}
+        for name in request_names if name.lower() in known
+    ]
+    return mock_response
+
+class TestGetUUIDs(unittest.TestCase):
+    """Test MojangAPI.get_uuids"""
+    
+    def setUp(self):
+        self.known = {f'player{i}': f'uuid{i}' for i in range(25)}
+    
+    @patch('requests.Session.post')
+    def test_chunks_dedupes_and_reports_missing(self, mock_post):
+        """Test names are case-folded, deduplicated and sent ten at a time"""
+        mock_post.side_effect = lambda url, json, timeout: bulk_response(json, self.known)
+        names = [f'Player{i}' for i in range(25)] + ['PLAYER3', 'ghost']
+        
+        api = MojangAPI()
+        result = api.get_uuids(names)
+        
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertTrue(all(len(call.kwargs['json']) <= 10 for call in mock_post.call_args_list))
+        self.assertEqual(len(result), 26)
+        self.assertEqual(result['Player3'], 'uuid3')
+        self.assertIsNone(result['ghost'])
+    
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
+    def test_results_feed_the_uuid_cache(self, mock_post, mock_get):
+        """Test bulk results answer later single and bulk lookups"""
+        mock_post.side_effect = lambda url, json, timeout: bulk_response(json, self.known)
+        api = MojangAPI()
+        api.get_uuids(['Player1', 'ghost'])
+        
+        self.assertEqual(api.get_uuid('player1'), 'uuid1')
+        self.assertEqual(api.get_uuids(['ghost', 'Player1']), {'ghost': None, 'Player1': 'uuid1'})
+        self.assertEqual(mock_post.call_count, 1)
+        mock_get.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
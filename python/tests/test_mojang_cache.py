@@ -0,0 +1,91 @@
+"""
+Tests for MojangAPI caching
+"""
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from minecraft_server_utility import MojangAPI
+from minecraft_server_utility.mojang_cache import ProfileCache, MemoryCache, SQLiteCache, MISSING
+
+def response(status_code, payload=None):
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_response.json.return_value = payload
+    return mock_response
+
+class TestMojangCache(unittest.TestCase):
+    """Test MojangAPI cache layer"""
+    
+    @patch('requests.Session.get')
+    def test_uuid_lookup_is_cached_case_insensitively(self, mock_get):
+        """Test repeated lookups hit the network once"""
+        mock_get.return_value = response(200, {'id': 'abc', 'name': 'Notch'})
+        api = MojangAPI()
+        
+        self.assertEqual(api.get_uuid('Notch'), 'abc')
+        self.assertEqual(api.get_uuid('notch'), 'abc')
+        self.assertEqual(mock_get.call_count, 1)
+    
+    @patch('requests.Session.get')
+    def test_negative_results_use_negative_ttl(self, mock_get):
+        """Test 204 results are cached for negative_ttl only"""
+        mock_get.return_value = response(204)
+        api = MojangAPI(negative_ttl=0.05)
+        
+        self.assertIsNone(api.get_uuid('Nobody'))
+        self.assertIsNone(api.get_uuid('Nobody'))
+        self.assertEqual(mock_get.call_count, 1)
+        time.sleep(0.06)
+        api.get_uuid('Nobody')
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('requests.Session.get')
+    def test_username_reuses_cached_profile(self, mock_get):
+        """Test get_username is served from the cached profile"""
+        mock_get.return_value = response(200, {'id': 'abc', 'name': 'Notch', 'properties': []})
+        api = MojangAPI()
+        
+        api.get_profile('ABC')
+        self.assertEqual(api.get_username('abc'), 'Notch')
+        self.assertEqual(mock_get.call_count, 1)
+    
+    def test_memory_cache_lru(self):
+        """Test MemoryCache evicts the least recently used key"""
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', 1, 60)
+        cache.set('b', None, 60)
+        cache.get('a')
+        cache.set('c', 3, 60)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('a'), 1)
+    
+    def test_sqlite_cache_survives_restart(self):
+        """Test SQLiteCache entries persist across instances"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'mojang.db')
+            cache = SQLiteCache(path)
+            cache.set('uuid:notch', 'abc', 60)
+            cache.set('uuid:nobody', None, 60)
+            cache.set('uuid:old', 'x', -1)
+            cache.close()
+            
+            cache = SQLiteCache(path)
+            self.assertEqual(cache.get('uuid:notch'), 'abc')
+            self.assertIsNone(cache.get('uuid:nobody'))
+            self.assertIs(cache.get('uuid:old'), MISSING)
+            self.assertEqual(cache.purge_expired(), 1)
+            cache.close()
+    
+    def test_incomplete_backend_rejected(self):
+        """Test a backend missing part of the interface fails when instantiated"""
+        class GetOnly(ProfileCache):
+            def get(self, key):
+                return MISSING
+        
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+if __name__ == '__main__':
+    unittest.main()
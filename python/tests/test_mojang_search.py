@@ -0,0 +1,104 @@
+"""
+Tests for the search_player pipeline
+"""
+import base64
+import json
+import unittest
+from collections import Counter
+from unittest.mock import patch, MagicMock
+from minecraft_server_utility import MojangAPI, MojangAPIException
+
+def response(status_code, payload=None):
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_response.json.return_value = payload
+    return mock_response
+
+def profile(uuid, name):
+    textures = {'textures': {'SKIN': {'url': f'http://textures.minecraft.net/{name}'}}}
+    value = base64.b64encode(json.dumps(textures).encode()).decode()
+    return {'id': uuid, 'name': name, 'properties': [{'name': 'textures', 'value': value}]}
+
+class FakeMojang:
+    """Route mocked requests by URL and count them"""
+    
+    def __init__(self, players):
+        self.players = players
+        self.calls = Counter()
+    
+    def get(self, url, timeout):
+        if '/session/minecraft/profile/' in url:
+            self.calls['profile'] += 1
+        for uuid, name in self.players.items():
+            if url.endswith(f'/minecraft/{name}'):
+                return response(200, {'id': uuid, 'name': name})
+            if url.endswith(f'/profile/{uuid}'):
+                return response(200, profile(uuid, name))
+            if url.endswith(f'/{uuid}/names'):
+                return response(200, [{'name': name}])
+        return response(204)
+    
+    def post(self, url, json, timeout):
+        self.calls['bulk'] += 1
+        return response(200, [{'id': uuid, 'name': name} for uuid, name in self.players.items()
+                              if name.lower() in [n.lower() for n in json]])
+
+class TestSearchPlayer(unittest.TestCase):
+    """Test search_player and search_players"""
+    
+    def setUp(self):
+        self.fake = FakeMojang({'aaa': 'Alice', 'bbb': 'Bob'})
+        patcher_get = patch('requests.Session.get', side_effect=self.fake.get)
+        patcher_post = patch('requests.Session.post', side_effect=self.fake.post)
+        self.addCleanup(patcher_get.stop)
+        self.addCleanup(patcher_post.stop)
+        patcher_get.start()
+        patcher_post.start()
+    
+    def test_profile_fetched_once(self):
+        """Test the skin URL is taken from the single profile fetch"""
+        result = MojangAPI().search_player('Alice')
+        
+        self.assertTrue(result['found'])
+        self.assertEqual(result['skin_url'], 'http://textures.minecraft.net/Alice')
+        self.assertEqual(result['name_history'], [{'name': 'Alice'}])
+        self.assertEqual(self.fake.calls['profile'], 1)
+    
+    def test_search_players_batches_uuid_lookup(self):
+        """Test search_players resolves names in one bulk request"""
+        results = MojangAPI().search_players(['Alice', 'bob', 'ALICE', 'Nobody'])
+        
+        self.assertEqual(self.fake.calls['bulk'], 1)
+        self.assertEqual(self.fake.calls['profile'], 2)
+        self.assertEqual(results['bob']['uuid'], 'bbb')
+        self.assertEqual(results['ALICE']['uuid'], 'aaa')
+        self.assertEqual(results['ALICE']['username'], 'ALICE')
+        self.assertFalse(results['Nobody']['found'])
+    
+    def test_search_reuses_one_executor(self):
+        """Test search_player keeps one thread pool until close()"""
+        with MojangAPI() as api:
+            api.search_player('Alice')
+            executor = api._executor
+            api.search_player('Bob')
+            self.assertIs(api._executor, executor)
+        
+        self.assertIsNone(api._executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+    
+    def test_missing_player_is_not_an_error(self):
+        """Test 204 and 404 mean no such player while other errors still raise"""
+        api = MojangAPI()
+        for status in (204, 404):
+            with patch('requests.Session.get', return_value=response(status)):
+                self.assertIsNone(api.get_profile(f'{status:032x}'))
+                self.assertEqual(api.get_name_history(f'{status:032x}'), [])
+        with patch('requests.Session.get', return_value=response(500)):
+            with self.assertRaises(MojangAPIException):
+                api.get_profile('c' * 32)
+            with self.assertRaises(MojangAPIException):
+                api.get_name_history('c' * 32)
+
+if __name__ == '__main__':
+    unittest.main()
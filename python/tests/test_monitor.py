@@ -0,0 +1,80 @@
+"""
+Tests for FleetMonitor change detection
+"""
+import unittest
+from minecraft_server_utility import FleetMonitor, ServerPinger, StatusCache
+from minecraft_server_utility import monitor
+from minecraft_server_utility.status import ServerStatus
+from .fake_servers import FakeJavaServer, status_payload, unused_port
+
+KEY = ('example.com', 25565, 'java')
+
+def status(sample=(), motd='Hello', version='1.20.1', latency=10.0):
+    players = [{'name': name, 'id': f'id-{name}'} for name in sample]
+    data = status_payload(players_online=len(players), sample=players, motd=motd, version=version)
+    return ServerStatus('example.com', 25565, data, latency)
+
+def types(events):
+    return [event.type for event in events]
+
+class TestFleetMonitor(unittest.TestCase):
+    """Test FleetMonitor"""
+    
+    def test_first_observation(self):
+        """Test the first result reports online and the sampled players"""
+        fleet = FleetMonitor()
+        events = fleet.update(KEY, status(['Steve']), timestamp=1.0)
+        
+        self.assertEqual(types(events), [monitor.ONLINE, monitor.PLAYER_JOIN, monitor.PLAYER_COUNT])
+        self.assertEqual(events[1].new, {'name': 'Steve', 'id': 'id-Steve'})
+        self.assertEqual(fleet.update(KEY, status(['Steve'])), [])
+    
+    def test_changes(self):
+        """Test joins, leaves, version and MOTD changes"""
+        fleet = FleetMonitor()
+        fleet.update(KEY, status(['Steve', 'Alex']))
+        events = fleet.update(KEY, status(['Alex', 'Notch'], motd='Bye', version='1.20.2'))
+        
+        self.assertEqual(types(events), [monitor.PLAYER_LEAVE, monitor.PLAYER_JOIN,
+                                         monitor.VERSION_CHANGE, monitor.MOTD_CHANGE])
+        self.assertEqual(events[0].old['name'], 'Steve')
+        self.assertEqual((events[2].old, events[2].new), ('1.20.1', '1.20.2'))
+    
+    def test_offline_transition(self):
+        """Test going offline leaves every player and coming back is reported"""
+        fleet = FleetMonitor()
+        fleet.update(KEY, status(['Steve']))
+        
+        self.assertEqual(types(fleet.update(KEY, None)),
+                         [monitor.OFFLINE, monitor.PLAYER_LEAVE, monitor.PLAYER_COUNT])
+        self.assertEqual(fleet.update(KEY, None), [])
+        # A restart onto a new version is reported once it is back
+        self.assertEqual(types(fleet.update(KEY, status(version='1.21'))),
+                         [monitor.ONLINE, monitor.VERSION_CHANGE])
+    
+    def test_latency_threshold(self):
+        """Test only threshold crossings are reported"""
+        fleet = FleetMonitor(latency_threshold=100)
+        received = []
+        fleet.add_listener(received.append)
+        fleet.update(KEY, status(latency=50))
+        
+        self.assertEqual(types(fleet.update(KEY, status(latency=150))), [monitor.LATENCY_HIGH])
+        self.assertEqual(fleet.update(KEY, status(latency=200)), [])
+        self.assertEqual(types(fleet.update(KEY, status(latency=20))), [monitor.LATENCY_NORMAL])
+        self.assertEqual(types(received)[-2:], [monitor.LATENCY_HIGH, monitor.LATENCY_NORMAL])
+    
+    def test_poll(self):
+        """Test polling a live and a dead server"""
+        fleet = FleetMonitor()
+        with FakeJavaServer(status_payload(players_online=0)) as server:
+            targets = [ServerPinger('127.0.0.1', server.port, 2, StatusCache()),
+                       ServerPinger('127.0.0.1', unused_port(), 2, StatusCache())]
+            events = list(fleet.poll(targets))
+        
+        by_server = {event.server[1]: event.type for event in events}
+        self.assertEqual(by_server[server.port], monitor.ONLINE)
+        self.assertEqual(by_server[targets[1].port], monitor.OFFLINE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests for the fleet-wide PresenceIndex
+"""
+import unittest
+from minecraft_server_utility import FleetMonitor, PresenceIndex
+from minecraft_server_utility.status import ServerStatus
+from .fake_servers import status_payload
+
+UUID = '069a79f4-44e9-4726-a5be-fca90e38aaf5'
+LOBBY = ('lobby.example.com', 25565, 'java')
+SURVIVAL = ('survival.example.com', 25565, 'java')
+
+def status(host, *players):
+    sample = [{'name': name, 'id': uuid} for name, uuid in players]
+    return ServerStatus(host, 25565, status_payload(players_online=len(sample), sample=sample), 5.0)
+
+class TestPresenceIndex(unittest.TestCase):
+    """Test PresenceIndex"""
+    
+    def setUp(self):
+        self.fleet = FleetMonitor()
+        self.index = PresenceIndex()
+        self.fleet.add_listener(self.index.apply)
+    
+    def test_fed_by_events(self):
+        """Test joins and leaves from sweeps update the index"""
+        self.fleet.update(LOBBY, status(LOBBY[0], ('Notch', UUID)), timestamp=1)
+        self.fleet.update(SURVIVAL, status(SURVIVAL[0], ('Notch', UUID)), timestamp=2)
+        self.fleet.update(LOBBY, status(LOBBY[0]), timestamp=3)
+        
+        found = self.index.find('notch')
+        self.assertEqual([p.server for p in found], [SURVIVAL, LOBBY])
+        self.assertEqual((found[1].first_seen, found[1].last_seen, found[1].online), (1, 3, False))
+        self.assertEqual(self.index.online_on('NOTCH'), [SURVIVAL])
+        self.assertEqual(self.index.online_on(UUID), [SURVIVAL])
+        self.assertEqual(self.index.find(UUID.replace('-', '').upper())[0].name, 'Notch')
+    
+    def test_online_ranks_above_left(self):
+        """Test a player who stays online ranks above a server they left later"""
+        self.fleet.update(LOBBY, status(LOBBY[0], ('Notch', UUID)), timestamp=1)
+        self.fleet.update(SURVIVAL, status(SURVIVAL[0], ('Notch', UUID)), timestamp=2)
+        self.fleet.update(SURVIVAL, status(SURVIVAL[0]), timestamp=3)
+        for timestamp in (4, 5, 6):
+            self.fleet.update(LOBBY, status(LOBBY[0], ('Notch', UUID)), timestamp=timestamp)
+        
+        found = self.index.find('Notch')
+        self.assertEqual([(p.server, p.online) for p in found], [(LOBBY, True), (SURVIVAL, False)])
+    
+    def test_offline_server_leaves_players(self):
+        """Test a server going offline marks its players gone"""
+        self.fleet.update(LOBBY, status(LOBBY[0], ('Steve', None)), timestamp=1)
+        self.fleet.update(LOBBY, None, timestamp=5)
+        self.assertEqual(self.index.online_on('steve'), [])
+        self.assertEqual(self.index.find('steve')[0].last_seen, 5)
+    
+    def test_prefix_search(self):
+        """Test prefix search is case-insensitive and ordered"""
+        for name in ['Alex', 'alice', 'Bob', 'Alfred']:
+            self.index.seen(LOBBY, name, None, 1)
+        self.assertEqual(self.index.search('AL'), ['Alex', 'Alfred', 'alice'])
+        self.assertEqual(self.index.search('al', limit=1), ['Alex'])
+        self.assertEqual(self.index.search('z'), [])
+    
+    def test_prune_and_forget(self):
+        """Test stale presences and whole servers can be dropped"""
+        self.index.seen(LOBBY, 'Alex', UUID, 1)
+        self.index.left(LOBBY, 'Alex', 2)
+        self.index.seen(SURVIVAL, 'Bob', None, 1)
+        
+        self.assertEqual(self.index.prune(before=10), 1)
+        self.assertEqual(self.index.find(UUID), [])
+        self.assertEqual(self.index.search('a'), [])
+        self.index.forget_server(SURVIVAL)
+        self.assertEqual(len(self.index), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests for the buffered packet reader
+"""
+import socket
+import threading
+import unittest
+from minecraft_server_utility.protocol import PacketReader, decode_varint, read_string
+from minecraft_server_utility.exceptions import PacketFramingException
+from .fake_servers import pack_varint
+
+def frame(packet_id, payload):
+    body = pack_varint(packet_id) + payload
+    return pack_varint(len(body)) + body
+
+class TestPacketReader(unittest.TestCase):
+    """Test PacketReader framing"""
+    
+    def setUp(self):
+        self.client, self.server = socket.socketpair()
+        self.client.settimeout(2)
+    
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+    
+    def test_decode_varint(self):
+        """Test varint decoding and truncation"""
+        self.assertEqual(decode_varint(pack_varint(300)), (300, 2))
+        self.assertEqual(decode_varint(b'\x00' + pack_varint(2 ** 31 - 1), 1), (2 ** 31 - 1, 6))
+        self.assertIsNone(decode_varint(b'\xac'))
+        with self.assertRaises(PacketFramingException):
+            decode_varint(b'\xff' * 6)
+    
+    def test_packets_split_across_reads(self):
+        """Test packets arriving a byte at a time are reassembled"""
+        text = 'x' * 300
+        data = frame(0x00, pack_varint(len(text)) + text.encode()) + frame(0x01, b'\x00' * 8)
+        
+        def trickle():
+            for i in range(len(data)):
+                self.server.sendall(data[i:i + 1])
+        thread = threading.Thread(target=trickle)
+        thread.start()
+        
+        reader = PacketReader(self.client, initial_size=16)
+        packet_id, payload = reader.read_packet()
+        self.assertEqual(packet_id, 0x00)
+        self.assertEqual(read_string(payload), (text, len(payload)))
+        self.assertEqual(reader.read_packet()[0], 0x01)
+        self.assertEqual(reader.bytes_read, len(data))
+        thread.join()
+    
+    def test_large_payload_grows_buffer(self):
+        """Test payloads larger than the buffer are read whole"""
+        payload = bytes(range(256)) * 400
+        self.server.sendall(frame(0x00, payload))
+        
+        packet_id, view = PacketReader(self.client, initial_size=64).read_packet()
+        self.assertEqual(bytes(view), payload)
+    
+    def test_oversized_length_rejected(self):
+        """Test a length prefix beyond the protocol maximum fails before buffering it"""
+        self.server.sendall(pack_varint(2 ** 31 - 1) + b'\x00')
+        reader = PacketReader(self.client, initial_size=64)
+        with self.assertRaises(PacketFramingException):
+            reader.read_packet()
+        self.assertEqual(len(reader._buf), 64)
+        with self.assertRaises(PacketFramingException):
+            reader.read_exact(-1)
+    
+    def test_closed_mid_packet(self):
+        """Test EOF inside a packet raises PacketFramingException"""
+        self.server.sendall(frame(0x00, b'abcdef')[:4])
+        self.server.close()
+        with self.assertRaises(PacketFramingException):
+            PacketReader(self.client).read_packet()
+
+if __name__ == '__main__':
+    unittest.main()
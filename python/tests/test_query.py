@@ -0,0 +1,108 @@
+"""
+Tests for the Query protocol client and batched scanner
+"""
+import asyncio
+import unittest
+from minecraft_server_utility import QueryClient, QueryScanner, query_servers
+from minecraft_server_utility.query import (
+    create_handshake, create_full_stat, parse_full_stat, parse_plugins, SESSION_MASK
+)
+from minecraft_server_utility.exceptions import ServerOfflineException, QueryException
+from .fake_servers import FakeQueryServer, query_full_stat
+
+class TestQueryPackets(unittest.TestCase):
+    """Test Query packet building and parsing"""
+    
+    def test_requests(self):
+        """Test handshake and full stat layouts"""
+        self.assertEqual(create_handshake(0x01020304), b'\xfe\xfd\x09\x01\x02\x03\x04')
+        packet = create_full_stat(1, 9513307)
+        self.assertEqual(len(packet), 15)
+        self.assertEqual(packet[7:11], (9513307).to_bytes(4, 'big'))
+    
+    def test_full_stat(self):
+        """Test key/values, plugins and every player are parsed"""
+        players = ['Player%d' % i for i in range(40)]
+        data = query_full_stat(SESSION_MASK, {'hostname': 'Hi', 'numplayers': '40',
+                                              'maxplayers': '50', 'plugins': ''}, players)
+        stat = parse_full_stat(data)
+        self.assertEqual(stat['motd'], 'Hi')
+        self.assertEqual(stat['players_online'], 40)
+        self.assertEqual(stat['players'], players)
+        self.assertEqual(stat['plugins'], [])
+        with self.assertRaises(QueryException):
+            parse_full_stat(b'\x00\x00\x00\x00\x01garbage')
+    
+    def test_plugins(self):
+        """Test the plugins value splits into software and plugin list"""
+        self.assertEqual(parse_plugins('Paper on 1.20.1: WorldEdit 7.2.15; EssentialsX 2.20.1'),
+                         ('Paper on 1.20.1', ['WorldEdit 7.2.15', 'EssentialsX 2.20.1']))
+        self.assertEqual(parse_plugins('CraftBukkit'), ('CraftBukkit', []))
+
+class TestQueryClient(unittest.TestCase):
+    """Test QueryClient against a fake server"""
+    
+    def test_query_reuses_token(self):
+        """Test a second query skips the handshake"""
+        with FakeQueryServer() as server, QueryClient('127.0.0.1', server.port, timeout=1) as client:
+            first = client.query()
+            second = client.query()
+            self.assertEqual(server.handshakes, 1)
+            self.assertEqual(server.stats, 2)
+        
+        self.assertTrue(first['online'])
+        self.assertEqual(second['players'], ['Alice', 'Bob'])
+        self.assertEqual(second['software'], 'Paper on 1.20.1')
+        self.assertEqual(second['players_max'], 100)
+    
+    def test_expired_token_rehandshakes(self):
+        """Test a rejected token triggers one fresh handshake"""
+        with FakeQueryServer() as server, QueryClient('127.0.0.1', server.port, timeout=0.3) as client:
+            client.query()
+            server.tokens.clear()
+            self.assertEqual(client.get_player_list(), ['Alice', 'Bob'])
+            self.assertEqual(server.handshakes, 2)
+    
+    def test_offline(self):
+        """Test an unanswered query raises ServerOfflineException"""
+        with FakeQueryServer() as server:
+            port = server.port
+        with self.assertRaises(ServerOfflineException):
+            QueryClient('127.0.0.1', port, timeout=0.2).query()
+
+class TestQueryScanner(unittest.TestCase):
+    """Test batched Query scans"""
+    
+    def test_scan_many_servers(self):
+        """Test results come back in order and tokens are reused across scans"""
+        servers = [FakeQueryServer(players=['P%d' % i]) for i in range(3)]
+        for server in servers:
+            server.__enter__()
+        
+        async def run():
+            targets = [('127.0.0.1', server.port) for server in servers]
+            async with QueryScanner(timeout=1, sockets=2) as scanner:
+                first = await scanner.scan(targets)
+                second = await scanner.scan(targets)
+                return first, second, scanner.handshakes, len(scanner._pending)
+        
+        try:
+            first, second, handshakes, pending = asyncio.run(run())
+        finally:
+            for server in servers:
+                server.__exit__()
+        
+        self.assertEqual([r['players'] for r in first], [['P0'], ['P1'], ['P2']])
+        self.assertEqual([r['players'] for r in second], [['P0'], ['P1'], ['P2']])
+        self.assertEqual(handshakes, 3)
+        self.assertEqual(pending, 0)
+    
+    def test_failures_are_returned(self):
+        """Test an unresponsive server is returned as an exception"""
+        with FakeQueryServer() as server:
+            port = server.port
+        results = asyncio.run(query_servers([('127.0.0.1', port)], timeout=0.3))
+        self.assertIsInstance(results[0], ServerOfflineException)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for the Mojang rate limiter and 429 retries
+"""
+import unittest
+from unittest.mock import patch, MagicMock
+from minecraft_server_utility import MojangAPI
+from minecraft_server_utility.rate_limit import TokenBucket, RetryPolicy
+
+def response(status_code, payload=None, headers=None):
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_response.json.return_value = payload
+    mock_response.headers = headers or {}
+    return mock_response
+
+class TestTokenBucket(unittest.TestCase):
+    """Test TokenBucket"""
+    
+    def test_reservations_are_spaced_at_rate(self):
+        """Test reservations beyond capacity wait in arrival order"""
+        bucket = TokenBucket(rate=100, capacity=1)
+        waits = [bucket.reserve() for _ in range(3)]
+        self.assertEqual(waits[0], 0)
+        self.assertAlmostEqual(waits[1], 0.01, places=2)
+        self.assertAlmostEqual(waits[2], 0.02, places=2)
+        self.assertEqual(bucket.stats()['acquired'], 3)
+    
+    def test_penalize_holds_back_callers(self):
+        """Test penalize delays the next reservation"""
+        bucket = TokenBucket(rate=1000, capacity=10)
+        bucket.penalize(0.5)
+        self.assertGreater(bucket.reserve(), 0.4)
+        self.assertEqual(bucket.stats()['throttled'], 1)
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test RetryPolicy"""
+    
+    def test_retry_after_and_backoff(self):
+        """Test Retry-After wins and backoff is bounded"""
+        policy = RetryPolicy(backoff_base=1, backoff_max=8)
+        self.assertEqual(policy.delay(0, '3'), 3)
+        self.assertEqual(policy.delay(0, '120'), 8)
+        for attempt in range(10):
+            self.assertLessEqual(policy.delay(attempt), min(8, 2 ** attempt))
+
+class TestMojangRetries(unittest.TestCase):
+    """Test MojangAPI 429 handling"""
+    
+    @patch('requests.Session.get')
+    def test_429_is_retried(self, mock_get):
+        """Test a 429 is retried and the request succeeds"""
+        mock_get.side_effect = [
+            response(429, headers={'Retry-After': '0'}),
+            response(200, {'id': 'abc', 'name': 'Notch'}),
+        ]
+        bucket = TokenBucket(rate=1000, capacity=10)
+        api = MojangAPI(rate_limiter=bucket, retry=RetryPolicy(backoff_base=0.001))
+        
+        self.assertEqual(api.get_uuid('Notch'), 'abc')
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(bucket.stats()['throttled'], 1)
+    
+    @patch('requests.Session.get')
+    def test_gives_up_after_max_retries(self, mock_get):
+        """Test persistent 429s surface as an API error"""
+        mock_get.return_value = response(429)
+        api = MojangAPI(rate_limiter=TokenBucket(rate=1000, capacity=10),
+                        retry=RetryPolicy(max_retries=2, backoff_base=0.001))
+        
+        with self.assertRaises(Exception) as context:
+            api.get_uuid('Notch')
+        self.assertIn('429', str(context.exception))
+        self.assertEqual(mock_get.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Tests for the RCON clients against a local fake server
+"""
+import asyncio
+import time
+import unittest
+from minecraft_server_utility import (
+    RconClient, AsyncRconClient, RconPool, AsyncRconPool, rcon_broadcast, RconException,
+    ServerOfflineException,
+)
+from .fake_servers import FakeRconServer, FakeVanillaRconServer, unused_port
+
+class TestRconClient(unittest.TestCase):
+    """Test the blocking client and pool"""
+    
+    def test_pipelined_commands(self):
+        """Test a batch shares one connection and keeps its order"""
+        with FakeRconServer() as server:
+            with RconClient('127.0.0.1', server.port, 'secret') as client:
+                responses = client.commands(['list', 'say hi', 'time query daytime'])
+                self.assertEqual(client.command('seed'), 'ran seed')
+            connections = server.connections
+        
+        self.assertEqual(responses, ['ran list', 'ran say hi', 'ran time query daytime'])
+        self.assertEqual(connections, 1)
+    
+    def test_multi_packet_response(self):
+        """Test responses split over several packets are reassembled"""
+        long_text = 'é' * 5000
+        with FakeRconServer(respond=lambda command: long_text, fragment_size=4096) as server:
+            with RconClient('127.0.0.1', server.port, 'secret') as client:
+                self.assertEqual(client.commands(['help', 'help']), [long_text, long_text])
+    
+    def test_vanilla_server(self):
+        """Test every request reaches a one-read-per-packet server as its own packet"""
+        long_text = 'é' * 5000
+        respond = lambda command: long_text if command == 'help' else f"ran {command}"
+        with FakeVanillaRconServer(respond=respond) as server:
+            with RconClient('127.0.0.1', server.port, 'secret') as client:
+                responses = client.commands(['list', 'help', 'say hi'])
+                self.assertEqual(client.command('seed'), 'ran seed')
+            connections, rejected = server.connections, server.rejected
+        
+        self.assertEqual(responses, ['ran list', long_text, 'ran say hi'])
+        self.assertEqual((connections, rejected), (1, 0))
+    
+    def test_command_too_long(self):
+        """Test a command that would overflow a vanilla read is refused before sending"""
+        with FakeRconServer() as server:
+            with RconClient('127.0.0.1', server.port, 'secret') as client:
+                with self.assertRaises(RconException):
+                    client.command('say ' + 'x' * 1500)
+                self.assertEqual(client.command('list'), 'ran list')
+            commands = server.commands
+        
+        self.assertEqual(commands, ['list'])
+    
+    def test_bad_password(self):
+        """Test a rejected login raises RconException"""
+        with FakeRconServer() as server:
+            with self.assertRaises(RconException):
+                RconClient('127.0.0.1', server.port, 'wrong').connect()
+    
+    def test_unreachable(self):
+        """Test a closed port raises ServerOfflineException"""
+        with self.assertRaises(ServerOfflineException):
+            RconClient('127.0.0.1', unused_port(), 'secret', timeout=1).command('list')
+    
+    def test_pool_broadcast(self):
+        """Test the pool reuses connections and reports failures per server"""
+        with FakeRconServer() as first, FakeRconServer() as second:
+            pool = RconPool(timeout=2)
+            targets = [('127.0.0.1', first.port, 'secret'), ('127.0.0.1', second.port, 'wrong'),
+                       ('127.0.0.1', first.port, 'secret')]
+            results = pool.broadcast(targets, 'list')
+            pool.broadcast(targets[:1], 'list')
+            pool.close()
+            connections = first.connections
+        
+        self.assertEqual(results[0], 'ran list')
+        self.assertIsInstance(results[1], RconException)
+        self.assertEqual(results[2], 'ran list')
+        self.assertEqual(connections, 1)
+    
+    def test_pool_password_change_closes_client(self):
+        """Test a pooled client replaced for a new password is closed"""
+        with FakeRconServer() as server:
+            pool = RconPool(timeout=2)
+            pool.command('127.0.0.1', server.port, 'secret', 'list')
+            old, _ = pool._clients[('127.0.0.1', server.port)]
+            with self.assertRaises(RconException):
+                pool.command('127.0.0.1', server.port, 'wrong', 'list')
+            pool.close()
+        
+        self.assertFalse(old.connected)
+
+class TestAsyncRconClient(unittest.TestCase):
+    """Test the asyncio client"""
+    
+    def test_concurrent_commands(self):
+        """Test concurrent callers share one connection and get their own responses"""
+        async def run(port):
+            async with AsyncRconClient('127.0.0.1', port, 'secret') as client:
+                return await asyncio.gather(*(client.command(f'say {i}') for i in range(50)))
+        
+        with FakeRconServer(fragment_size=3) as server:
+            responses = asyncio.run(run(server.port))
+            connections = server.connections
+        
+        self.assertEqual(responses, [f'ran say {i}' for i in range(50)])
+        self.assertEqual(connections, 1)
+    
+    def test_concurrent_commands_vanilla(self):
+        """Test concurrent callers take turns against a one-read-per-packet server"""
+        async def run(port):
+            async with AsyncRconClient('127.0.0.1', port, 'secret') as client:
+                return await asyncio.gather(*(client.command(f'say {i}') for i in range(20)))
+        
+        with FakeVanillaRconServer() as server:
+            responses = asyncio.run(run(server.port))
+            rejected = server.rejected
+        
+        self.assertEqual(responses, [f'ran say {i}' for i in range(20)])
+        self.assertEqual(rejected, 0)
+    
+    def test_timeout_forgets_command(self):
+        """Test a timed-out command leaves no bookkeeping behind"""
+        def respond(command):
+            time.sleep(0.5)
+            return f"ran {command}"
+        
+        async def run(port):
+            async with AsyncRconClient('127.0.0.1', port, 'secret', timeout=0.2) as client:
+                with self.assertRaises(RconException):
+                    await client.command('list')
+                return dict(client._exchange.fragments), dict(client._exchange.markers), client._waiters
+        
+        with FakeRconServer(respond=respond) as server:
+            fragments, markers, waiters = asyncio.run(run(server.port))
+        
+        self.assertEqual((fragments, markers, waiters), ({}, {}, {}))
+    
+    def test_pool_password_change_closes_client(self):
+        """Test a pooled client replaced for a new password is closed"""
+        async def run(port):
+            async with AsyncRconPool(timeout=2) as pool:
+                await pool.command('127.0.0.1', port, 'secret', 'list')
+                old = pool._clients[('127.0.0.1', port)]
+                with self.assertRaises(RconException):
+                    await pool.command('127.0.0.1', port, 'wrong', 'list')
+                return old.connected
+        
+        with FakeRconServer() as server:
+            self.assertFalse(asyncio.run(run(server.port)))
+    
+    def test_broadcast(self):
+        """Test broadcasting returns results and exceptions in input order"""
+        with FakeRconServer() as server:
+            results = asyncio.run(rcon_broadcast(
+                [('127.0.0.1', server.port, 'secret'), ('127.0.0.1', unused_port(), 'secret')],
+                'list', timeout=2
+            ))
+        
+        self.assertEqual(results[0], 'ran list')
+        self.assertIsInstance(results[1], ServerOfflineException)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests for SRV-aware resolution and happy-eyeballs connects
+"""
+import asyncio
+import socket
+import time
+import unittest
+from minecraft_server_utility import ServerPinger, AsyncServerPinger, Resolver
+from minecraft_server_utility.resolver import SrvRecord, pick_srv, interleave, connect, connect_async
+from minecraft_server_utility.cache import StatusCache
+from .fake_servers import FakeJavaServer
+
+class StalledListener:
+    """Listening socket with a full accept queue, so new connects hang"""
+    
+    def __enter__(self):
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(0)
+        self.filler = socket.create_connection(self.sock.getsockname())
+        return self.sock.getsockname()
+    
+    def __exit__(self, *exc):
+        self.filler.close()
+        self.sock.close()
+
+class StaticSrvResolver(Resolver):
+    """Resolver answering SRV lookups from a table instead of DNS"""
+    
+    def __init__(self, records, **kwargs):
+        super().__init__(**kwargs)
+        self.srv = True
+        self.records = records
+        self.lookups = []
+    
+    def _query_srv(self, name, timeout):
+        self.lookups.append(name)
+        return self.records.get(name, []), 60.0
+    
+    async def _query_srv_async(self, name, timeout):
+        return self._query_srv(name, timeout)
+
+class TestResolver(unittest.TestCase):
+    """Test Resolver"""
+    
+    def test_pick_srv_prefers_lowest_priority(self):
+        """Test SRV selection ignores higher priorities and zero weights"""
+        records = [SrvRecord(10, 0, 1, 'b'), SrvRecord(5, 0, 2, 'a'), SrvRecord(5, 100, 3, 'c')]
+        self.assertEqual({pick_srv(records).target for _ in range(20)}, {'c'})
+    
+    def test_interleave_families(self):
+        """Test address families alternate starting with the first"""
+        v6, v4 = socket.AF_INET6, socket.AF_INET
+        addresses = [(v6, ('::1', 1)), (v6, ('::2', 1)), (v4, ('1.1.1.1', 1)), (v4, ('1.0.0.1', 1))]
+        self.assertEqual([a[1][0] for a in interleave(addresses)], ['::1', '1.1.1.1', '::2', '1.0.0.1'])
+    
+    def test_srv_followed_and_cached(self):
+        """Test SRV targets are used and lookups are cached"""
+        resolver = StaticSrvResolver({'_minecraft._tcp.play.example': [SrvRecord(0, 5, 25570, '127.0.0.1')]})
+        first = resolver.resolve('play.example')
+        second = resolver.resolve('play.example')
+        self.assertEqual((first.host, first.port, first.srv), ('127.0.0.1', 25570, True))
+        self.assertEqual(second, first)
+        self.assertEqual(resolver.lookups, ['_minecraft._tcp.play.example'])
+    
+    def test_explicit_port_and_ip_skip_srv(self):
+        """Test SRV is only consulted for hostnames on the default port"""
+        resolver = StaticSrvResolver({})
+        self.assertFalse(resolver.resolve('localhost', 25566).srv)
+        self.assertFalse(resolver.resolve('127.0.0.1').srv)
+        self.assertEqual(resolver.lookups, [])
+    
+    def test_handshake_keeps_original_host(self):
+        """Test pings connect to the SRV target but handshake with the given host"""
+        with FakeJavaServer() as server:
+            resolver = StaticSrvResolver({'_minecraft._tcp.mc.example': [SrvRecord(0, 0, server.port, '127.0.0.1')]})
+            pinger = ServerPinger('mc.example', cache=StatusCache(ttl=0), resolver=resolver)
+            result = pinger.ping()
+            async_pinger = AsyncServerPinger('mc.example', resolver=resolver)
+            asyncio.run(async_pinger.ping())
+            handshakes = list(server.handshakes)
+        
+        self.assertEqual(result['host'], 'mc.example')
+        self.assertEqual(len(handshakes), 2)
+        for handshake in handshakes:
+            self.assertIn(b'\x0amc.example\x63\xdd', handshake)
+
+class TestHappyEyeballs(unittest.TestCase):
+    """Test connection racing"""
+    
+    def test_sync_race_skips_stalled_address(self):
+        """Test a stalled first address does not hold up the second"""
+        with FakeJavaServer() as server, StalledListener() as stalled:
+            addresses = [(socket.AF_INET, stalled),
+                         (socket.AF_INET, ('127.0.0.1', server.port))]
+            start = time.monotonic()
+            sock = connect(addresses, timeout=2, delay=0.05)
+            elapsed = time.monotonic() - start
+            peer = sock.getpeername()
+            sock.close()
+        self.assertEqual(peer, ('127.0.0.1', server.port))
+        self.assertLess(elapsed, 1)
+    
+    def test_async_race_skips_stalled_address(self):
+        """Test the async race connects to the live address"""
+        with FakeJavaServer() as server, StalledListener() as stalled:
+            addresses = [(socket.AF_INET, stalled),
+                         (socket.AF_INET, ('127.0.0.1', server.port))]
+            
+            async def run():
+                sock = await asyncio.wait_for(connect_async(addresses, delay=0.05), 2)
+                peer = sock.getpeername()
+                sock.close()
+                return peer
+            
+            self.assertEqual(asyncio.run(run()), ('127.0.0.1', server.port))
+    
+    def test_refused_raises(self):
+        """Test every address failing raises the connection error"""
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        with self.assertRaises(ConnectionRefusedError):
+            connect([(socket.AF_INET, ('127.0.0.1', port))], timeout=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for the adaptive PollScheduler
+"""
+import threading
+import time
+import unittest
+from minecraft_server_utility import PollScheduler, ServerPinger, StatusCache
+from minecraft_server_utility.monitor import server_key
+from .fake_servers import FakeJavaServer, unused_port
+
+class TestPollScheduler(unittest.TestCase):
+    """Test PollScheduler"""
+    
+    def setUp(self):
+        self.scheduler = PollScheduler(interval=60, min_interval=10, max_interval=300, jitter=0)
+        self.key = self.scheduler.add(('example.com', 25565))
+    
+    def test_offline_backoff(self):
+        """Test offline servers back off exponentially up to max_interval"""
+        intervals = [self.scheduler.reschedule(self.key, False, False, now=0) for _ in range(4)]
+        self.assertEqual(intervals, [120, 240, 300, 300])
+        self.assertEqual(self.scheduler.reschedule(self.key, True, False, now=0), 60)
+    
+    def test_long_outage_does_not_overflow(self):
+        """Test backoff stays capped however long a server stays down"""
+        for _ in range(1100):
+            interval = self.scheduler.reschedule(self.key, False, False, now=0)
+        self.assertEqual(interval, 300)
+        self.assertEqual(self.scheduler.reschedule(self.key, True, False, now=0), 60)
+    
+    def test_queued_counts_live_entries(self):
+        """Test stale heap items left by re-adding and removing are not counted"""
+        self.scheduler.add(('example.com', 25565))
+        self.scheduler.add(('example.org', 25565))
+        self.scheduler.reschedule(self.key, True, False, now=0)
+        self.scheduler.remove(server_key(ServerPinger('example.org', 25565)))
+        self.assertEqual(self.scheduler.stats()['queued'], 1)
+    
+    def test_changing_servers_poll_faster(self):
+        """Test changes shorten the interval and stability relaxes it back"""
+        self.assertEqual(self.scheduler.reschedule(self.key, True, True, now=0), 30)
+        self.assertEqual(self.scheduler.reschedule(self.key, True, True, now=0), 15)
+        self.assertEqual(self.scheduler.reschedule(self.key, True, True, now=0), 10)
+        self.assertEqual(self.scheduler.reschedule(self.key, True, False, now=0), 15)
+        self.assertEqual(self.scheduler.interval_of(self.key), 15)
+    
+    def test_remove(self):
+        """Test removed servers are no longer rescheduled"""
+        self.scheduler.remove(self.key)
+        self.assertIsNone(self.scheduler.reschedule(self.key, True, False))
+        self.assertEqual(len(self.scheduler), 0)
+    
+    def test_rate_budget(self):
+        """Test dispatch never exceeds the configured rate"""
+        scheduler = PollScheduler(interval=0.05, min_interval=0.05, jitter=0, rate=20, timeout=0.5)
+        for _ in range(50):
+            scheduler.add(ServerPinger('127.0.0.1', unused_port(), 0.5, StatusCache()))
+        start = time.monotonic()
+        scheduler.run(duration=0.5)
+        elapsed = time.monotonic() - start
+        
+        self.assertLessEqual(scheduler.stats()['dispatched'], 20 * elapsed + 1)
+        self.assertGreater(scheduler.stats()['max_lag'], 0)
+    
+    def test_run_reports_results(self):
+        """Test run polls live servers and hands results and events to the callback"""
+        seen = []
+        with FakeJavaServer() as server:
+            scheduler = PollScheduler(interval=0.1, min_interval=0.05, jitter=0.1)
+            scheduler.add(ServerPinger('127.0.0.1', server.port, 2, StatusCache()))
+            scheduler.run(lambda result, events: seen.append((result, events)), duration=0.5)
+        
+        self.assertGreaterEqual(len(seen), 2)
+        self.assertTrue(all(result.online for result, _ in seen))
+        self.assertEqual(seen[0][1][0].type, 'online')
+        self.assertEqual(seen[1][1], [])
+    
+    def test_add_wakes_running_scheduler(self):
+        """Test a server added while run() is idle is polled without waiting out the sleep"""
+        polled = threading.Event()
+        stop = threading.Event()
+        scheduler = PollScheduler(jitter=0)
+        thread = threading.Thread(target=scheduler.run,
+                                  args=(lambda result, events: polled.set(),), kwargs={'stop': stop})
+        with FakeJavaServer() as server:
+            thread.start()
+            try:
+                time.sleep(0.1)
+                scheduler.add(ServerPinger('127.0.0.1', server.port, 2, StatusCache()))
+                self.assertTrue(polled.wait(0.25))
+            finally:
+                stop.set()
+                thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+"""
+Tests for ServerPinger against a local fake server
+"""
+import unittest
+from minecraft_server_utility import ServerPinger
+from .fake_servers import FakeJavaServer, status_payload
+
+class TestServerPingerProtocol(unittest.TestCase):
+    """Test the status exchange over a real socket"""
+    
+    def test_ping_uses_single_connection(self):
+        """Test status and Ping/Pong share one TCP connection"""
+        with FakeJavaServer(status_payload(players_online=5)) as server:
+            info = ServerPinger('127.0.0.1', server.port).ping()
+            connections = server.connections
+        
+        self.assertEqual(connections, 1)
+        self.assertEqual(info['players']['online'], 5)
+        self.assertGreaterEqual(info['latency'], 0)
+    
+    def test_skip_latency(self):
+        """Test measure_latency=False skips the Ping/Pong exchange"""
+        with FakeJavaServer() as server:
+            info = ServerPinger('127.0.0.1', server.port).ping(measure_latency=False)
+        
+        self.assertTrue(info['online'])
+        self.assertIsNone(info['latency'])
+
+if __name__ == '__main__':
+    unittest.main()
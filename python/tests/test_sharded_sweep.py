@@ -0,0 +1,73 @@
+"""
+Tests for the multi-process sharded sweeper
+"""
+import unittest
+from minecraft_server_utility import ShardedSweeper, sweep_sharded
+from minecraft_server_utility.sharded_sweep import (
+    SweepRecord, encode_records, decode_records, OK, OFFLINE, ERROR
+)
+from .fake_servers import FakeJavaServer, status_payload, unused_port
+
+class TestRecordChannel(unittest.TestCase):
+    """Test the packed result channel"""
+    
+    def test_round_trip(self):
+        """Test records survive encoding, with host and port restored from targets"""
+        targets = [('a.example', 25565), ('b.example', 25566)]
+        records = [
+            SweepRecord(0, 'a.example', 25565, OK, 3, 20, 763, 12.5, '1.20.1', 'Héllo ✓', ('Alice', 'Bob'), ''),
+            SweepRecord(1, 'b.example', 25566, ERROR, 0, 0, -1, None, '', '', (), 'bad JSON'),
+        ]
+        self.assertEqual(decode_records(encode_records(records), targets), records)
+    
+    def test_long_string_cut_on_character_boundary(self):
+        """Test a string over the length limit is truncated without splitting a character"""
+        motd = 'a' + '✓' * 30000
+        record = SweepRecord(0, 'a.example', 25565, OK, 1, 2, 763, 1.0, '1.20.1', motd, (), '')
+        decoded = decode_records(encode_records([record]), [('a.example', 25565)])[0]
+        self.assertTrue(motd.startswith(decoded.motd))
+        self.assertEqual(len(decoded.motd.encode('utf-8')), 0xFFFF - 2)
+
+class TestShardedSweeper(unittest.TestCase):
+    """Test sweeping across worker processes"""
+    
+    def test_sweep_across_workers(self):
+        """Test every target is pinged once and counters add up"""
+        sample = [{'name': 'Steve', 'id': '00000000-0000-0000-0000-000000000001'}]
+        with FakeJavaServer(status_payload(players_online=1, sample=sample)) as server:
+            targets = [('127.0.0.1', server.port)] * 6 + [('127.0.0.1', unused_port())]
+            sweeper = ShardedSweeper(workers=2, concurrency=4, timeout=2, batch_size=2)
+            records = sorted(sweeper.sweep(targets), key=lambda record: record.index)
+            connections = server.connections
+        
+        self.assertEqual([record.index for record in records], list(range(7)))
+        self.assertTrue(all(record.online for record in records[:6]))
+        self.assertEqual(records[0].players, ('Steve',))
+        self.assertEqual(records[6].status, OFFLINE)
+        self.assertEqual(connections, 6)
+        
+        stats = sweeper.stats()
+        self.assertEqual((stats['pings'], stats['online'], stats['offline']), (7, 6, 1))
+        self.assertGreater(stats['bytes'], 0)
+        self.assertEqual(len(stats['workers']), 2)
+        self.assertGreater(stats['pings_per_sec'], 0)
+    
+    def test_out_of_range_status(self):
+        """Test a status with unpackable numbers becomes an error record instead of killing the shard"""
+        with FakeJavaServer(status_payload(players_max=10 ** 10)) as bogus, FakeJavaServer() as good:
+            records = sweep_sharded([('127.0.0.1', bogus.port), ('127.0.0.1', good.port)],
+                                    workers=1, timeout=2)
+        
+        self.assertEqual(records[0].status, ERROR)
+        self.assertEqual((records[0].players_max, records[0].protocol), (0, -1))
+        self.assertIn('does not fit', records[0].error)
+        self.assertTrue(records[1].online)
+    
+    def test_sweep_sharded_input_order(self):
+        """Test the convenience wrapper returns records in input order"""
+        with FakeJavaServer() as server:
+            records = sweep_sharded([('127.0.0.1', server.port)] * 3, workers=2, timeout=2)
+        self.assertEqual([record.index for record in records], [0, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
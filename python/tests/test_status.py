@@ -0,0 +1,107 @@
+"""
+Tests for the lazy status result objects
+"""
+import base64
+import json
+import unittest
+from minecraft_server_utility import ServerPinger, BedrockPinger, ServerStatus, BedrockStatus, StatusCache
+from minecraft_server_utility.exceptions import InvalidServerException
+from .fake_servers import FakeJavaServer, FakeBedrockServer, status_payload
+
+class TestServerStatus(unittest.TestCase):
+    """Test ServerStatus"""
+    
+    def setUp(self):
+        self.data = status_payload(
+            players_online=2, sample=[{'name': 'Steve', 'id': '0'}],
+            motd={'text': 'Hello ', 'extra': [{'text': 'World'}]},
+            favicon='data:image/png;base64,' + base64.b64encode(b'png').decode()
+        )
+    
+    def test_dict_interface(self):
+        """Test the result reads like the old dict"""
+        status = ServerStatus('example.com', 25565, self.data, 12.5)
+        
+        self.assertTrue(status['online'])
+        self.assertEqual(status['players'], {'online': 2, 'max': 20, 'list': [{'name': 'Steve', 'id': '0'}]})
+        self.assertEqual(status['motd'], 'Hello World')
+        self.assertEqual(status.get('latency'), 12.5)
+        self.assertIs(status['raw_response'], self.data)
+        self.assertEqual(set(status), set(status.to_dict()))
+        self.assertIsNone(status.get('missing'))
+        with self.assertRaises(KeyError):
+            status['missing']
+    
+    def test_drop_raw(self):
+        """Test keep_raw=False releases the decoded JSON"""
+        status = ServerStatus('example.com', 25565, self.data, None, keep_raw=False)
+        
+        self.assertIsNone(status['raw_response'])
+        self.assertEqual(status.favicon_bytes, b'png')
+        self.assertFalse(hasattr(status, '__dict__'))
+    
+    def test_ping_returns_status(self):
+        """Test ServerPinger.ping returns a ServerStatus"""
+        with FakeJavaServer(status_payload(players_online=4)) as server:
+            info = ServerPinger('127.0.0.1', server.port).ping(keep_raw=False)
+        
+        self.assertIsInstance(info, ServerStatus)
+        self.assertEqual(info['players']['online'], 4)
+        self.assertIsNone(info['raw_response'])
+    
+    def test_result_serializes(self):
+        """Test a ping result still converts to JSON and to a mutable dict"""
+        with FakeJavaServer(status_payload(players_online=4)) as server:
+            info = ServerPinger('127.0.0.1', server.port).ping()
+        
+        data = json.loads(json.dumps(info.to_dict()))
+        self.assertEqual(data['players']['online'], 4)
+        self.assertEqual(data['motd'], info['motd'])
+        plain = info.to_dict()
+        plain['note'] = 'edited'
+        self.assertIsInstance(plain, dict)
+
+class TestMalformedStatus(unittest.TestCase):
+    """Test malformed status documents from a server"""
+    
+    def ping(self, status):
+        with FakeJavaServer(status) as server:
+            return ServerPinger('127.0.0.1', server.port, timeout=2, dialects=StatusCache()).ping()
+    
+    def test_version_not_an_object(self):
+        """Test a string version is read as unknown"""
+        status = status_payload()
+        status['version'] = '1.20'
+        info = self.ping(status)
+        
+        self.assertEqual(info['version'], 'Unknown')
+        self.assertEqual(info['protocol'], -1)
+    
+    def test_players_null(self):
+        """Test a null players field is read as empty"""
+        status = status_payload()
+        status['players'] = None
+        info = self.ping(status)
+        
+        self.assertEqual(info['players'], {'online': 0, 'max': 0, 'list': []})
+    
+    def test_document_not_an_object(self):
+        """Test a top-level JSON list is reported as an invalid server"""
+        with self.assertRaises(InvalidServerException):
+            self.ping([status_payload()])
+
+class TestBedrockStatus(unittest.TestCase):
+    """Test BedrockStatus"""
+    
+    def test_matches_dict_layout(self):
+        """Test lazy fields agree with the eagerly decoded dict"""
+        with FakeBedrockServer() as server:
+            info = BedrockPinger('127.0.0.1', server.port, timeout=2, cache=StatusCache()).ping()
+        
+        self.assertIsInstance(info, BedrockStatus)
+        self.assertEqual(dict(info), info.to_dict())
+        self.assertEqual(info['online_players'], 2)
+        self.assertEqual(json.loads(json.dumps(info.to_dict()))['online_players'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
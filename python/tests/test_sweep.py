@@ -0,0 +1,46 @@
+"""
+Tests for the multi-server sweep API
+"""
+import socket
+import time
+import unittest
+from minecraft_server_utility import ping_many, ServerPinger, BedrockPinger
+from minecraft_server_utility.sweep import _as_pinger
+from .fake_servers import FakeJavaServer
+
+class TestPingMany(unittest.TestCase):
+    """Test ping_many"""
+    
+    def test_results_stream_in_completion_order(self):
+        """Test a hanging server does not hold up faster results"""
+        hanging = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        hanging.bind(('127.0.0.1', 0))
+        hanging.listen(1)
+        try:
+            with FakeJavaServer() as server:
+                targets = [('127.0.0.1', hanging.getsockname()[1]), ('127.0.0.1', server.port)]
+                start = time.time()
+                results = ping_many(targets, concurrency=2, timeout=1)
+                
+                first = next(results)
+                self.assertTrue(first.online)
+                self.assertLess(time.time() - start, 0.9)
+                
+                second = next(results)
+                self.assertFalse(second.online)
+                self.assertIsNotNone(second.error)
+                self.assertEqual(list(results), [])
+        finally:
+            hanging.close()
+    
+    def test_target_normalization(self):
+        """Test tuples map to the right pinger class"""
+        self.assertIsInstance(_as_pinger(('a', 25565), 5), ServerPinger)
+        self.assertIsInstance(_as_pinger(('a', 19132, 'bedrock'), 5), BedrockPinger)
+        pinger = ServerPinger('a')
+        self.assertIs(_as_pinger(pinger, 5), pinger)
+        with self.assertRaises(ValueError):
+            _as_pinger(('a', 1, 'pocket'), 5)
+
+if __name__ == '__main__':
+    unittest.main()